@@ -25,13 +25,16 @@ framework python SDK by AI Redefined Inc.
 
 from cogment.version import __version__
 
-from cogment.context import Context
+from cogment.context import Context, JoinTrialResult
 from cogment.endpoints import Endpoint, ServedEndpoint
-from cogment.session import EventType, ActorStatus
+from cogment.directory import EndpointSelection
+from cogment.session import EventType, ActorStatus, OverflowPolicy
 from cogment.control import TrialState
 from cogment.datalog_service import LogParams, LogSample
 from cogment.parameters import ActorParameters, TrialParameters
 from cogment.datastore import DatastoreFields
+from cogment.datastore_cache import DatastoreCache
+from cogment.replay_buffer import ReplayBuffer, ReplaySampling
 from cogment.model_registry import Model
 from cogment.grpc_metadata import GrpcMetadata
 
@@ -14,10 +14,14 @@
 
 import cogment.api.common_pb2 as common_api
 
-from cogment.session import Session
+from cogment.session import Session, EventType, _scalar_fields
 from cogment.errors import CogmentError
-from cogment.utils import logger
+from cogment.utils import logger, import_numpy
 
+from collections import deque
+from types import SimpleNamespace
+import asyncio
+import inspect
 import time
 
 
@@ -76,6 +80,7 @@ class ActorSession(Session):
         self.actor_class = actor_class_spec.name
         self.env_name = env_name
         self._actor_class_spec = actor_class_spec
+        self._raw_data = False
 
     def __str__(self):
         result = super().__str__()
@@ -87,17 +92,26 @@ class ActorSession(Session):
         # Or provide actors details in the config, or the observations.
         raise CogmentError(f"This function is deprecated for actors")
 
-    def start(self, auto_done_sending=True):
+    def start(self, auto_done_sending=True, raw_data=False):
+        # In raw data mode, observations are received serialized (bytes) and never deserialized
+        self._raw_data = raw_data
         self._start(auto_done_sending)
 
     def do_action(self, action):
-        action_req = common_api.Action()
-        action_req.timestamp = int(time.time() * 1e9)
-        action_req.tick_id = self._last_tick_delivered
+        # The output package is built here to be sent as-is
+        package = common_api.ActorRunTrialOutput()
+        package.state = common_api.CommunicationState.NORMAL
+        package.action.timestamp = int(time.time() * 1e9)
+        package.action.tick_id = self._last_tick_delivered
         if action is not None:
-            action_req.content = action.SerializeToString()
+            if isinstance(action, (bytes, bytearray, memoryview)):
+                package.action.content = bytes(action)
+            elif self._raw_data:
+                raise CogmentError(f"Action must be serialized (bytes) in raw data mode [{type(action)}]")
+            else:
+                package.action.content = action.SerializeToString()
 
-        self._post_outgoing_data(action_req)
+        self._post_outgoing_data(package)
 
     def send_message(self, payload, to, to_environment=None):
         if to_environment is not None:
@@ -107,3 +121,180 @@ class ActorSession(Session):
                 self._send_message(payload, to + [self.env_name])
                 return
         self._send_message(payload, to)
+
+
+class ActorBatch:
+    """Class representing observations gathered across trials for a batched actor implementation."""
+
+    def __init__(self, items):
+        self.sessions = [item.session for item in items]
+        self.events = [item.event for item in items]
+        self.observations = [event.observation.observation for event in self.events]
+        self._observation_columns = None
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __str__(self):
+        result = f"ActorBatch: size = {len(self.sessions)}"
+        return result
+
+    def get_observation_columns(self):
+        """Observations stacked as NumPy arrays of their scalar fields (one item per session)"""
+        if self._observation_columns is None:
+            self._observation_columns = self._make_observation_columns()
+        return self._observation_columns
+
+    def _make_observation_columns(self):
+        np = import_numpy()
+
+        # One field list per observation type (sessions may be of different actor classes)
+        type_fields = {}
+        field_dtypes = {}
+        for obs in self.observations:
+            obs_type = type(obs)
+            if obs_type not in type_fields:
+                fields = _scalar_fields(obs_type)
+                type_fields[obs_type] = fields
+                for name, dtype in fields:
+                    if name in field_dtypes and field_dtypes[name] != dtype:
+                        field_dtypes[name] = np.result_type(field_dtypes[name], dtype)
+                    else:
+                        field_dtypes[name] = dtype
+
+        count = len(self.observations)
+        values = {name: [0] * count for name in field_dtypes}
+        for index, obs in enumerate(self.observations):
+            for name, _ in type_fields[type(obs)]:
+                values[name][index] = getattr(obs, name)
+
+        return {name: np.array(values[name], dtype=dtype) for name, dtype in field_dtypes.items()}
+
+
+def _set_future(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _fail_futures(items, exc):
+    for item in items:
+        if not item.done.done():
+            item.done.set_exception(exc)
+
+
+class _ActorBatcher:
+    """Internal class gathering the observations of all sessions of a batched actor implementation."""
+
+    def __init__(self, impl, impl_name, max_batch_size, max_batch_wait):
+        if max_batch_size < 1:
+            raise CogmentError(f"Invalid maximum batch size [{max_batch_size}]: must be at least 1")
+        if max_batch_wait < 0:
+            raise CogmentError(f"Invalid maximum batch wait [{max_batch_wait}]: must be positive")
+
+        self._impl = impl
+        self._impl_name = impl_name
+        self._max_batch_size = max_batch_size
+        self._max_batch_wait = max_batch_wait
+        self._pending = deque()
+        self._available = None
+        self._full = None
+        self._task = None
+
+    def _submit(self, session, event):
+        """Returns a future set when the action is sent, or failed with the error of the batch"""
+        if self._task is None:
+            # Created lazily to be in the serving event loop
+            self._available = asyncio.Event()
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+        item = SimpleNamespace(session=session, event=event, done=asyncio.get_running_loop().create_future())
+        self._pending.append(item)
+        self._available.set()
+        if len(self._pending) >= self._max_batch_size:
+            self._full.set()
+
+        return item.done
+
+    def _pop_batch(self):
+        batch_size = min(len(self._pending), self._max_batch_size)
+        items = [self._pending.popleft() for _ in range(batch_size)]
+
+        if len(self._pending) < self._max_batch_size:
+            self._full.clear()
+        if len(self._pending) == 0:
+            self._available.clear()
+
+        return items
+
+    async def _decide(self, items):
+        active_items = []
+        for item in items:
+            if item.session.is_trial_over():
+                _set_future(item.done)
+            else:
+                active_items.append(item)
+        if len(active_items) == 0:
+            return
+        batch = ActorBatch(active_items)
+
+        try:
+            actions = self._impl(batch)
+            if inspect.isawaitable(actions):
+                actions = await actions
+
+            if actions is None or len(actions) != len(batch):
+                raise CogmentError(f"Batched implementation [{self._impl_name}] must return one action per "
+                                   f"observation: received [{None if actions is None else len(actions)}] "
+                                   f"for [{len(batch)}]")
+
+        except asyncio.CancelledError:
+            _fail_futures(active_items, CogmentError(f"Batched actor [{self._impl_name}] stopped"))
+            raise
+
+        except Exception as exc:
+            # Every session of the batch fails like a regular actor implementation raising
+            _fail_futures(active_items, exc)
+            return
+
+        for item, action in zip(active_items, actions):
+            try:
+                item.session.do_action(action)
+            except Exception as exc:
+                _fail_futures([item], exc)
+                continue
+            _set_future(item.done)
+
+    async def _run(self):
+        try:
+            while True:
+                await self._available.wait()
+                if len(self._pending) < self._max_batch_size and self._max_batch_wait > 0:
+                    try:
+                        await asyncio.wait_for(self._full.wait(), self._max_batch_wait)
+                    except asyncio.TimeoutError:
+                        pass
+
+                await self._decide(self._pop_batch())
+
+        except asyncio.CancelledError as exc:
+            logger.debug(f"Batched actor [{self._impl_name}] coroutine cancelled: [{exc}]")
+
+        finally:
+            self._task = None
+            _fail_futures(self._pending, CogmentError(f"Batched actor [{self._impl_name}] stopped"))
+            self._pending.clear()
+
+    async def close(self):
+        task = self._task
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _session_impl(self, session):
+        session.start()
+
+        async for event in session.all_events():
+            if event.observation is not None and event.type == EventType.ACTIVE:
+                # Raises (failing the session) if the batch failed
+                await self._submit(session, event)
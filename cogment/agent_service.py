@@ -38,6 +38,11 @@ class _PrometheusData:
             "Time spent by an actor on the decide function",
             ["name", "impl_name"],
             registry=prometheus_registry)
+        self.executor_wait_time = Summary(
+            "actor_executor_wait_seconds",
+            "Time spent by functions waiting to be run in the actor executor",
+            ["name", "impl_name"],
+            registry=prometheus_registry)
         self.actors_started = Counter(
             "actor_started", "Number of actors created", ["impl_name"],
             registry=prometheus_registry)
@@ -53,6 +58,12 @@ class _PrometheusData:
         self.rewards_counter = Counter(
             "actor_rewards_count", "Number of rewards received", ["name", "impl_name"],
             registry=prometheus_registry)
+        self.dropped_events = Counter(
+            "actor_dropped_events", "Number of events dropped because the queue was full", ["name", "impl_name"],
+            registry=prometheus_registry)
+        self.conflated_events = Counter(
+            "actor_conflated_events", "Number of observations replaced by a newer one", ["name", "impl_name"],
+            registry=prometheus_registry)
 
 
 def _trial_key(trial_id, actor_name):
@@ -113,10 +124,11 @@ def _process_normal_data(data, session):
         tick_id = data.observation.tick_id
         session._trial.tick_id = tick_id
 
-        obs_space = session._actor_class_spec.observation_space()
-        obs_space.ParseFromString(data.observation.content)
-
-        recv_event.observation = RecvObservation(data.observation, obs_space)
+        if session._raw_data:
+            recv_event.observation = RecvObservation(data.observation, data.observation.content)
+        else:
+            recv_event.observation = RecvObservation(data.observation, None,
+                                                     obs_space_type=session._actor_class_spec.observation_space)
         session._post_incoming_event((tick_id, recv_event))
 
     elif data.HasField("reward"):
@@ -152,6 +164,7 @@ def _process_normal_data(data, session):
 async def _process_incoming(context, session):
     try:
         while True:
+            await session._wait_for_incoming_space()
             data = await context.read()
             if data == grpc.aio.EOF:
                 logger.info(f"Trial [{session._trial.id}] - Actor [{session.name}]: "
@@ -215,15 +228,16 @@ async def _process_incoming(context, session):
 async def _process_outgoing(context, session):
     try:
         async for data in session._retrieve_outgoing_data():
-            package = common_api.ActorRunTrialOutput()
-            package.state = common_api.CommunicationState.NORMAL
-
             # Using strict comparison: there is no reason to receive derived classes here
-            if type(data) == common_api.Action:
+            if type(data) == common_api.ActorRunTrialOutput:
                 logger.trace(f"Trial [{session._trial.id}] - Actor [{session.name}]: Sending action")
-                package.action.CopyFrom(data)
+                await context.write(data)
+                continue
+
+            package = common_api.ActorRunTrialOutput()
+            package.state = common_api.CommunicationState.NORMAL
 
-            elif type(data) == common_api.Reward:
+            if type(data) == common_api.Reward:
                 logger.trace(f"Trial [{session._trial.id}] - Actor [{session.name}]: Sending reward")
                 package.reward.CopyFrom(data)
 
@@ -263,6 +277,7 @@ class AgentServicer(agent_grpc_api.ServiceActorSPServicer):
     def __init__(self, agent_impls, cog_settings, prometheus_registry=None):
         self._impls = agent_impls
         self._sessions = set()
+        self._impl_trial_counts = {}
         self._cog_settings = cog_settings
         self._prometheus_data = _PrometheusData(prometheus_registry)
 
@@ -333,9 +348,17 @@ class AgentServicer(agent_grpc_api.ServiceActorSPServicer):
                 logger.error(error_str)
                 await context.abort(grpc.StatusCode.UNKNOWN, error_str)
 
-    def _start_session(self, trial_id, init_input):
-        actor_impl = get_actor_impl(trial_id, self._impls, init_input)
+    def _acquire_trial_slot(self, impl_name, actor_impl):
+        count = self._impl_trial_counts.get(impl_name, 0)
+        if actor_impl.max_concurrent_trials > 0 and count >= actor_impl.max_concurrent_trials:
+            return False
+        self._impl_trial_counts[impl_name] = count + 1
+        return True
+
+    def _release_trial_slot(self, impl_name):
+        self._impl_trial_counts[impl_name] -= 1
 
+    def _start_session(self, trial_id, init_input, actor_impl):
         actor_name = init_input.actor_name
         actor_class_spec = self._cog_settings.actor_classes.get(init_input.actor_class)
         if actor_class_spec is None:
@@ -360,6 +383,14 @@ class AgentServicer(agent_grpc_api.ServiceActorSPServicer):
         new_session = ActorSession(actor_impl.impl, actor_class_spec, trial, actor_name, init_input.impl_name,
                                    init_input.env_name, config)
         new_session._prometheus_data = self._prometheus_data
+        new_session._dropped_events_counter = self._prometheus_data.dropped_events.labels(
+            actor_name, init_input.impl_name)
+        new_session._conflated_events_counter = self._prometheus_data.conflated_events.labels(
+            actor_name, init_input.impl_name)
+        new_session._set_incoming_queue(actor_impl.queue_size, actor_impl.overflow_policy)
+        new_session._executor = actor_impl.executor
+        new_session._executor_wait_summary = self._prometheus_data.executor_wait_time.labels(
+            actor_name, init_input.impl_name)
         self._sessions.add(key)
 
         logger.debug(f"Trial [{trial_id}] - impl [{init_input.impl_name}] for service actor [{actor_name}] started")
@@ -421,11 +452,23 @@ class AgentServicer(agent_grpc_api.ServiceActorSPServicer):
                 return
             key = _trial_key(trial_id, init_data.actor_name)
 
-            session = self._start_session(trial_id, init_data)
+            actor_impl = get_actor_impl(trial_id, self._impls, init_data)
+            impl_name = init_data.impl_name
+            if not self._acquire_trial_slot(impl_name, actor_impl):
+                error_str = (f"Trial [{trial_id}] - Actor [{init_data.actor_name}] rejected: impl [{impl_name}] "
+                             f"is already running its maximum of [{actor_impl.max_concurrent_trials}] trials")
+                logger.warning(error_str)
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, error_str)
+
+            try:
+                session = self._start_session(trial_id, init_data, actor_impl)
+
+                await self._run_session(context, session)  # Blocking
 
-            await self._run_session(context, session)  # Blocking
+                self._sessions.remove(key)
 
-            self._sessions.remove(key)
+            finally:
+                self._release_trial_slot(impl_name)
 
         except asyncio.TimeoutError:
             logger.error("Failed to receive init data from Orchestrator")
@@ -0,0 +1,103 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from cogment.errors import CogmentError
+from cogment.utils import logger
+import cogment.endpoints as ep
+
+import grpc
+import asyncio
+import time
+import weakref
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Tuple
+
+# Time (in seconds) an unused channel is kept open before being closed
+CHANNEL_IDLE_TIMEOUT = 60.0
+
+
+def _channel_key(endpoint: ep.Endpoint):
+    return (endpoint.url, endpoint.using_ssl(), endpoint.root_certificates, endpoint.private_key,
+            endpoint.certificate_chain)
+
+
+class ChannelPool:
+    """Internal class sharing the gRPC client channels of a context by endpoint."""
+
+    def __init__(self, make_channel: Callable[[ep.Endpoint], Any], idle_timeout: float = CHANNEL_IDLE_TIMEOUT):
+        self._make_channel = make_channel
+        self._idle_timeout = idle_timeout
+        self._channels: Dict[Tuple, SimpleNamespace] = {}
+        self._closed = False
+
+    def __len__(self):
+        return len(self._channels)
+
+    def acquire(self, endpoint: ep.Endpoint):
+        if self._closed:
+            raise CogmentError(f"Cannot connect to [{endpoint.url}]: the context is closed")
+
+        self._evict_idle()
+
+        key = _channel_key(endpoint)
+        item = self._channels.get(key)
+        if item is None:
+            logger.debug(f"New gRPC channel for [{endpoint.url}]")
+            item = SimpleNamespace(channel=self._make_channel(endpoint), ref_count=0, idle_since=None)
+            self._channels[key] = item
+
+        item.ref_count += 1
+        item.idle_since = None
+        return item.channel
+
+    def is_failing(self, endpoint: ep.Endpoint):
+        item = self._channels.get(_channel_key(endpoint))
+        if item is None:
+            return False
+
+        state = item.channel.get_state(try_to_connect=False)
+        return state == grpc.ChannelConnectivity.TRANSIENT_FAILURE or state == grpc.ChannelConnectivity.SHUTDOWN
+
+    def release(self, endpoint: ep.Endpoint):
+        self._release_key(_channel_key(endpoint))
+
+    def release_when_collected(self, owner, endpoint: ep.Endpoint):
+        # For clients (e.g. Controller) that don't have an explicit end of life
+        weakref.finalize(owner, self._release_key, _channel_key(endpoint))
+
+    def _release_key(self, key):
+        item = self._channels.get(key)
+        if item is None:
+            return  # Already closed
+
+        item.ref_count -= 1
+        if item.ref_count <= 0:
+            item.ref_count = 0
+            item.idle_since = time.monotonic()
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        for key, item in list(self._channels.items()):
+            if item.idle_since is not None and now - item.idle_since >= self._idle_timeout:
+                logger.debug(f"Closing idle gRPC channel for [{key[0]}]")
+                del self._channels[key]
+                asyncio.ensure_future(item.channel.close())
+
+    async def close(self):
+        self._closed = True
+        channels = [item.channel for item in self._channels.values()]
+        self._channels.clear()
+
+        for channel in channels:
+            await channel.close()
@@ -56,10 +56,11 @@ def _process_normal_data(data, session):
         tick_id = data.observation.tick_id
         session._trial.tick_id = tick_id
 
-        obs_space = session._actor_class_spec.observation_space()
-        obs_space.ParseFromString(data.observation.content)
-
-        recv_event.observation = RecvObservation(data.observation, obs_space)
+        if session._raw_data:
+            recv_event.observation = RecvObservation(data.observation, data.observation.content)
+        else:
+            recv_event.observation = RecvObservation(data.observation, None,
+                                                     obs_space_type=session._actor_class_spec.observation_space)
         session._post_incoming_event((tick_id, recv_event))
 
     elif data.HasField("reward"):
@@ -86,6 +87,7 @@ def _process_normal_data(data, session):
 async def _process_incoming(reply_itor, req_queue, session):
     try:
         async for data in reply_itor:
+            await session._wait_for_incoming_space()
             if data == grpc.aio.EOF:
                 logger.info(f"Trial [{session._trial.id}] - Actor [{session.name}]: "
                             f"The orchestrator disconnected the actor")
@@ -158,15 +160,16 @@ async def _process_incoming(reply_itor, req_queue, session):
 async def _process_outgoing(data_queue, session):
     try:
         async for data in session._retrieve_outgoing_data():
-            package = common_api.ActorRunTrialOutput()
-            package.state = common_api.CommunicationState.NORMAL
-
             # Using strict comparison: there is no reason to receive derived classes here
-            if type(data) == common_api.Action:
+            if type(data) == common_api.ActorRunTrialOutput:
                 logger.trace(f"Trial [{session._trial.id}] - Actor [{session.name}]: Sending action")
-                package.action.CopyFrom(data)
+                await data_queue.put(data)
+                continue
+
+            package = common_api.ActorRunTrialOutput()
+            package.state = common_api.CommunicationState.NORMAL
 
-            elif type(data) == common_api.Reward:
+            if type(data) == common_api.Reward:
                 logger.trace(f"Trial [{session._trial.id}] - Actor [{session.name}]: Sending reward")
                 package.reward.CopyFrom(data)
 
@@ -293,7 +296,7 @@ class ClientServicer:
                 raise CogmentError(f"Trial [{self.trial_id}] - Before start, received an invalid state "
                                    f"[{reply.state}] [{reply}]")
 
-    def _start_session(self, impl, init_data):
+    def _start_session(self, actor_impl, init_data):
         actor_name = init_data.actor_name
         if not actor_name:
             raise CogmentError(f"Trial [{self.trial_id}] - Empty actor name for client actor")
@@ -312,21 +315,23 @@ class ClientServicer:
             config.ParseFromString(init_data.config.content)
 
         trial = Trial(self.trial_id, [], self._cog_settings)
-        new_session = ActorSession(impl, actor_class_spec, trial, actor_name, init_data.impl_name,
+        new_session = ActorSession(actor_impl.impl, actor_class_spec, trial, actor_name, init_data.impl_name,
                                    init_data.env_name, config)
+        new_session._set_incoming_queue(actor_impl.queue_size, actor_impl.overflow_policy)
+        new_session._executor = actor_impl.executor
 
         logger.debug(f"Trial [{self.trial_id}] - impl [{init_data.impl_name}] for actor [{actor_name}] started")
 
         return new_session
 
-    async def run_session(self, impl, init_data):
+    async def run_session(self, actor_impl, init_data):
         if self._request_queue is None:
             raise CogmentError(f"ClientServicer has not joined")
 
         send_task = None
         process_task = None
 
-        session = self._start_session(impl, init_data)
+        session = self._start_session(actor_impl, init_data)
 
         try:
             send_task = asyncio.create_task(_process_outgoing(self._request_queue, session))
@@ -27,12 +27,16 @@ import cogment.api.model_registry_pb2_grpc as model_registry_api
 import cogment.api.directory_pb2_grpc as directory_grpc_api
 
 import cogment.endpoints as ep
-from cogment.directory import Directory, ServiceType
-from cogment.actor import ActorSession
+from cogment.directory import Directory, ServiceType, EndpointSelection
+from cogment.channel_pool import ChannelPool
+from cogment.service_load import ServiceLoadMonitor
+from cogment.actor import ActorSession, ActorBatch, _ActorBatcher
 from cogment.environment import EnvironmentSession
+from cogment.session import OverflowPolicy
 from cogment.prehook import PrehookSession
 from cogment.datalog import DatalogSession
 from cogment.datastore import Datastore
+from cogment.datastore_cache import DatastoreCache
 from cogment.model_registry import ModelRegistry
 from cogment.model_registry_v2 import ModelRegistry as ModelRegistryV2
 from cogment.control import Controller
@@ -47,6 +51,13 @@ from cogment.version import __version__
 from cogment.grpc_metadata import GrpcMetadata
 
 import os
+import copy
+import importlib
+import multiprocessing
+import multiprocessing.connection
+import pickle
+import signal
+from concurrent.futures import Executor
 from typing import Callable, Awaitable, Dict, List, Any, Tuple
 from types import ModuleType
 import asyncio
@@ -61,6 +72,9 @@ _ADDITIONAL_REGISTRATION_ITEMS = {"__registration_source" : "PythonSDK-Implicit"
 # (host, port): This IP address is normally not assigned, it is reserved for local benchmarking by IANA (RFC2544).
 _SPECIAL_CONNECTION_IP = ("192.19.254.254", 65535)
 
+# Time given to the worker processes to finish their ongoing trials when stopping
+_WORKER_STOP_GRACE_SECONDS = 5.0
+
 
 def _self_ip_address():
     try:
@@ -113,8 +127,12 @@ def _make_client_channel(grpc_endpoint: ep.Endpoint):
     return channel
 
 
-def _make_server(served_endpoint: ep.ServedEndpoint):
-    server = grpc.aio.server()
+def _make_server(served_endpoint: ep.ServedEndpoint, reuse_port: bool = False):
+    options = served_endpoint._grpc_server_options()
+    if reuse_port:
+        # Multiple processes serve the same port, connections are distributed by the kernel
+        options.append(("grpc.so_reuseport", 1))
+    server = grpc.aio.server(options=options, compression=served_endpoint.compression)
 
     address = f"[::]:{served_endpoint.port}"
     if not served_endpoint.using_ssl():
@@ -143,6 +161,79 @@ def _make_server(served_endpoint: ep.ServedEndpoint):
     return (server, port)
 
 
+def _reserve_port(port: int):
+    # The returned socket (bound but not listening) must stay open to keep the port
+    # while the worker processes serve it with SO_REUSEPORT.
+    try:
+        sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+    except OSError:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(("", port))
+    except OSError as exc:
+        sock.close()
+        raise CogmentError(f"Could not reserve port [{port}] for the workers: {exc}")
+
+    return sock.getsockname()[1], sock
+
+
+def _run_worker(worker_state, served_endpoint, prometheus_port, ready):
+    # Entry point of the spawned worker processes
+    try:
+        asyncio.run(_serve_worker_state(worker_state, served_endpoint, prometheus_port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _serve_worker_state(worker_state, served_endpoint, prometheus_port, ready):
+    cog_settings = worker_state.cog_settings
+    if worker_state.cog_settings_name is not None:
+        cog_settings = importlib.import_module(worker_state.cog_settings_name)
+    prometheus_registry = PROMETHEUS_REGISTRY if worker_state.use_prometheus else None
+
+    context = Context(worker_state.user_id, cog_settings, prometheus_registry=prometheus_registry,
+                      metadata=worker_state.metadata)
+    context._actor_impls = worker_state.actor_impls
+    context._env_impls = worker_state.env_impls
+    context._prehook_impl = worker_state.prehook_impl
+    context._datalog_impl = worker_state.datalog_impl
+    context._actor_batchers = worker_state.actor_batchers
+    await context._serve_worker(served_endpoint, prometheus_port, ready)
+
+
+class JoinTrialResult:
+    """Class representing the outcome of joining a trial with `Context.join_trials`."""
+
+    def __init__(self, trial_id, error=None):
+        self.trial_id = trial_id
+        self.error = error
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def __str__(self):
+        return f"JoinTrialResult: trial_id = {self.trial_id}, error = {self.error}"
+
+
+def _check_queue_parameters(queue_size, overflow_policy):
+    if type(queue_size) is not int or queue_size < 0:
+        raise CogmentError(f"Invalid queue size [{queue_size}]: must be a positive integer (0 for unbounded)")
+    if type(overflow_policy) != OverflowPolicy:
+        raise CogmentError(f"Unknown overflow policy type [{type(overflow_policy)}]: "
+                           f"must be of type 'cogment.OverflowPolicy'")
+    if overflow_policy == OverflowPolicy.KEEP_LATEST and queue_size != 0:
+        raise CogmentError(f"Invalid queue size [{queue_size}] for overflow policy [{overflow_policy}]: "
+                           f"must be 0 (unbounded) as only the latest tick event is kept")
+
+
+def _check_max_concurrent_trials(max_concurrent_trials):
+    if type(max_concurrent_trials) is not int or max_concurrent_trials < 0:
+        raise CogmentError(f"Invalid maximum number of concurrent trials [{max_concurrent_trials}]: "
+                           f"must be a positive integer (0 for unlimited)")
+
+
 class Context:
     """Top level class for the Cogment library from which to obtain all services."""
 
@@ -155,6 +246,8 @@ class Context:
         directory_endpoint: ep.Endpoint = None,
         directory_auth_token: str = None,
         metadata: GrpcMetadata = GrpcMetadata(),
+        directory_cache_ttl: float = 0.0,
+        directory_endpoint_selection: EndpointSelection = EndpointSelection.MOST_RECENT,
     ):
         self._user_id = user_id
         self._actor_impls: Dict[str, SimpleNamespace] = {}
@@ -163,9 +256,13 @@ class Context:
         self._datalog_impl: SimpleNamespace = None
         self._grpc_server = None  # type: Any
         self._grpc_server_port: int = 0
+        self._worker_processes: List[multiprocessing.process.BaseProcess] = []
+        self._actor_batchers: List[_ActorBatcher] = []
         self._prometheus_registry = prometheus_registry
         self._cog_settings = cog_settings
         self._metadata = metadata.copy()
+        self._channel_pool = ChannelPool(_make_client_channel)
+        self._load_monitor = ServiceLoadMonitor(self._channel_pool)
 
         if asyncio_loop is None:
             # Make sure we are running in a asyncio.Task. Even if technically this init does not need
@@ -202,7 +299,8 @@ class Context:
 
         if endpoint_to_use:
             try:
-                self._directory = self.get_directory(endpoint_to_use, auth_token_to_use)
+                self._directory = self.get_directory(endpoint_to_use, auth_token_to_use, directory_cache_ttl,
+                                                     directory_endpoint_selection)
             except CogmentError as exc:
                 raise CogmentError(f"Directory endpoint: {exc}")
         else:
@@ -226,9 +324,11 @@ class Context:
     def register_actor(self,
                        impl: Callable[[ActorSession], Awaitable[None]],
                        impl_name: str,
-                       actor_classes: List[str] = [], properties: Dict[str, str] = {}):
+                       actor_classes: List[str] = [], properties: Dict[str, str] = {},
+                       queue_size: int = 0, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                       executor: Executor = None, max_concurrent_trials: int = 0):
 
-        if self._grpc_server is not None:
+        if self._grpc_server is not None or self._worker_processes:
             # We could accept "client" actor registration after the server is started, but it is not worth it
             raise CogmentError("Cannot register an actor after the server is started")
         if impl_name in self._actor_impls:
@@ -237,6 +337,8 @@ class Context:
             raise CogmentError(f"Actor property [{ep.ACTOR_CLASS_PROPERTY_NAME}] is reserved for internal use")
         if ep.IMPLEMENTATION_PROPERTY_NAME in properties:
             raise CogmentError(f"Actor property [{ep.IMPLEMENTATION_PROPERTY_NAME}] is reserved for internal use")
+        _check_queue_parameters(queue_size, overflow_policy)
+        _check_max_concurrent_trials(max_concurrent_trials)
 
         directory_properties = {}
         directory_properties.update(properties)
@@ -254,29 +356,53 @@ class Context:
                             f" for all actor classes [{actor_classes}]")
 
         self._actor_impls[impl_name] = SimpleNamespace(
-            impl=impl, actor_classes=directory_actor_classes, properties=directory_properties)
+            impl=impl, actor_classes=directory_actor_classes, properties=directory_properties,
+            queue_size=queue_size, overflow_policy=overflow_policy, executor=executor,
+            max_concurrent_trials=max_concurrent_trials)
+
+    def register_batched_actor(self,
+                               impl: Callable[[ActorBatch], Any],
+                               impl_name: str,
+                               actor_classes: List[str] = [], properties: Dict[str, str] = {},
+                               max_batch_size: int = 32, max_batch_wait: float = 0.005,
+                               queue_size: int = 0, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                               executor: Executor = None, max_concurrent_trials: int = 0):
+        # `impl` is called with the observations of all sessions ready within `max_batch_wait` seconds
+        # (up to `max_batch_size`), and must return one action per observation (it can be a coroutine).
+        # If it raises, all the sessions of the batch fail.
+        batcher = _ActorBatcher(impl, impl_name, max_batch_size, max_batch_wait)
+        self.register_actor(batcher._session_impl, impl_name, actor_classes, properties, queue_size=queue_size,
+                            overflow_policy=overflow_policy, executor=executor,
+                            max_concurrent_trials=max_concurrent_trials)
+        self._actor_batchers.append(batcher)
 
     def register_environment(self,
                              impl: Callable[[EnvironmentSession], Awaitable[None]],
-                             impl_name: str = "default", properties: Dict[str, str] = {}):
-        if self._grpc_server is not None:
+                             impl_name: str = "default", properties: Dict[str, str] = {},
+                             queue_size: int = 0, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                             executor: Executor = None, max_concurrent_trials: int = 0):
+        if self._grpc_server is not None or self._worker_processes:
             raise CogmentError("Cannot register an environment after the server is started")
         if impl_name in self._env_impls:
             raise CogmentError(f"The environment implementation name must be unique: [{impl_name}]")
         if ep.IMPLEMENTATION_PROPERTY_NAME in properties:
             raise CogmentError(f"Environment property [{ep.IMPLEMENTATION_PROPERTY_NAME}] is reserved for internal use")
+        _check_queue_parameters(queue_size, overflow_policy)
+        _check_max_concurrent_trials(max_concurrent_trials)
 
         directory_properties = {}
         directory_properties.update(properties)
         directory_properties[ep.IMPLEMENTATION_PROPERTY_NAME] = impl_name
         directory_properties.update(_ADDITIONAL_REGISTRATION_ITEMS)
 
-        self._env_impls[impl_name] = SimpleNamespace(impl=impl, properties=directory_properties)
+        self._env_impls[impl_name] = SimpleNamespace(impl=impl, properties=directory_properties,
+                                                     queue_size=queue_size, overflow_policy=overflow_policy,
+                                                     executor=executor, max_concurrent_trials=max_concurrent_trials)
 
     def register_pre_trial_hook(self,
                                 impl: Callable[[PrehookSession], Awaitable[None]],
                                 properties: Dict[str, str] = {}):
-        if self._grpc_server is not None:
+        if self._grpc_server is not None or self._worker_processes:
             raise CogmentError("Cannot register a pre-trial hook after the server is started")
         if self._prehook_impl is not None:
             raise CogmentError("Only one pre-trial hook service can be registered")
@@ -289,7 +415,7 @@ class Context:
     def register_datalog(self,
                          impl: Callable[[DatalogSession], Awaitable[None]],
                          properties: Dict[str, str] = {}):
-        if self._grpc_server is not None:
+        if self._grpc_server is not None or self._worker_processes:
             raise CogmentError("Cannot register a datalog after the server is started")
         if self._datalog_impl is not None:
             raise CogmentError("Only one datalog service can be registered")
@@ -303,11 +429,11 @@ class Context:
         if self._directory is None:
             return
 
-        for item in registered:
-            try:
-                await self._directory.deregister_service(*item)
-            except Exception as exc:
-                logger.debug(f"Failed to deregister service id [{item[0]}] from directory: [{exc}]")
+        results = await asyncio.gather(*[self._directory.deregister_service(*item) for item in registered],
+                                       return_exceptions=True)
+        for item, result in zip(registered, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Failed to deregister service id [{item[0]}] from directory: [{result}]")
 
         registered.clear()
 
@@ -325,45 +451,78 @@ class Context:
                 return registered
 
         logger.debug(f"Registering services available here [{host}] to Directory")
-        try:
-            for actor in self._actor_impls.values():
-                properties = actor.properties
-                for actor_class in actor.actor_classes:
-                    properties[ep.ACTOR_CLASS_PROPERTY_NAME] = actor_class
-                    res = await self._directory.register_host(
-                        ServiceType.ACTOR, host, port, ssl, properties)
-                    registered.append(res)
-
-            for env in self._env_impls.values():
-                res = await self._directory.register_host(
-                    ServiceType.ENVIRONMENT, host, port, ssl, env.properties)
-                registered.append(res)
-
-            if self._prehook_impl is not None:
-                res = await self._directory.register_host(
-                    ServiceType.HOOK, host, port, ssl, self._prehook_impl.properties)
-                registered.append(res)
-
-            if self._datalog_impl is not None:
-                res = await self._directory.register_host(
-                    ServiceType.DATALOG, host, port, ssl, self._datalog_impl.properties)
-                registered.append(res)
-
-        except Exception:
+
+        services: List[Tuple[ServiceType, Dict[str, str]]] = []
+        for actor in self._actor_impls.values():
+            for actor_class in actor.actor_classes:
+                properties = dict(actor.properties)
+                properties[ep.ACTOR_CLASS_PROPERTY_NAME] = actor_class
+                services.append((ServiceType.ACTOR, properties))
+
+        for env in self._env_impls.values():
+            services.append((ServiceType.ENVIRONMENT, env.properties))
+
+        if self._prehook_impl is not None:
+            services.append((ServiceType.HOOK, self._prehook_impl.properties))
+
+        if self._datalog_impl is not None:
+            services.append((ServiceType.DATALOG, self._datalog_impl.properties))
+
+        # All registrations are done concurrently, if any fails the successful ones are reverted
+        results = await asyncio.gather(*[self._directory.register_host(service_type, host, port, ssl, properties)
+                                         for service_type, properties in services],
+                                       return_exceptions=True)
+
+        error = None
+        for result in results:
+            if isinstance(result, BaseException):
+                if error is None:
+                    error = result
+            else:
+                registered.append(result)
+
+        if error is not None:
             await self._directory_deregistration(registered)
-            raise
+            raise error
 
         return registered
 
     async def serve_all_registered(self, served_endpoint: ep.ServedEndpoint = ep.ServedEndpoint(),
-                                   prometheus_port=None, directory_registration_host: str = None):
+                                   prometheus_port=None, directory_registration_host: str = None, workers: int = 1):
+        # With multiple workers, each worker process serves on `prometheus_port + worker index`,
+        # and the registered implementations must be picklable (i.e. defined at module level).
         if (len(self._actor_impls) == 0 and len(self._env_impls) == 0 and
                 self._prehook_impl is None and self._datalog_impl is None):
             raise CogmentError("Nothing registered to serve!")
-        if self._grpc_server is not None:
+        if self._grpc_server is not None or self._worker_processes:
             raise CogmentError("Cannot serve the same components twice")
 
-        self._grpc_server, self._grpc_server_port = _make_server(served_endpoint)
+        if type(workers) is not int or workers < 1:
+            raise CogmentError(f"Invalid number of workers [{workers}]: must be a strictly positive integer")
+
+        if workers > 1:
+            await self._serve_all_registered_workers(workers, served_endpoint, prometheus_port,
+                                                     directory_registration_host)
+            return
+
+        server = await self._start_server(served_endpoint, prometheus_port)
+
+        directory_registered = await self._directory_registration(directory_registration_host, self._grpc_server_port,
+                                                                  served_endpoint.using_ssl())
+
+        try:
+            await server.wait_for_termination()
+            logger.debug(f"Context gRPC server at port [{self._grpc_server_port}] for user [{self._user_id}] exited")
+
+        finally:
+            await self._directory_deregistration(directory_registered)
+            await self._close_actor_batchers()
+
+    async def _close_actor_batchers(self):
+        await asyncio.gather(*[batcher.close() for batcher in self._actor_batchers])
+
+    async def _start_server(self, served_endpoint, prometheus_port, reuse_port=False):
+        self._grpc_server, self._grpc_server_port = _make_server(served_endpoint, reuse_port)
 
         if self._actor_impls:
             agent_servicer = AgentServicer(self._actor_impls, self._cog_settings, self._prometheus_registry)
@@ -387,23 +546,135 @@ class Context:
         await self._grpc_server.start()
         logger.debug(f"Context gRPC server at port [{self._grpc_server_port}] for user [{self._user_id}] started")
 
-        directory_registered = await self._directory_registration(directory_registration_host, self._grpc_server_port,
-                                                                  served_endpoint.using_ssl())
+        return self._grpc_server
+
+    def _worker_state(self):
+        cog_settings = self._cog_settings
+        cog_settings_name = None
+        if isinstance(cog_settings, ModuleType):
+            # Modules cannot be pickled, the workers import it again
+            cog_settings_name = cog_settings.__name__
+            cog_settings = None
+
+        worker_state = SimpleNamespace(
+            user_id=self._user_id, cog_settings=cog_settings, cog_settings_name=cog_settings_name,
+            use_prometheus=(self._prometheus_registry is not None), metadata=self._metadata,
+            actor_impls=self._actor_impls, env_impls=self._env_impls, prehook_impl=self._prehook_impl,
+            datalog_impl=self._datalog_impl, actor_batchers=self._actor_batchers)
 
         try:
-            await self._grpc_server.wait_for_termination()
-            logger.debug(f"Context gRPC server at port [{self._grpc_server_port}] for user [{self._user_id}] exited")
+            pickle.dumps(worker_state)
+        except Exception as exc:
+            raise CogmentError(f"The registered implementations (and their executors) must be picklable "
+                               f"to be served by workers: {exc}")
+
+        return worker_state
+
+    async def _serve_worker(self, served_endpoint, prometheus_port, ready):
+        server = await self._start_server(served_endpoint, prometheus_port, reuse_port=True)
+
+        def stop():
+            logger.debug(f"Worker [{os.getpid()}] stopping")
+            asyncio.ensure_future(server.stop(_WORKER_STOP_GRACE_SECONDS))
+
+        self.asyncio_loop.add_signal_handler(signal.SIGTERM, stop)
+        ready.set()
+
+        await server.wait_for_termination()
+        logger.debug(f"Worker [{os.getpid()}] gRPC server at port [{self._grpc_server_port}] exited")
+        await self._close_actor_batchers()
+
+    async def _serve_all_registered_workers(self, workers, served_endpoint, prometheus_port,
+                                            directory_registration_host):
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise CogmentError("Serving with multiple workers is not supported on this platform")
+        worker_state = self._worker_state()
+
+        port, reserved_socket = _reserve_port(served_endpoint.port)
+        worker_endpoint = copy.copy(served_endpoint)
+        worker_endpoint.port = port
+        self._grpc_server_port = port
+
+        # Workers are spawned since forking after gRPC is initialized is unsafe: they receive a pickled copy
+        # of the registered implementations and run their own context, event loop and server.
+        mp_context = multiprocessing.get_context("spawn")
+        processes = []
+        directory_registered: List[Tuple[int, str]] = []
+        try:
+            for index in range(workers):
+                worker_prometheus_port = None
+                if prometheus_port is not None:
+                    worker_prometheus_port = prometheus_port + index
+                ready = mp_context.Event()
+                process = mp_context.Process(target=_run_worker, name=f"cogment-worker-{index}",
+                                             args=(worker_state, worker_endpoint, worker_prometheus_port, ready))
+                process.start()
+                processes.append((process, ready))
+            self._worker_processes = [process for process, _ in processes]
+
+            while not all(ready.is_set() for _, ready in processes):
+                for process, _ in processes:
+                    if not process.is_alive():
+                        raise CogmentError(f"Worker [{process.name}] exited before serving "
+                                           f"with code [{process.exitcode}]")
+                await asyncio.sleep(0.05)
+            logger.info(f"Serving on port [{port}] with [{workers}] workers")
+
+            directory_registered = await self._directory_registration(directory_registration_host, port,
+                                                                      served_endpoint.using_ssl())
+
+            sentinels = [process.sentinel for process, _ in processes]
+            await self.asyncio_loop.run_in_executor(None, multiprocessing.connection.wait, sentinels)
+            for process, _ in processes:
+                if not process.is_alive():
+                    logger.warning(f"Worker [{process.name}] exited with code [{process.exitcode}]")
 
         finally:
             await self._directory_deregistration(directory_registered)
+            await self._stop_workers()
+            reserved_socket.close()
+
+    async def _stop_workers(self):
+        for process in self._worker_processes:
+            if process.is_alive():
+                process.terminate()
+
+        def join_all():
+            for process in self._worker_processes:
+                process.join(_WORKER_STOP_GRACE_SECONDS + 1.0)
+                if process.is_alive():
+                    logger.warning(f"Worker [{process.name}] did not stop, killing it")
+                    process.kill()
+                    process.join()
+
+        await self.asyncio_loop.run_in_executor(None, join_all)
+        logger.debug(f"All workers of context for user [{self._user_id}] stopped")
+
+    async def close(self):
+        """Close the gRPC client channels of the context, clients obtained from it can no longer be used"""
+        await self._close_actor_batchers()
+        await self._load_monitor.close()
+        await self._channel_pool.close()
 
     def _make_controller(self, endpoint):
-        channel = _make_client_channel(endpoint)
+        channel = self._channel_pool.acquire(endpoint)
         stub = orchestrator_grpc_api.TrialLifecycleSPStub(channel)
-        return Controller(stub, self._user_id, self._metadata)
+        controller = Controller(stub, self._user_id, self._metadata)
+        self._channel_pool.release_when_collected(controller, endpoint)
+        return controller
+
+    async def _inquire_endpoint(self, endpoint, service_type):
+        inquired_endpoint = await self._directory.get_inquired_endpoint(endpoint, service_type)
+        if self._channel_pool.is_failing(inquired_endpoint):
+            # The inquiry result may come from the directory cache and be stale
+            logger.debug(f"Channel to inquired endpoint [{inquired_endpoint.url}] is failing, inquiring again")
+            self._directory.invalidate_url(inquired_endpoint.url)
+            inquired_endpoint = await self._directory.get_inquired_endpoint(endpoint, service_type)
+
+        return inquired_endpoint
 
     async def _inquire_and_make_controller(self, endpoint):
-        inquired_endpoint = await self._directory.get_inquired_endpoint(endpoint, ServiceType.LIFE_CYCLE)
+        inquired_endpoint = await self._inquire_endpoint(endpoint, ServiceType.LIFE_CYCLE)
         return self._make_controller(inquired_endpoint)
 
     # TODO: The non-async part is only kept for backward compatibility,
@@ -419,35 +690,41 @@ class Context:
         else:
             return self._inquire_and_make_controller(endpoint)  # This returns an awaitable object
 
-    def _make_datastore(self, endpoint):
-        channel = _make_client_channel(endpoint)
+    def _make_datastore(self, endpoint, cache):
+        channel = self._channel_pool.acquire(endpoint)
         stub = datastore_grpc_api.TrialDatastoreSPStub(channel)
-        return Datastore(stub, self._cog_settings, self._metadata)
+        datastore = Datastore(stub, self._cog_settings, self._metadata, cache)
+        self._channel_pool.release_when_collected(datastore, endpoint)
+        return datastore
 
-    async def _inquire_and_make_datastore(self, endpoint):
-        inquired_endpoint = await self._directory.get_inquired_endpoint(endpoint, ServiceType.DATASTORE)
-        return self._make_datastore(inquired_endpoint)
+    async def _inquire_and_make_datastore(self, endpoint, cache):
+        inquired_endpoint = await self._inquire_endpoint(endpoint, ServiceType.DATASTORE)
+        return self._make_datastore(inquired_endpoint, cache)
 
     # TODO: The non-async part is only kept for backward compatibility,
     #       remove it in a future (backward incompatible) release.
-    def get_datastore(self, endpoint=ep.Endpoint()):
+    def get_datastore(self, endpoint=ep.Endpoint(), cache: DatastoreCache = None):
         try:
             parsed_url = urlpar.urlparse(endpoint.url)
         except Exception as exc:
             raise CogmentError(f"Endpoint [{endpoint.url}]: {exc}")
 
         if parsed_url.scheme == ep.GRPC_SCHEME or self._directory is None:
-            return self._make_datastore(endpoint)  # This returns a datastore instance
+            return self._make_datastore(endpoint, cache)  # This returns a datastore instance
         else:
-            return self._inquire_and_make_datastore(endpoint)  # This returns an awaitable object
+            return self._inquire_and_make_datastore(endpoint, cache)  # This returns an awaitable object
 
     # Undocumented
     # We may want to make it async to standardize with the future
     # versions of 'get_controller' and 'get_datastore'
-    def get_directory(self, endpoint: ep.Endpoint, authentication_token: str = None):
-        channel = _make_client_channel(endpoint)
+    def get_directory(self, endpoint: ep.Endpoint, authentication_token: str = None, cache_ttl: float = 0.0,
+                      endpoint_selection: EndpointSelection = EndpointSelection.MOST_RECENT):
+        channel = self._channel_pool.acquire(endpoint)
         stub = directory_grpc_api.DirectorySPStub(channel)
-        return Directory(stub, authentication_token, self._metadata)
+        directory = Directory(stub, authentication_token, self._metadata, cache_ttl,
+                              selection=endpoint_selection, load_monitor=self._load_monitor)
+        self._channel_pool.release_when_collected(directory, endpoint)
+        return directory
 
     # Undocumented
     def get_context_directory(self):
@@ -456,21 +733,31 @@ class Context:
     async def get_model_registry(self, endpoint=ep.Endpoint()):
         logger.deprecated(f"'get_model_registry' is deprecated, use 'get_model_registry_v2'")
         if self._directory is not None:
-            endpoint = await self._directory.get_inquired_endpoint(endpoint, ServiceType.MODEL_REG)
+            endpoint = await self._inquire_endpoint(endpoint, ServiceType.MODEL_REG)
 
-        channel = _make_client_channel(endpoint)
+        channel = self._channel_pool.acquire(endpoint)
         stub = model_registry_api.ModelRegistrySPStub(channel)
-        return ModelRegistry(stub, self._metadata)
+        model_registry = ModelRegistry(stub, self._metadata)
+        self._channel_pool.release_when_collected(model_registry, endpoint)
+        return model_registry
 
     async def get_model_registry_v2(self, endpoint=ep.Endpoint()):
         if self._directory is not None:
-            endpoint = await self._directory.get_inquired_endpoint(endpoint, ServiceType.MODEL_REG)
+            endpoint = await self._inquire_endpoint(endpoint, ServiceType.MODEL_REG)
 
-        channel = _make_client_channel(endpoint)
+        channel = self._channel_pool.acquire(endpoint)
         stub = model_registry_api.ModelRegistrySPStub(channel)
-        return ModelRegistryV2(stub, endpoint.url, self._metadata)
+        model_registry = ModelRegistryV2(stub, endpoint.url, self._metadata)
+        self._channel_pool.release_when_collected(model_registry, endpoint)
+        return model_registry
 
-    async def join_trial(self, trial_id, endpoint=ep.Endpoint(), impl_name=None, actor_name=None, actor_class=None):
+    async def _inquire_client_actor_endpoint(self, endpoint):
+        if self._directory is not None:
+            return await self._inquire_endpoint(endpoint, ServiceType.CLIENT_ACTOR)
+        else:
+            return endpoint
+
+    def _join_trial_request(self, impl_name, actor_name, actor_class):
         requested_class = None
         requested_name = None
         if impl_name is not None:
@@ -496,13 +783,49 @@ class Context:
         else:
             raise CogmentError(f"Actor name or actor class must be specified to join a trial")
 
-        if self._directory is not None:
-            inquired_endpoint = await self._directory.get_inquired_endpoint(endpoint, ServiceType.CLIENT_ACTOR)
-        else:
-            inquired_endpoint = endpoint
+        return requested_name, requested_class
+
+    async def join_trial(self, trial_id, endpoint=ep.Endpoint(), impl_name=None, actor_name=None, actor_class=None):
+        requested_name, requested_class = self._join_trial_request(impl_name, actor_name, actor_class)
+        inquired_endpoint = await self._inquire_client_actor_endpoint(endpoint)
+
+        channel = self._channel_pool.acquire(inquired_endpoint)
+        try:
+            stub = orchestrator_grpc_api.ClientActorSPStub(channel)
+            await self._join_trial_with_stub(stub, trial_id, requested_name, requested_class, impl_name)
+        finally:
+            self._channel_pool.release(inquired_endpoint)
+
+    async def join_trials(self, trial_ids: List[str], endpoint=ep.Endpoint(), actor_name=None, actor_class=None,
+                          max_concurrency: int = 64) -> List[JoinTrialResult]:
+        # The trials are joined over one channel, with at most `max_concurrency` trial sessions running at once.
+        # Failures are reported in the results (in the order of `trial_ids`) instead of being raised.
+        if type(max_concurrency) is not int or max_concurrency < 1:
+            raise CogmentError(f"Invalid maximum concurrency [{max_concurrency}]: must be a strictly positive integer")
+        requested_name, requested_class = self._join_trial_request(None, actor_name, actor_class)
+        inquired_endpoint = await self._inquire_client_actor_endpoint(endpoint)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def join(stub, trial_id):
+            async with semaphore:
+                try:
+                    await self._join_trial_with_stub(stub, trial_id, requested_name, requested_class, None)
+                    return JoinTrialResult(trial_id)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.debug(f"Trial [{trial_id}] - Failed to join: [{exc}]")
+                    return JoinTrialResult(trial_id, exc)
+
+        channel = self._channel_pool.acquire(inquired_endpoint)
+        try:
+            stub = orchestrator_grpc_api.ClientActorSPStub(channel)
+            return list(await asyncio.gather(*[join(stub, trial_id) for trial_id in trial_ids]))
+        finally:
+            self._channel_pool.release(inquired_endpoint)
 
-        channel = _make_client_channel(inquired_endpoint)
-        stub = orchestrator_grpc_api.ClientActorSPStub(channel)
+    async def _join_trial_with_stub(self, stub, trial_id, requested_name, requested_class, impl_name):
         servicer = ClientServicer(self._cog_settings, stub)
 
         init_data = await servicer.join_trial(trial_id, requested_name, requested_class)
@@ -521,4 +844,4 @@ class Context:
 
         actor_impl = get_actor_impl(trial_id, self._actor_impls, init_data)
 
-        await servicer.run_session(actor_impl.impl, init_data)
+        await servicer.run_session(actor_impl, init_data)
@@ -15,6 +15,9 @@
 import asyncio
 import datetime
 import enum
+import itertools
+import os
+from typing import Any, Dict, Tuple
 
 import grpc
 import grpc.aio  # type: ignore
@@ -26,12 +29,28 @@ from cogment.api.trial_datastore_pb2 import StoredTrialSampleField
 from cogment.control import TrialState
 from cogment.parameters import TrialParameters
 from cogment.errors import CogmentError
-from cogment.utils import logger
+from cogment.utils import logger, import_numpy
 from cogment.grpc_metadata import GrpcMetadata
+from cogment.datastore_columns import _ColumnsBuilder, _write_npz
+from cogment.datastore_cache import DatastoreCache
 
 
 _REV_NANO = 1.0 / 1_000_000_000
 
+# Delay (in seconds) before the first retry of a sample stream, doubled for each following retry
+_STREAM_RETRY_DELAY = 0.5
+
+# Cached samples read at once, and size (in bytes) of retrieved samples buffered before being written to the cache
+_CACHE_READ_COUNT = 256
+_CACHE_WRITE_SIZE = 1 << 20
+
+
+class _StreamEnd:
+    """Internal class to signal the end of a stream read in the background."""
+
+    def __init__(self, error=None):
+        self.error = error
+
 
 class DatastoreFields(enum.Enum):
     """Enum class for the different fields of the actor data that can be retrieved."""
@@ -46,6 +65,12 @@ class DatastoreFields(enum.Enum):
     SENT_MESSAGES = StoredTrialSampleField.STORED_TRIAL_SAMPLE_FIELD_SENT_MESSAGES  # type: ignore[attr-defined]
 
 
+def _get_payload(payloads, index):
+    if index >= len(payloads):
+        raise CogmentError(f"Payload [{index}] not available, the payloads of the sample may have been released")
+    return payloads[index]
+
+
 class DatastoreTrialInfo:
     """Class representing trial info."""
 
@@ -71,6 +96,8 @@ class DatastoreTrialInfo:
 class DatastoreReward:
     """Class representing an individual reward sent during this sample."""
 
+    __slots__ = ("_raw_reward", "_payloads", "_parameters", "value", "confidence")
+
     def __init__(self, reward, payloads, parameters: TrialParameters):
         self._raw_reward = reward
         self._payloads = payloads
@@ -102,7 +129,7 @@ class DatastoreReward:
         """User data sent with the reward"""
         if self._raw_reward.HasField("user_data"):
             data_index = self._raw_reward.user_data
-            data_content = self._payloads[data_index]
+            data_content = _get_payload(self._payloads, data_index)
             if data_content is None:
                 return None
             any = common_api.RewardSource().user_data  # Easier than instantiating 'google.protobuf.any_pb2.Any'
@@ -116,6 +143,8 @@ class DatastoreReward:
 class DatastoreMessage:
     """Class representing an individual message sent during this sample."""
 
+    __slots__ = ("_raw_message", "_payloads", "_parameters")
+
     def __init__(self, message, payloads, parameters: TrialParameters):
         self._raw_message = message
         self._payloads = payloads
@@ -143,7 +172,7 @@ class DatastoreMessage:
         """Payload sent with the reward"""
         if self._raw_message.HasField("payload"):
             payload_index = self._raw_message.payload
-            payload_content = self._payloads[payload_index]
+            payload_content = _get_payload(self._payloads, payload_index)
             if payload_content is None:
                 return None
             any = common_api.Message().payload  # Easier than instantiating 'google.protobuf.any_pb2.Any'
@@ -157,11 +186,16 @@ class DatastoreMessage:
 class DatastoreActorData:
     """Class representing the data for an actor in a sample."""
 
-    def __init__(self, sample, payloads, parameters: TrialParameters):
+    __slots__ = ("_raw_sample", "_payloads", "_parameters", "_decoded_payloads")
+
+    def __init__(self, sample, payloads, parameters: TrialParameters, decoded_payloads=None):
         self._raw_sample = sample
         self._payloads = payloads
         self._parameters = parameters
 
+        # Shared by the actors of a sample: dict((payload index, message type) : decoded message)
+        self._decoded_payloads = decoded_payloads if decoded_payloads is not None else {}
+
     def __str__(self):
         result = f"DatastoreActorData:"
         result += f" name = {self.name}, reward = {self.reward}"
@@ -176,6 +210,19 @@ class DatastoreActorData:
         # If the trial parameters have spec, the actor's should have spec
         return self._parameters.has_specs()
 
+    def _decode_payload(self, payload_index, message_type):
+        key = (payload_index, message_type)
+        message = self._decoded_payloads.get(key)
+        if message is None:
+            content = _get_payload(self._payloads, payload_index)
+            if content is None:
+                return None
+            message = message_type()
+            message.ParseFromString(content)
+            self._decoded_payloads[key] = message
+
+        return message
+
     @property
     def name(self):
         """Name of the actor"""
@@ -184,17 +231,15 @@ class DatastoreActorData:
 
     @property
     def observation(self):
-        """Observation for the actor"""
+        """Observation for the actor
+
+        The decoded message is cached: the same object is returned on every access, and to the other actors
+        of the sample with the same observation, so modifying it affects them (copy it first).
+        """
         if self._raw_sample.HasField("observation"):
             actor_index = self._raw_sample.actor
-            obs_space = self._parameters.actors[actor_index].actor_class_spec.observation_space()
-
-            obs_index = self._raw_sample.observation
-            obs_content = self._payloads[obs_index]
-            if obs_content is None:
-                return None
-            obs_space.ParseFromString(obs_content)
-            return obs_space
+            obs_space_type = self._parameters.actors[actor_index].actor_class_spec.observation_space
+            return self._decode_payload(self._raw_sample.observation, obs_space_type)
         else:
             return None
 
@@ -203,24 +248,22 @@ class DatastoreActorData:
         """Serialized observation for the actor"""
         if self._raw_sample.HasField("observation"):
             obs_index = self._raw_sample.observation
-            obs_content = self._payloads[obs_index]
+            obs_content = _get_payload(self._payloads, obs_index)
             return obs_content
         else:
             return None
 
     @property
     def action(self):
-        """Action of the actor"""
+        """Action of the actor
+
+        The decoded message is cached: the same object is returned on every access, and to the other actors
+        of the sample with the same action, so modifying it affects them (copy it first).
+        """
         if self._raw_sample.HasField("action"):
             actor_index = self._raw_sample.actor
-            action_space = self._parameters.actors[actor_index].actor_class_spec.action_space()
-
-            action_index = self._raw_sample.action
-            action_content = self._payloads[action_index]
-            if action_content is None:
-                return None
-            action_space.ParseFromString(action_content)
-            return action_space
+            action_space_type = self._parameters.actors[actor_index].actor_class_spec.action_space
+            return self._decode_payload(self._raw_sample.action, action_space_type)
         else:
             return None
 
@@ -229,7 +272,7 @@ class DatastoreActorData:
         """Serialized action of the actor"""
         if self._raw_sample.HasField("action"):
             action_index = self._raw_sample.action
-            action_content = self._payloads[action_index]
+            action_content = _get_payload(self._payloads, action_index)
             return action_content
         else:
             return None
@@ -262,6 +305,9 @@ class DatastoreActorData:
 class DatastoreSample:
     """Class representing a trial sample from the trial datastore service."""
 
+    __slots__ = ("trial_id", "trial_state", "tick_id", "timestamp", "_raw_sample", "_parameters", "_actors_data",
+                 "_actor_data_by_index", "_decoded_payloads")
+
     def __init__(self, sample, params: TrialParameters):
         self.trial_id = sample.trial_id
         self.trial_state = TrialState(sample.state)
@@ -271,25 +317,132 @@ class DatastoreSample:
         self._raw_sample = sample
         self._parameters = params
 
-        self.actors_data = {}
+        # Actor data are only created when requested
+        self._actors_data = None
+        self._actor_data_by_index: Dict[int, DatastoreActorData] = {}
+        self._decoded_payloads: Dict[Tuple[int, Any], Any] = {}
+
+    @property
+    def actors_data(self):
+        """Data of all the actors in the sample, by actor name (decoded observations and actions are shared)"""
+        if self._actors_data is None:
+            actors_data = {}
+            for smpl in self._raw_sample.actor_samples:
+                data = self._get_actor_data(smpl)
+                actors_data[data.name] = data
+            if len(actors_data) != len(self._raw_sample.actor_samples):
+                raise CogmentError(f"Duplicate actor names in datastore sample")
+            self._actors_data = actors_data
+
+        return self._actors_data
+
+    def get_actor_data(self, name):
+        """Data of one actor in the sample, `None` if the actor is not in the sample
+
+        The same object is returned on every call, and its decoded observation and action are the message objects
+        shared with the other actors that received the same payload: modifying them affects the other actors.
+        """
+        if self._actors_data is not None:
+            return self._actors_data.get(name)
+
         for smpl in self._raw_sample.actor_samples:
-            data = DatastoreActorData(smpl, self._raw_sample.payloads, self._parameters)
-            self.actors_data[data.name] = data
-        if len(self.actors_data) != len(self._raw_sample.actor_samples):
-            raise CogmentError(f"Duplicate actor names in datastore sample")
+            if self._parameters.actors[smpl.actor].name == name:
+                return self._get_actor_data(smpl)
+
+        return None
+
+    def _get_actor_data(self, actor_sample):
+        data = self._actor_data_by_index.get(actor_sample.actor)
+        if data is None:
+            data = DatastoreActorData(actor_sample, self._raw_sample.payloads, self._parameters,
+                                      self._decoded_payloads)
+            self._actor_data_by_index[actor_sample.actor] = data
+        return data
+
+    def release_payloads(self):
+        """Release the observations, actions and other payloads of the sample once they are not needed anymore"""
+        del self._raw_sample.payloads[:]
+        self._decoded_payloads.clear()
 
     def __str__(self):
         utc_time = datetime.datetime.utcfromtimestamp(self.timestamp * _REV_NANO)
         result = f"DatastoreSample:"
         result += f" trial_id = {self.trial_id}, trial_state = {self.trial_state}"
         result += f", tick_id = {self.tick_id}, timestamp = {self.timestamp} UTC[{utc_time}]"
-        result += f", nb actors = {len(self.actors_data)}"
+        result += f", nb actors = {len(self._raw_sample.actor_samples)}"
         return result
 
     def has_specs(self):
         return self._parameters.has_specs()
 
 
+def _parse_stored_sample(content):
+    return datastore_api.StoredTrialSample.FromString(content)
+
+
+def _next_contents(contents_itor):
+    return list(itertools.islice(contents_itor, _CACHE_READ_COUNT))
+
+
+def _read_cached_contents(cache, trial_id, selection):
+    """Returns the cached samples iterator and its first contents, or None if the trial is no longer in the cache"""
+    try:
+        contents_itor = cache.read(trial_id, selection)
+        return contents_itor, _next_contents(contents_itor)
+    except (CogmentError, FileNotFoundError):
+        # Evicted since it was found in the cache (the files are opened before the first contents are returned)
+        return None
+
+
+async def _decode_samples(raw_samples, params):
+    try:
+        async for raw_sample in raw_samples:
+            yield DatastoreSample(raw_sample, params[raw_sample.trial_id])
+
+    finally:
+        await raw_samples.aclose()
+
+
+async def _prefetch(source, depth):
+    """Iterate an async generator in a background task, up to `depth` items ahead of the consumer"""
+    queue = asyncio.Queue(depth)
+    stopping = False
+
+    async def _produce():
+        try:
+            async for item in source:
+                await queue.put(item)
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as exc:
+            await queue.put(_StreamEnd(exc))
+            return
+
+        finally:
+            await source.aclose()
+
+        # The source may end (instead of raising) when cancelled, nobody is consuming anymore then
+        if not stopping:
+            await queue.put(_StreamEnd())
+
+    task = asyncio.create_task(_produce())
+    try:
+        while True:
+            item = await queue.get()
+            if type(item) is _StreamEnd:
+                if item.error is not None:
+                    raise item.error
+                break
+            yield item
+
+    finally:
+        stopping = True
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
 class Datastore:
     """Class representing the session of a datalog for a trial."""
 
@@ -298,10 +451,12 @@ class Datastore:
         stub,
         cog_settings,
         metadata: GrpcMetadata = GrpcMetadata(),
+        cache: DatastoreCache = None,
     ):
         self._datastore_stub = stub
         self._cog_settings = cog_settings
         self._metadata = metadata.copy()
+        self._cache = cache
 
     def __str__(self):
         result = f"Datastore"
@@ -321,30 +476,54 @@ class Datastore:
     def has_specs(self):
         return self._cog_settings is not None
 
-    async def all_trials(self, bundle_size=1, wait_for_trials=0, properties={}, ids=[]):
+    async def _trial_page(self, bundle_size, wait_for_trials, properties, ids, trial_handle):
+        """Returns the trial infos from `trial_handle`, and the handle of the following trials"""
         request = datastore_api.RetrieveTrialsRequest()
         request.timeout = int(wait_for_trials * 1000)
         request.trials_count = bundle_size
-        request.trial_handle = ""
+        request.trial_handle = trial_handle
         request.properties.update(properties)
         request.trial_ids.extend(ids)
-        while True:
-            reply = await self._datastore_stub.RetrieveTrials(
-                request,
-                metadata=self._metadata.to_grpc_metadata(),
-            )
 
-            for reply_info in reply.trial_infos:
-                info = DatastoreTrialInfo(self._cog_settings, reply_info)
-                yield info
+        reply = await self._datastore_stub.RetrieveTrials(
+            request,
+            metadata=self._metadata.to_grpc_metadata(),
+        )
+
+        trial_infos = [DatastoreTrialInfo(self._cog_settings, reply_info) for reply_info in reply.trial_infos]
+        return trial_infos, reply.next_trial_handle
+
+    async def _all_trial_pages(self, bundle_size, wait_for_trials, properties, ids):
+        trial_handle = ""
+        while True:
+            trial_infos, next_trial_handle = await self._trial_page(bundle_size, wait_for_trials, properties, ids,
+                                                                    trial_handle)
+            yield trial_infos
 
-            if len(reply.trial_infos) < bundle_size:
+            if len(trial_infos) < bundle_size:
                 break
-            if reply.next_trial_handle:
-                request.trial_handle = reply.next_trial_handle
+            if next_trial_handle:
+                trial_handle = next_trial_handle
             else:
                 break
 
+    async def all_trials(self, bundle_size=1, wait_for_trials=0, properties={}, ids=[], prefetch=0):
+        """
+        Retrieve the trial infos, `bundle_size` trials at a time.
+        With `prefetch`, up to that number of bundles are requested in the background while trials are consumed.
+        """
+        pages = self._all_trial_pages(bundle_size, wait_for_trials, properties, ids)
+        if prefetch > 0:
+            pages = _prefetch(pages, prefetch)
+
+        try:
+            async for page in pages:
+                for info in page:
+                    yield info
+
+        finally:
+            await pages.aclose()
+
     async def get_trials(self, ids=[], properties={}):
         request = datastore_api.RetrieveTrialsRequest()
         request.properties.update(properties)
@@ -372,16 +551,15 @@ class Datastore:
 
         await self._datastore_stub.DeleteTrials(request, metadata=self._metadata.to_grpc_metadata())
 
-    async def all_samples(self, trial_infos, actor_names=[], actor_classes=[], actor_implementations=[], fields=[]):
+    def _samples_request(self, trial_infos, selection):
         if not trial_infos:
             raise CogmentError("At least one trial info must be provided to retrieve samples")
 
+        actor_names, actor_classes, actor_implementations, fields = selection
         request = datastore_api.RetrieveSamplesRequest()
 
-        params = {}
         for info in trial_infos:
             request.trial_ids.append(info.trial_id)
-            params[info.trial_id] = info.parameters
         for name in actor_names:
             request.actor_names.append(name)
         for cls in actor_classes:
@@ -391,36 +569,362 @@ class Datastore:
         for enum_field in fields:
             request.selected_sample_fields.append(enum_field.value)
 
+        return request
+
+    def _raw_samples(self, trial_infos, selection, caller, shards, ordered, buffer_size, retries):
+        if shards < 1:
+            raise CogmentError(f"Invalid number of shards [{shards}]")
+        if buffer_size < 1:
+            raise CogmentError(f"Invalid buffer size [{buffer_size}]")
+        if not trial_infos:
+            raise CogmentError("At least one trial info must be provided to retrieve samples")
+
+        if self._cache is not None:
+            return self._cached_raw_samples(trial_infos, selection, caller, shards, ordered, buffer_size, retries)
+        else:
+            return self._remote_raw_samples(trial_infos, selection, caller, shards, ordered, buffer_size, retries)
+
+    def _remote_raw_samples(self, trial_infos, selection, caller, shards, ordered, buffer_size, retries):
+        if shards == 1 and retries == 0:
+            request = self._samples_request(trial_infos, selection)
+            return self._retrieve_raw_samples(request, caller)
+        else:
+            return self._retrieve_sharded_raw_samples(trial_infos, selection, caller, shards, ordered, buffer_size,
+                                                      retries)
+
+    async def _cached_raw_samples(self, trial_infos, selection, caller, shards, ordered, buffer_size, retries):
+        # Ended trials found in the cache are read from it, the others are retrieved and written to the cache.
+        # If not ordered, the cached trials are served first.
+        cache = self._cache
+        loop = asyncio.get_running_loop()
+        remote_infos = []
+        for info in trial_infos:
+            cached = None
+            if info.trial_state == TrialState.ENDED and cache.contains(info.trial_id, selection):
+                if ordered and remote_infos:
+                    raw_samples = self._caching_raw_samples(remote_infos, selection, caller, shards, ordered,
+                                                            buffer_size, retries)
+                    try:
+                        async for raw_sample in raw_samples:
+                            yield raw_sample
+                    finally:
+                        await raw_samples.aclose()
+                    remote_infos = []
+
+                # The files are read in an executor, by chunks of samples
+                cached = await loop.run_in_executor(None, _read_cached_contents, cache, info.trial_id, selection)
+
+            if cached is None:
+                remote_infos.append(info)
+                continue
+
+            cached_samples, contents = cached
+            try:
+                while contents:
+                    for content in contents:
+                        yield _parse_stored_sample(content)
+                    contents = await loop.run_in_executor(None, _next_contents, cached_samples)
+            finally:
+                cached_samples.close()
+
+        if remote_infos:
+            raw_samples = self._caching_raw_samples(remote_infos, selection, caller, shards, ordered, buffer_size,
+                                                    retries)
+            try:
+                async for raw_sample in raw_samples:
+                    yield raw_sample
+            finally:
+                await raw_samples.aclose()
+
+    async def _caching_raw_samples(self, trial_infos, selection, caller, shards, ordered, buffer_size, retries):
+        # Retrieved samples of ended trials are written to the cache
+        cache = self._cache
+        loop = asyncio.get_running_loop()
+        writers = {}
+        raw_samples = self._remote_raw_samples(trial_infos, selection, caller, shards, ordered, buffer_size, retries)
+        try:
+            async for raw_sample in raw_samples:
+                trial_id = raw_sample.trial_id
+                writer = writers.get(trial_id)
+                if writer is None:
+                    writer = cache.writer(trial_id, selection)
+                    writers[trial_id] = writer
+
+                # The files are written in an executor
+                writer.append(raw_sample.SerializeToString())
+                if raw_sample.state == TrialState.ENDED.value:
+                    # Only complete trials are kept
+                    del writers[trial_id]
+                    await loop.run_in_executor(None, writer.commit)
+                elif writer.pending_size >= _CACHE_WRITE_SIZE:
+                    await loop.run_in_executor(None, writer.flush)
+
+                yield raw_sample
+
+        finally:
+            for writer in writers.values():
+                await loop.run_in_executor(None, writer.abort)
+            await raw_samples.aclose()
+
+    async def _retrieve_raw_samples(self, request, caller):
         reply_itor = self._datastore_stub.RetrieveSamples(
             request,
             metadata=self._metadata.to_grpc_metadata(),
         )
         if not reply_itor:
-            raise CogmentError(f"'all_samples' failed to connect")
+            raise CogmentError(f"'{caller}' failed to connect")
 
         try:
             async for reply in reply_itor:
-                raw_sample = reply.trial_sample
-                param = params[raw_sample.trial_id]
-                sample = DatastoreSample(raw_sample, param)
-                keep_looping = yield sample
-                if keep_looping is not None and not bool(keep_looping):
-                    break
+                yield reply.trial_sample
 
         except grpc.aio.AioRpcError as exc:
             logger.debug(f"gRPC failed status details: [{exc.debug_error_string()}]")
             if exc.code() == grpc.StatusCode.UNAVAILABLE:
-                logger.error(f"Datastore all_samples communication lost: [{exc.details()}]")
+                logger.error(f"Datastore {caller} communication lost: [{exc.details()}]")
             else:
-                logger.exception("Datastore all_samples -- Unexpected aio failure")
+                logger.exception(f"Datastore {caller} -- Unexpected aio failure")
                 raise
 
         except GeneratorExit:
             raise
 
         except asyncio.CancelledError as exc:
-            logger.debug(f"Datastore all_samples coroutine cancelled while waiting for samples: [{exc}]")
+            logger.debug(f"Datastore {caller} coroutine cancelled while waiting for samples: [{exc}]")
 
         except Exception:
-            logger.exception("Datastore all_samples")
+            logger.exception(f"Datastore {caller}")
+            raise
+
+    async def _retrieve_sharded_raw_samples(self, trial_infos, selection, caller, shards, ordered, buffer_size,
+                                            retries):
+        if not trial_infos:
+            raise CogmentError("At least one trial info must be provided to retrieve samples")
+
+        # Contiguous shards so that the ordered merge yields the samples in the order of the trials
+        shards = min(shards, len(trial_infos))
+        shard_size, remainder = divmod(len(trial_infos), shards)
+        shard_infos = []
+        start = 0
+        for index in range(shards):
+            end = start + shard_size + (1 if index < remainder else 0)
+            shard_infos.append(trial_infos[start:end])
+            start = end
+
+        if ordered:
+            queues = [asyncio.Queue(max(buffer_size // shards, 1)) for _ in range(shards)]
+        else:
+            queues = [asyncio.Queue(buffer_size)] * shards
+        tasks = [asyncio.create_task(self._retrieve_shard(infos, selection, caller, queue, retries))
+                 for infos, queue in zip(shard_infos, queues)]
+
+        try:
+            nb_running = shards
+            shard_index = 0
+            while nb_running > 0:
+                item = await queues[shard_index].get()
+                if type(item) is not _StreamEnd:
+                    yield item
+                    continue
+
+                nb_running -= 1
+                if ordered:
+                    shard_index += 1
+                if item.error is None:
+                    continue
+
+                exc = item.error
+                if isinstance(exc, grpc.aio.AioRpcError) and exc.code() == grpc.StatusCode.UNAVAILABLE:
+                    logger.error(f"Datastore {caller} communication lost: [{exc.details()}]")
+                    break
+                raise exc
+
+        except asyncio.CancelledError as exc:
+            logger.debug(f"Datastore {caller} coroutine cancelled while waiting for samples: [{exc}]")
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _retrieve_shard(self, shard_infos, selection, caller, queue, retries):
+        # Samples already retrieved are skipped when a shard is retried
+        last_tick_ids = {}
+        ended_trials = set()
+        attempt = 0
+        try:
+            while True:
+                infos = [info for info in shard_infos if info.trial_id not in ended_trials]
+                if not infos:
+                    break
+                request = self._samples_request(infos, selection)
+
+                try:
+                    reply_itor = self._datastore_stub.RetrieveSamples(
+                        request,
+                        metadata=self._metadata.to_grpc_metadata(),
+                    )
+                    if not reply_itor:
+                        raise CogmentError(f"'{caller}' failed to connect")
+
+                    async for reply in reply_itor:
+                        raw_sample = reply.trial_sample
+                        trial_id = raw_sample.trial_id
+                        last_tick_id = last_tick_ids.get(trial_id)
+                        if last_tick_id is not None and raw_sample.tick_id <= last_tick_id:
+                            continue
+                        last_tick_ids[trial_id] = raw_sample.tick_id
+                        if raw_sample.state == TrialState.ENDED.value:
+                            ended_trials.add(trial_id)
+
+                        attempt = 0
+                        await queue.put(raw_sample)
+                    break
+
+                except grpc.aio.AioRpcError as exc:
+                    logger.debug(f"gRPC failed status details: [{exc.debug_error_string()}]")
+                    if exc.code() != grpc.StatusCode.UNAVAILABLE or attempt >= retries:
+                        raise
+
+                    delay = _STREAM_RETRY_DELAY * (2 ** attempt)
+                    attempt += 1
+                    logger.warning(f"Datastore {caller} communication lost, retrying in [{delay}] seconds "
+                                   f"(attempt [{attempt}/{retries}]): [{exc.details()}]")
+                    await asyncio.sleep(delay)
+
+        except asyncio.CancelledError:
             raise
+
+        except Exception as exc:
+            await queue.put(_StreamEnd(exc))
+            return
+
+        await queue.put(_StreamEnd())
+
+    async def all_samples(self, trial_infos, actor_names=[], actor_classes=[], actor_implementations=[], fields=[],
+                          shards=1, ordered=True, buffer_size=256, retries=0, prefetch=0):
+        """
+        Retrieve samples of the trials.
+        With more than one shard, the trials are split between `shards` concurrent streams, and up to
+        `buffer_size` samples are retrieved in advance. Streams losing the connection are retried `retries` times.
+        With `prefetch`, up to that number of samples are retrieved and decoded in the background.
+        """
+        selection = (actor_names, actor_classes, actor_implementations, fields)
+        params = {info.trial_id: info.parameters for info in trial_infos}
+
+        raw_samples = self._raw_samples(trial_infos, selection, "all_samples", shards, ordered, buffer_size, retries)
+        samples = _decode_samples(raw_samples, params)
+        if prefetch > 0:
+            samples = _prefetch(samples, prefetch)
+
+        try:
+            async for sample in samples:
+                keep_looping = yield sample
+                if keep_looping is not None and not bool(keep_looping):
+                    break
+
+        finally:
+            await samples.aclose()
+
+    async def all_sample_columns(self, trial_infos, actor_names=[], actor_classes=[], actor_implementations=[],
+                                 fields=[], batch_size=0, raw_payloads=False, shards=1, ordered=True, buffer_size=256,
+                                 retries=0):
+        """
+        Retrieve samples as `DatastoreColumns` (NumPy arrays with one row per actor per sample).
+        Columns are yielded per trial when `batch_size` is 0, or per batch of `batch_size` samples otherwise.
+        The sharding parameters are the same as for `all_samples`.
+        """
+        np = import_numpy()
+
+        if batch_size < 0:
+            raise CogmentError(f"Invalid batch size [{batch_size}]")
+
+        selection = (actor_names, actor_classes, actor_implementations, fields)
+        payload_fields = [field.name.lower() for field in fields]
+        builder = _ColumnsBuilder(np, trial_infos, actor_classes, payload_fields, raw_payloads)
+
+        raw_samples = self._raw_samples(trial_infos, selection, "all_sample_columns", shards, ordered, buffer_size,
+                                        retries)
+        try:
+            if batch_size > 0:
+                max_nb_actors = max(len(info.parameters.actors) for info in trial_infos)
+                buffers = builder.new_buffers(batch_size * max(max_nb_actors, 1))
+                nb_samples = 0
+                async for raw_sample in raw_samples:
+                    builder.add_sample(buffers, raw_sample)
+                    nb_samples += 1
+                    if nb_samples >= batch_size:
+                        yield builder.make_columns(buffers)
+                        buffers = builder.new_buffers(batch_size * max(max_nb_actors, 1))
+                        nb_samples = 0
+
+                if nb_samples > 0:
+                    yield builder.make_columns(buffers)
+
+            else:
+                # Samples of different trials could be interleaved in the stream
+                trial_buffers = {}
+                async for raw_sample in raw_samples:
+                    trial_id = raw_sample.trial_id
+                    buffers = trial_buffers.get(trial_id)
+                    if buffers is None:
+                        buffers = builder.new_buffers(builder.sample_capacity(trial_id))
+                        trial_buffers[trial_id] = buffers
+
+                    builder.add_sample(buffers, raw_sample)
+                    if raw_sample.state == TrialState.ENDED.value:
+                        del trial_buffers[trial_id]
+                        yield builder.make_columns(buffers)
+
+                for buffers in trial_buffers.values():
+                    yield builder.make_columns(buffers)
+
+        finally:
+            await raw_samples.aclose()
+
+    async def export_samples(self, directory, ids=[], properties={}, actor_names=[], actor_classes=[],
+                             actor_implementations=[], fields=[], samples_per_shard=10_000, raw_payloads=False,
+                             compress=True, prefix="samples", shards=1, retries=0):
+        """
+        Write the samples of the trials with the given IDs or properties to `.npz` shard files in `directory`.
+        Each shard holds the columns of `samples_per_shard` samples (see `all_sample_columns`), the memory used does
+        not depend on the length of the trials. Returns the paths of the shards written.
+        """
+        np = import_numpy()
+
+        if samples_per_shard <= 0:
+            raise CogmentError(f"Invalid number of samples per shard [{samples_per_shard}]")
+
+        trial_infos = [info async for info in self.all_trials(bundle_size=100, properties=properties, ids=ids)]
+        if not trial_infos:
+            logger.warning(f"No trial to export")
+            return []
+
+        os.makedirs(directory, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        paths = []
+        pending_write = None
+        all_columns = self.all_sample_columns(trial_infos, actor_names, actor_classes, actor_implementations, fields,
+                                              batch_size=samples_per_shard, raw_payloads=raw_payloads,
+                                              shards=shards, retries=retries)
+        try:
+            async for columns in all_columns:
+                path = os.path.join(directory, f"{prefix}-{len(paths):05d}.npz")
+
+                # The next shard is retrieved while the previous one is compressed and written
+                if pending_write is not None:
+                    await pending_write
+                pending_write = loop.run_in_executor(None, _write_npz, np, path, columns.to_arrays(np), compress)
+                paths.append(path)
+
+            if pending_write is not None:
+                await pending_write
+                pending_write = None
+
+        finally:
+            await all_columns.aclose()
+            if pending_write is not None:
+                await asyncio.gather(pending_write, return_exceptions=True)
+
+        logger.debug(f"Exported the samples of [{len(trial_infos)}] trials to [{len(paths)}] shards in [{directory}]")
+        return paths
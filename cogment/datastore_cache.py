@@ -0,0 +1,228 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from cogment.errors import CogmentError
+from cogment.utils import logger
+
+import psutil
+
+from collections import OrderedDict
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+# Default size budget (in bytes) of the cache
+DATASTORE_CACHE_SIZE = 1 << 30
+
+_SAMPLES_SUFFIX = ".samples"
+_INDEX_SUFFIX = ".index"
+_TMP_SUFFIX = ".tmp"
+
+# Offset and length of each serialized sample in the samples file
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+
+def _is_stale_tmp(file_name):
+    # Temporary files are named "<key>.<pid>.<random><suffixes>": they are kept while their writer process runs
+    parts = file_name.split(".")
+    try:
+        pid = int(parts[1])
+    except (IndexError, ValueError):
+        return True
+    return not psutil.pid_exists(pid)
+
+
+def _cache_key(trial_id, selection):
+    actor_names, actor_classes, actor_implementations, fields = selection
+    description = repr((trial_id, sorted(actor_names), sorted(actor_classes), sorted(actor_implementations),
+                        sorted(field.value for field in fields)))
+    return hashlib.sha1(description.encode("utf-8")).hexdigest()
+
+
+class DatastoreCache:
+    """Class representing a local on-disk cache of the samples of ended trials."""
+
+    def __init__(self, directory, max_size: int = DATASTORE_CACHE_SIZE):
+        if max_size <= 0:
+            raise CogmentError(f"Invalid datastore cache size [{max_size}]")
+
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+        # Least recently used first (writers commit from executor threads)
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._load_entries()
+
+    def __str__(self):
+        result = f"DatastoreCache: directory = {self.directory}, max_size = {self.max_size}"
+        result += f", size = {self._size}, nb trials = {len(self._entries)}"
+        return result
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        return self._size
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def _load_entries(self):
+        entries = []
+        for file_name in os.listdir(self.directory):
+            path = os.path.join(self.directory, file_name)
+            if file_name.endswith(_TMP_SUFFIX):
+                if _is_stale_tmp(file_name):
+                    # Left over by an interrupted retrieval
+                    os.remove(path)
+                continue
+            if not file_name.endswith(_INDEX_SUFFIX):
+                continue
+
+            key = file_name[:-len(_INDEX_SUFFIX)]
+            samples_path = self._path(key, _SAMPLES_SUFFIX)
+            if not os.path.exists(samples_path):
+                os.remove(path)
+                continue
+            size = os.path.getsize(samples_path) + os.path.getsize(path)
+            entries.append((os.path.getmtime(path), key, size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+        self._evict()
+
+    def contains(self, trial_id, selection):
+        with self._lock:
+            return _cache_key(trial_id, selection) in self._entries
+
+    def read(self, trial_id, selection):
+        """Generator of the serialized samples of a cached trial (the files are only read when iterating)"""
+        key = _cache_key(trial_id, selection)
+        with self._lock:
+            if key not in self._entries:
+                raise CogmentError(f"Trial [{trial_id}] is not in the datastore cache")
+            self._entries.move_to_end(key)
+
+        return self._read_samples(key)
+
+    def _read_samples(self, key):
+        index_path = self._path(key, _INDEX_SUFFIX)
+        os.utime(index_path)
+        with open(index_path, "rb") as index_file:
+            index = index_file.read()
+        if not index:
+            return
+
+        with open(self._path(key, _SAMPLES_SUFFIX), "rb") as samples_file:
+            with mmap.mmap(samples_file.fileno(), 0, access=mmap.ACCESS_READ) as samples:
+                for offset, length in _INDEX_ENTRY.iter_unpack(index):
+                    yield samples[offset:offset + length]
+
+    def writer(self, trial_id, selection):
+        return _DatastoreCacheWriter(self, _cache_key(trial_id, selection))
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def _add(self, key, size):
+        with self._lock:
+            previous_size = self._entries.pop(key, None)
+            if previous_size is not None:
+                self._size -= previous_size
+            self._entries[key] = size
+            self._size += size
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_size and self._entries:
+            key = next(iter(self._entries))
+            logger.debug(f"Evicting [{key}] from the datastore cache")
+            self._remove(key)
+
+    def _remove(self, key):
+        self._size -= self._entries.pop(key)
+        # The index is removed first as it marks complete entries
+        for suffix in (_INDEX_SUFFIX, _SAMPLES_SUFFIX):
+            try:
+                os.remove(self._path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+
+class _DatastoreCacheWriter:
+    """Internal class appending the samples of a trial to a new cache entry."""
+
+    def __init__(self, cache, key):
+        self._cache = cache
+        self._key = key
+        self._samples_path = None
+        self._samples_file = None
+        self._index = bytearray()
+        self._offset = 0
+
+        # Appended samples are only written to disk by `flush`, `commit` and `abort` (e.g. in an executor)
+        self._pending = []
+        self.pending_size = 0
+
+    def _make_tmp_file(self, suffix):
+        # Unique per writer, the process ID lets other processes know if the file is still being written
+        fd, path = tempfile.mkstemp(suffix=suffix + _TMP_SUFFIX, prefix=f"{self._key}.{os.getpid()}.",
+                                    dir=self._cache.directory)
+        return os.fdopen(fd, "wb"), path
+
+    def append(self, content: bytes):
+        self._pending.append(content)
+        self.pending_size += len(content)
+        self._index += _INDEX_ENTRY.pack(self._offset, len(content))
+        self._offset += len(content)
+
+    def flush(self):
+        if self._samples_file is None:
+            self._samples_file, self._samples_path = self._make_tmp_file(_SAMPLES_SUFFIX)
+        self._samples_file.writelines(self._pending)
+        self._pending.clear()
+        self.pending_size = 0
+
+    def commit(self):
+        self.flush()
+        self._samples_file.close()
+
+        cache = self._cache
+        index_file, index_tmp_path = self._make_tmp_file(_INDEX_SUFFIX)
+        with index_file:
+            index_file.write(self._index)
+
+        os.replace(self._samples_path, cache._path(self._key, _SAMPLES_SUFFIX))
+        os.replace(index_tmp_path, cache._path(self._key, _INDEX_SUFFIX))
+        cache._add(self._key, self._offset + len(self._index))
+
+    def abort(self):
+        self._pending.clear()
+        if self._samples_file is None:
+            return
+        self._samples_file.close()
+        try:
+            os.remove(self._samples_path)
+        except FileNotFoundError:
+            pass
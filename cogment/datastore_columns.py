@@ -0,0 +1,248 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from cogment.control import TrialState
+from cogment.errors import CogmentError
+from cogment.session import _scalar_fields
+
+import os
+from types import SimpleNamespace
+
+# Rows allocated when no better capacity hint is available
+_DEFAULT_CAPACITY = 1024
+
+_PAYLOAD_NAMES = ["observation", "action"]
+
+
+class DatastoreColumns:
+    """Class representing datastore samples as NumPy arrays (one row per actor per sample)."""
+
+    def __init__(self, trial_ids, columns, payloads):
+        self.trial_ids = trial_ids
+        self.columns = columns
+        self.payloads = payloads
+
+    def __getitem__(self, column_name):
+        return self.columns[column_name]
+
+    def __contains__(self, column_name):
+        return column_name in self.columns
+
+    def __len__(self):
+        return len(self.columns["tick_id"])
+
+    def __str__(self):
+        result = f"DatastoreColumns: trial_ids = {self.trial_ids}, nb rows = {len(self)}"
+        result += f", columns = {list(self.columns)}"
+        return result
+
+    def to_arrays(self, np):
+        """All the columns, trial IDs and payloads as a flat dict of arrays (e.g. for `numpy.savez`)"""
+        arrays = dict(self.columns)
+        arrays["trial_ids"] = np.array(self.trial_ids, dtype=str)
+        for name, payload in self.payloads.items():
+            arrays[f"payload.{name}"] = payload
+        return arrays
+
+    def payload(self, name, row):
+        """Serialized observation or action of a row (only with raw payloads)"""
+        if name not in self.payloads:
+            raise CogmentError(f"No raw [{name}] payloads in these columns")
+        if not self.columns[f"has_{name}"][row]:
+            return None
+        offset = int(self.columns[f"{name}_offset"][row])
+        length = int(self.columns[f"{name}_length"][row])
+        return self.payloads[name][offset:offset + length].tobytes()
+
+
+def _write_npz(np, path, arrays, compress):
+    # Written to a temporary file first to never leave partial shards
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as npz_file:
+        if compress:
+            np.savez_compressed(npz_file, **arrays)
+        else:
+            np.savez(npz_file, **arrays)
+    os.replace(tmp_path, path)
+
+
+class _GrowableArray:
+    """Internal class for a NumPy array preallocated and grown by doubling its capacity."""
+
+    def __init__(self, np, dtype, capacity):
+        self._np = np
+        self.array = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def reserve(self, capacity):
+        if capacity > len(self.array):
+            new_array = self._np.zeros(max(capacity, 2 * len(self.array)), dtype=self.array.dtype)
+            new_array[:self.size] = self.array[:self.size]
+            self.array = new_array
+
+    def extend_bytes(self, content):
+        # Only for uint8 arrays
+        start = self.size
+        self.reserve(start + len(content))
+        self.array[start:start + len(content)] = self._np.frombuffer(content, dtype="uint8")
+        self.size += len(content)
+        return start
+
+    def view(self):
+        return self.array[:self.size]
+
+
+class _ColumnsBuilder:
+    """Internal class filling column buffers from the raw samples of the trial datastore."""
+
+    def __init__(self, np, trial_infos, actor_classes, fields, raw_payloads):
+        self._np = np
+        self._raw_payloads = raw_payloads
+
+        self._trials = {}
+        class_names = set()
+        for info in trial_infos:
+            actors = info.parameters.actors
+            trial = SimpleNamespace(
+                trial_id=info.trial_id,
+                actor_classes=[actors[index].actor_class for index in range(len(actors))],
+                sample_count=info.sample_count,
+            )
+            self._trials[info.trial_id] = trial
+            if actor_classes:
+                class_names.update(name for name in trial.actor_classes if name in actor_classes)
+            else:
+                class_names.update(trial.actor_classes)
+
+        self._payload_names = [name for name in _PAYLOAD_NAMES if not fields or name in fields]
+
+        # One reusable message and field list per actor class and payload
+        self._parsers = {name: {} for name in self._payload_names}
+        self._dtypes = {}
+        if not raw_payloads and self._payload_names:
+            specs = {}
+            for info in trial_infos:
+                if not info.parameters.has_specs():
+                    raise CogmentError("Decoding observations and actions into columns requires the trial specs "
+                                       "('cog_settings'), retrieve raw payloads or select other fields otherwise")
+                actors = info.parameters.actors
+                for index in range(len(actors)):
+                    actor = actors[index]
+                    if actor.actor_class in class_names and actor.actor_class not in specs:
+                        specs[actor.actor_class] = actor.actor_class_spec
+
+            for payload_name in self._payload_names:
+                for class_name, class_spec in specs.items():
+                    message_type = getattr(class_spec, f"{payload_name}_space")
+                    fields_list = _scalar_fields(message_type)
+                    self._parsers[payload_name][class_name] = (message_type(), fields_list)
+                    for field_name, dtype in fields_list:
+                        column_name = f"{payload_name}.{field_name}"
+                        previous_dtype = self._dtypes.get(column_name)
+                        if previous_dtype is not None and previous_dtype != dtype:
+                            self._dtypes[column_name] = np.result_type(previous_dtype, dtype)
+                        else:
+                            self._dtypes[column_name] = dtype
+
+    def sample_capacity(self, trial_id):
+        trial = self._trials[trial_id]
+        return max(trial.sample_count, 1) * max(len(trial.actor_classes), 1)
+
+    def new_buffers(self, capacity=_DEFAULT_CAPACITY):
+        np = self._np
+
+        dtypes = {
+            "trial_index": "int32",
+            "tick_id": "uint64",
+            "timestamp": "uint64",
+            "actor_index": "int32",
+            "reward": "float32",
+            "done": "bool",
+        }
+        for payload_name in self._payload_names:
+            dtypes[f"has_{payload_name}"] = "bool"
+            if self._raw_payloads:
+                dtypes[f"{payload_name}_offset"] = "int64"
+                dtypes[f"{payload_name}_length"] = "int64"
+        dtypes.update(self._dtypes)
+
+        columns = {name: _GrowableArray(np, dtype, capacity) for name, dtype in dtypes.items()}
+        payloads = {}
+        if self._raw_payloads:
+            payloads = {name: _GrowableArray(np, "uint8", capacity * 16) for name in self._payload_names}
+
+        return SimpleNamespace(trial_ids=[], trial_indexes={}, columns=columns, payloads=payloads, nb_rows=0)
+
+    def add_sample(self, buffers, raw_sample):
+        trial_id = raw_sample.trial_id
+        trial = self._trials[trial_id]
+        trial_index = buffers.trial_indexes.get(trial_id)
+        if trial_index is None:
+            trial_index = len(buffers.trial_ids)
+            buffers.trial_indexes[trial_id] = trial_index
+            buffers.trial_ids.append(trial_id)
+
+        actor_samples = raw_sample.actor_samples
+        row = buffers.nb_rows
+        end_row = row + len(actor_samples)
+        columns = buffers.columns
+        for column in columns.values():
+            column.reserve(end_row)
+
+        done = (raw_sample.state == TrialState.ENDED.value)
+        columns["trial_index"].array[row:end_row] = trial_index
+        columns["tick_id"].array[row:end_row] = raw_sample.tick_id
+        columns["timestamp"].array[row:end_row] = raw_sample.timestamp
+        columns["done"].array[row:end_row] = done
+
+        payloads = raw_sample.payloads
+        actor_index_column = columns["actor_index"].array
+        reward_column = columns["reward"].array
+        for actor_sample in actor_samples:
+            actor_index = actor_sample.actor
+            actor_index_column[row] = actor_index
+            if actor_sample.HasField("reward"):
+                reward_column[row] = actor_sample.reward
+
+            for payload_name in self._payload_names:
+                if not actor_sample.HasField(payload_name):
+                    continue
+                content = payloads[getattr(actor_sample, payload_name)]
+                if content is None:
+                    continue
+                columns[f"has_{payload_name}"].array[row] = True
+
+                if self._raw_payloads:
+                    offset = buffers.payloads[payload_name].extend_bytes(content)
+                    columns[f"{payload_name}_offset"].array[row] = offset
+                    columns[f"{payload_name}_length"].array[row] = len(content)
+                else:
+                    parser = self._parsers[payload_name].get(trial.actor_classes[actor_index])
+                    if parser is None:
+                        continue
+                    message, fields_list = parser
+                    message.ParseFromString(content)
+                    for field_name, _ in fields_list:
+                        columns[f"{payload_name}.{field_name}"].array[row] = getattr(message, field_name)
+
+            row += 1
+
+        for column in columns.values():
+            column.size = end_row
+        buffers.nb_rows = end_row
+
+    def make_columns(self, buffers):
+        columns = {name: column.view() for name, column in buffers.columns.items()}
+        payloads = {name: payload.view() for name, payload in buffers.payloads.items()}
+        return DatastoreColumns(buffers.trial_ids, columns, payloads)
@@ -24,9 +24,11 @@ from cogment.grpc_metadata import GrpcMetadata
 import cogment.endpoints as ep
 
 import copy
+import random
+import time
 import urllib.parse as urlpar
 from enum import Enum
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 AUTHENTICATION_TOKEN_METADATA_NAME = "authentication-token"
 
@@ -46,7 +48,15 @@ class ServiceType(Enum):
     OTHER = directory_api.ServiceType.OTHER_SERVICE  # type: ignore[attr-defined]
 
 
-# TODO: Add a cache to service?
+class EndpointSelection(Enum):
+    """Enum class for the policies selecting an endpoint among the services found in the directory."""
+
+    MOST_RECENT = 0
+    ROUND_ROBIN = 1
+    RANDOM = 2
+    LEAST_LOADED = 3  # Lowest "overall_load" then "nb_sessions" reported by the services
+
+
 # TODO: Make ready for end users?
 class Directory:
     def __init__(
@@ -54,11 +64,26 @@ class Directory:
         stub,
         auth_token: str,
         metadata: GrpcMetadata = GrpcMetadata(),
+        cache_ttl: float = 0.0,
+        negative_cache_ttl: float = None,
+        selection: EndpointSelection = EndpointSelection.MOST_RECENT,
+        load_monitor=None,
     ):
         self._stub = stub
         self._auth_token = auth_token
         self._metadata = metadata.copy()
 
+        # Inquiry results are cached for `cache_ttl` seconds (`negative_cache_ttl` for empty results), 0 to disable
+        self._cache_ttl = cache_ttl
+        self._negative_cache_ttl = cache_ttl if negative_cache_ttl is None else negative_cache_ttl
+        self._inquiry_cache: Dict[Any, Tuple[float, List[Tuple[str, bool]]]] = {}
+
+        if selection == EndpointSelection.LEAST_LOADED and load_monitor is None:
+            raise CogmentError(f"A load monitor is required for endpoint selection [{selection}]")
+        self._selection = selection
+        self._load_monitor = load_monitor
+        self._round_robin_counters: Dict[Tuple[str, ...], int] = {}
+
         if self._auth_token:
             self._metadata = self._metadata.add(AUTHENTICATION_TOKEN_METADATA_NAME, self._auth_token)
 
@@ -129,7 +154,7 @@ class Directory:
     async def inquire_by_id(self, service_id: int):
         request = directory_api.InquireRequest()
         request.service_id = service_id
-        dir_urls = await self._inquire(request)
+        dir_urls = await self._cached_inquire(("id", service_id), request)
 
         return dir_urls
 
@@ -138,8 +163,36 @@ class Directory:
         request.details.type = type.value
         for key, val in properties.items():
             request.details.properties[key] = val
+        dir_urls = await self._cached_inquire(("type", type, frozenset(properties.items())), request)
+
+        return dir_urls
+
+    def invalidate_url(self, url: str):
+        """Remove the cached inquiry results containing the URL (e.g. because it could not be reached)"""
+        for key, (_, dir_urls) in list(self._inquiry_cache.items()):
+            if any(dir_url == url for dir_url, _ in dir_urls):
+                del self._inquiry_cache[key]
+
+    def clear_cache(self):
+        self._inquiry_cache.clear()
+
+    async def _cached_inquire(self, key, request) -> List[Tuple[str, bool]]:
+        if self._cache_ttl <= 0 and self._negative_cache_ttl <= 0:
+            return await self._inquire(request)
+
+        cached = self._inquiry_cache.get(key)
+        if cached is not None:
+            expiration, dir_urls = cached
+            if time.monotonic() < expiration:
+                return dir_urls
+            del self._inquiry_cache[key]
+
         dir_urls = await self._inquire(request)
 
+        ttl = self._cache_ttl if len(dir_urls) > 0 else self._negative_cache_ttl
+        if ttl > 0:
+            self._inquiry_cache[key] = (time.monotonic() + ttl, dir_urls)
+
         return dir_urls
 
     async def _inquire(self, request) -> List[Tuple[str, bool]]:
@@ -173,21 +226,41 @@ class Directory:
 
         return result
 
-    def _new_endpoint(self, endpoint: ep.Endpoint, dir_urls):
+    async def _select_url(self, endpoint: ep.Endpoint, urls: List[str], type: ServiceType):
+        if len(urls) == 1 or self._selection == EndpointSelection.MOST_RECENT:
+            return urls[0]  # The first one is the most recent
+
+        if self._selection == EndpointSelection.ROUND_ROBIN:
+            key = tuple(sorted(urls))
+            counter = self._round_robin_counters.get(key, 0)
+            self._round_robin_counters[key] = counter + 1
+            return key[counter % len(key)]
+
+        if self._selection == EndpointSelection.RANDOM:
+            return random.choice(urls)
+
+        if self._selection == EndpointSelection.LEAST_LOADED and type is not None:
+            endpoints = []
+            for url in urls:
+                candidate = copy.copy(endpoint)
+                candidate.url = url
+                endpoints.append(candidate)
+            loads = await self._load_monitor.get_loads(type, endpoints)
+            return min(urls, key=lambda url: loads[url].sort_key())  # Stable: most recent on ties
+
+        return urls[0]
+
+    async def _new_endpoint(self, endpoint: ep.Endpoint, dir_urls, type: ServiceType = None):
         if len(dir_urls) == 0:
             # TODO: Decide what to do in case inquiry did not find a service in directory
             return endpoint
 
-        url = None
         ssl_endpoint = endpoint.using_ssl()
-        for dir_url, dir_ssl in dir_urls:
-            if (ssl_endpoint and dir_ssl) or (not ssl_endpoint and not dir_ssl):
-                url = dir_url
-                break  # We take the first (most recent) one
+        urls = [dir_url for dir_url, dir_ssl in dir_urls if dir_ssl == ssl_endpoint]
 
-        if url is not None:
+        if len(urls) > 0:
             new_endpoint = copy.copy(endpoint)
-            new_endpoint.url = url
+            new_endpoint.url = await self._select_url(endpoint, urls, type)
         else:
             if not ssl_endpoint:
                 raise CogmentError(f"All services found require an SSL connection [{endpoint.url}]")
@@ -256,7 +329,7 @@ class Directory:
                 if len(dir_urls) == 0:
                     logger.error(f"No resource in directory with service id [{service_id}] [{endpoint.url}]")
 
-                result = self._new_endpoint(endpoint, dir_urls)
+                result = await self._new_endpoint(endpoint, dir_urls)
                 logger.debug(f"Inquired service endpoint result [{result.url}]")
                 return result
 
@@ -306,7 +379,7 @@ class Directory:
         else:
             logger.debug(f"Inquired directory for [{endpoint.url}] with [{dir_type}] and [{properties}]")
 
-        result_endpoint = self._new_endpoint(endpoint, dir_urls)
+        result_endpoint = await self._new_endpoint(endpoint, dir_urls, dir_type)
         logger.debug(f"Inquired endpoint result [{result_endpoint.url}]")
 
         return result_endpoint
@@ -14,8 +14,9 @@
 
 from cogment.utils import logger
 
+import grpc
 import os
-from typing import List, Tuple
+from typing import List, Tuple, Any
 
 # Schemes
 GRPC_SCHEME = "grpc"
@@ -114,9 +115,37 @@ class ServedEndpoint:
         self.private_key_certificate_chain_pairs: List[Tuple[str, str]] = None
         self.root_certificates: str = None
 
+        # gRPC server tuning, `None` to keep the gRPC default
+        self.max_concurrent_streams: int = None  # Per client connection
+        self.max_receive_message_length: int = None
+        self.max_send_message_length: int = None
+        self.keepalive_time_ms: int = None
+        self.keepalive_timeout_ms: int = None
+        self.http2_lookahead_bytes: int = None  # HTTP/2 flow control window
+        self.compression: grpc.Compression = None
+        self.grpc_options: List[Tuple[str, Any]] = []  # Any other gRPC channel argument
+
     def using_ssl(self):
         return self.private_key_certificate_chain_pairs is not None
 
+    def _grpc_server_options(self):
+        options = []
+        if self.max_concurrent_streams is not None:
+            options.append(("grpc.max_concurrent_streams", self.max_concurrent_streams))
+        if self.max_receive_message_length is not None:
+            options.append(("grpc.max_receive_message_length", self.max_receive_message_length))
+        if self.max_send_message_length is not None:
+            options.append(("grpc.max_send_message_length", self.max_send_message_length))
+        if self.keepalive_time_ms is not None:
+            options.append(("grpc.keepalive_time_ms", self.keepalive_time_ms))
+        if self.keepalive_timeout_ms is not None:
+            options.append(("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms))
+        if self.http2_lookahead_bytes is not None:
+            options.append(("grpc.http2.lookahead_bytes", self.http2_lookahead_bytes))
+        options.extend(self.grpc_options)
+
+        return options
+
     # def set_from_files(private_key_certificate_chain_pairs_file=None, root_certificates_file=None):
     # TODO: This function would need to parse the PEM encoded `private_key_certificate_chain_pairs_file`
     #       to create the list of tuples required (see simpler version in `Endpoint` class above).
@@ -125,4 +154,5 @@ class ServedEndpoint:
         result = f"ServedEndpoint: port = {self.port}"
         result += f", private_key_certificate_chain_pairs = {self.private_key_certificate_chain_pairs}"
         result += f", root_certificates = {self.root_certificates}"
+        result += f", grpc_server_options = {self._grpc_server_options()}, compression = {self.compression}"
         return result
@@ -21,7 +21,7 @@ import cogment.api.common_pb2 as common_api
 
 import cogment.utils as utils
 from cogment.utils import logger
-from cogment.session import RecvEvent, RecvMessage, ActorStatus, RecvAction, EventType
+from cogment.session import RecvEvent, RecvMessage, EventType
 from cogment.session import _InitAck, _EndingAck, _Ending
 from cogment.errors import CogmentError
 from cogment.environment import EnvironmentSession
@@ -65,6 +65,24 @@ class _PrometheusData:
             ["impl_name"],
             registry=prometheus_registry
         )
+        self.executor_wait_time = Summary(
+            "environment_executor_wait_seconds",
+            "Time spent by functions waiting to be run in the environment executor",
+            ["impl_name"],
+            registry=prometheus_registry
+        )
+        self.dropped_events = Counter(
+            "environment_dropped_events",
+            "Number of events dropped because the queue was full",
+            ["impl_name"],
+            registry=prometheus_registry
+        )
+        self.conflated_events = Counter(
+            "environment_conflated_events",
+            "Number of action sets replaced by a newer one",
+            ["impl_name"],
+            registry=prometheus_registry
+        )
 
         pass
 
@@ -93,18 +111,7 @@ def _process_normal_data(data, session):
         tick_id = act_set.tick_id
         session._trial.tick_id = tick_id
 
-        for index, actor in enumerate(session._trial.actors):
-            if index in act_set.unavailable_actors:
-                status = ActorStatus.UNAVAILABLE
-                timestamp = 0
-                action = None
-            else:
-                status = ActorStatus.ACTIVE
-                timestamp = act_set.timestamp
-                action = actor.actor_class_spec.action_space()
-                action.ParseFromString(act_set.actions[index])
-
-            recv_event.actions.append(RecvAction(index, act_set.tick_id, status, timestamp, action))
+        recv_event._set_action_set(act_set, session._trial)
 
         session._post_incoming_event((tick_id, recv_event))
 
@@ -128,6 +135,7 @@ def _process_normal_data(data, session):
 async def _process_incoming(context, session):
     try:
         while True:
+            await session._wait_for_incoming_space()
             data = await context.read()
             if data == grpc.aio.EOF:
                 logger.info(f"Trial [{session._trial.id}] - Environment [{session.name}]: "
@@ -248,6 +256,7 @@ class EnvironmentServicer(env_grpc_api.EnvironmentSPServicer):
     def __init__(self, env_impls, cog_settings, prometheus_registry=None):
         self._impls = env_impls
         self._sessions = set()
+        self._impl_trial_counts = {}
         self._cog_settings = cog_settings
         self._prometheus_data = _PrometheusData(prometheus_registry)
 
@@ -318,7 +327,7 @@ class EnvironmentServicer(env_grpc_api.EnvironmentSPServicer):
                 logger.error(error_str)
                 await context.abort(grpc.StatusCode.UNKNOWN, error_str)
 
-    def _start_session(self, trial_id, init_input):
+    def _get_impl(self, trial_id, init_input):
         name = init_input.name
         if not name:
             raise CogmentError(f"Trial [{trial_id}] - Empty environment name")
@@ -334,6 +343,20 @@ class EnvironmentServicer(env_grpc_api.EnvironmentSPServicer):
             logger.info(f"Trial [{trial_id}] - "
                         f"impl [{impl_name}] arbitrarily chosen for environment [{name}]")
 
+        return impl_name, impl
+
+    def _acquire_trial_slot(self, impl_name, impl):
+        count = self._impl_trial_counts.get(impl_name, 0)
+        if impl.max_concurrent_trials > 0 and count >= impl.max_concurrent_trials:
+            return False
+        self._impl_trial_counts[impl_name] = count + 1
+        return True
+
+    def _release_trial_slot(self, impl_name):
+        self._impl_trial_counts[impl_name] -= 1
+
+    def _start_session(self, trial_id, init_input, impl_name, impl):
+        name = init_input.name
         key = _trial_key(trial_id, name)
         if key in self._sessions:
             raise CogmentError(f"Trial [{trial_id}] - Environment [{name}] already exists")
@@ -353,6 +376,11 @@ class EnvironmentServicer(env_grpc_api.EnvironmentSPServicer):
         trial.tick_id = init_input.tick_id
         new_session = EnvironmentSession(impl.impl, trial, name, impl_name, config)
         new_session._prometheus_data = self._prometheus_data
+        new_session._dropped_events_counter = self._prometheus_data.dropped_events.labels(impl_name)
+        new_session._conflated_events_counter = self._prometheus_data.conflated_events.labels(impl_name)
+        new_session._set_incoming_queue(impl.queue_size, impl.overflow_policy)
+        new_session._executor = impl.executor
+        new_session._executor_wait_summary = self._prometheus_data.executor_wait_time.labels(impl_name)
         self._sessions.add(key)
 
         logger.debug(f"Trial [{trial_id}] - impl [{impl_name}] for environment [{name}] started")
@@ -416,7 +444,18 @@ class EnvironmentServicer(env_grpc_api.EnvironmentSPServicer):
                 return
             key = _trial_key(trial_id, init_data.name)
 
-            session = self._start_session(trial_id, init_data)
+            impl_name, impl = self._get_impl(trial_id, init_data)
+            if not self._acquire_trial_slot(impl_name, impl):
+                error_str = (f"Trial [{trial_id}] - Environment [{init_data.name}] rejected: impl [{impl_name}] "
+                             f"is already running its maximum of [{impl.max_concurrent_trials}] trials")
+                logger.warning(error_str)
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, error_str)
+
+            try:
+                session = self._start_session(trial_id, init_data, impl_name, impl)
+            except Exception:
+                self._release_trial_slot(impl_name)
+                raise
 
         except asyncio.TimeoutError:
             logger.error("Failed to receive init data from Orchestrator")
@@ -433,8 +472,11 @@ class EnvironmentServicer(env_grpc_api.EnvironmentSPServicer):
             raise
 
         else:
-            await self._run_session(context, session)  # Blocking
-            self._sessions.remove(key)
+            try:
+                await self._run_session(context, session)  # Blocking
+                self._sessions.remove(key)
+            finally:
+                self._release_trial_slot(impl_name)
 
     # Override
     async def Version(self, request, context):
@@ -26,6 +26,8 @@ class EnvironmentSession(Session):
 
     def __init__(self, impl, trial, name, impl_name, config):
         super().__init__(trial, name, impl, impl_name, config)
+        self._deduplicate_observations = False
+        self._observation_key = None
 
     def __str__(self):
         result = super().__str__()
@@ -41,7 +43,11 @@ class EnvironmentSession(Session):
                               "No message will be sent back to the environment!")
         self._send_message(payload, to)
 
-    def start(self, observations=None, auto_done_sending=True):
+    def start(self, observations=None, auto_done_sending=True, deduplicate_observations=False, observation_key=None):
+        # Equal observations are sent only once: compared by serialized content,
+        # or by the value returned by `observation_key(observation)` if provided.
+        self._deduplicate_observations = deduplicate_observations or (observation_key is not None)
+        self._observation_key = observation_key
         self._start(auto_done_sending)
 
         if observations is not None:
@@ -50,6 +56,9 @@ class EnvironmentSession(Session):
             self._post_outgoing_data(packed_obs)
 
     def produce_observations(self, observations):
+        if self._in_executor_thread():
+            return self._run_in_loop(self.produce_observations, observations)
+
         if not self._trial.ended:
             packed_obs = self._pack_observations(observations, -1)
             self._post_outgoing_data(packed_obs)
@@ -60,6 +69,9 @@ class EnvironmentSession(Session):
                            f"Cannot send observation because the trial has ended.")
 
     def end(self, final_observations):
+        if self._in_executor_thread():
+            return self._run_in_loop(self.end, final_observations)
+
         if self._trial.ended:
             logger.warning(f"Trial [{self._trial.id}] - Environment [{self.name}] "
                            f"end request ignored because the trial has already ended.")
@@ -76,7 +88,8 @@ class EnvironmentSession(Session):
     def _pack_observations(self, observations, tick_id):
         timestamp = int(time.time() * 1e9)
 
-        new_obs = [None] * len(self._trial.actors)
+        nb_actors = len(self._trial.actors)
+        new_obs = [None] * nb_actors
 
         for target, obs in observations:
             if not isinstance(target, str):
@@ -85,24 +98,14 @@ class EnvironmentSession(Session):
             if target == "*" or target == "*.*":
                 if len(observations) > 1:
                     raise CogmentError(f"Duplicate actors in observations list when using a wildcard")
-                new_obs = [obs] * len(self._trial.actors)
+                new_obs = [obs] * nb_actors
                 break
-            else:
-                for actor_index, actor in enumerate(self._trial.actors):
-                    if "." not in target:
-                        if actor.name == target:
-                            if new_obs[actor_index] is not None:
-                                raise CogmentError(f"Duplicate actor [{actor.name}] in observations list")
-                            new_obs[actor_index] = obs
-                            break  # Names are unique in trial
-                    else:
-                        actor_class, actor_name = target.split(".")
-                        if actor_class == actor.actor_class_spec.name:
-                            if actor_name == actor.name or actor_name == "*":
-                                if new_obs[actor_index] is not None:
-                                    raise CogmentError(f"Duplicate actor [{actor_class}.{actor.name}] "
-                                                       f"in observations list")
-                                new_obs[actor_index] = obs
+
+            for actor_index in self._trial.get_target_indexes(target):
+                if new_obs[actor_index] is not None:
+                    raise CogmentError(f"Duplicate actor [{self._trial.actors[actor_index].name}] "
+                                       f"in observations list")
+                new_obs[actor_index] = obs
 
         for actor_index, actor in enumerate(self._trial.actors):
             if new_obs[actor_index] is None:
@@ -113,14 +116,30 @@ class EnvironmentSession(Session):
         package.timestamp = timestamp
 
         seen_observations = {}
-        for actor_index, _ in enumerate(self._trial.actors):
-            actor_obs = new_obs[actor_index]
+        seen_contents = {}
+        for actor_obs in new_obs:
             obs_id = id(actor_obs)
             obs_key = seen_observations.get(obs_id)
             if obs_key is None:
-                obs_key = len(package.observations)
-
-                package.observations.append(actor_obs.SerializeToString())
+                if not self._deduplicate_observations:
+                    obs_key = len(package.observations)
+                    package.observations.append(actor_obs.SerializeToString())
+
+                elif self._observation_key is not None:
+                    content_key = self._observation_key(actor_obs)
+                    obs_key = seen_contents.get(content_key)
+                    if obs_key is None:
+                        obs_key = len(package.observations)
+                        package.observations.append(actor_obs.SerializeToString())
+                        seen_contents[content_key] = obs_key
+
+                else:
+                    content = actor_obs.SerializeToString(deterministic=True)
+                    obs_key = seen_contents.get(content)
+                    if obs_key is None:
+                        obs_key = len(package.observations)
+                        package.observations.append(content)
+                        seen_contents[content] = obs_key
 
                 seen_observations[obs_id] = obs_key
 
@@ -0,0 +1,309 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from cogment.control import TrialState
+from cogment.datastore import DatastoreFields
+from cogment.errors import CogmentError
+from cogment.utils import logger, import_numpy
+
+import asyncio
+import enum
+import time
+from typing import Dict, List, Set
+
+# Time (in seconds) between two retrievals of the new trials when no trial was found
+REPLAY_POLL_INTERVAL = 1.0
+
+_FIELDS = [DatastoreFields.OBSERVATION, DatastoreFields.ACTION, DatastoreFields.REWARD]
+
+
+class ReplaySampling(enum.Enum):
+    """Enum class for the different ways transitions are sampled from a replay buffer."""
+
+    UNIFORM = enum.auto()
+    PRIORITIZED = enum.auto()
+
+
+class ReplayBatch:
+    """Class representing a minibatch of transitions sampled from a replay buffer."""
+
+    def __init__(self, actor_class, indexes, columns, weights):
+        self.actor_class = actor_class
+        self.indexes = indexes
+        self.columns = columns
+        self.weights = weights
+
+    def __getitem__(self, column_name):
+        return self.columns[column_name]
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __str__(self):
+        result = f"ReplayBatch: actor_class = {self.actor_class}, nb transitions = {len(self)}"
+        result += f", columns = {list(self.columns)}"
+        return result
+
+
+class ReplayBufferStats:
+    """Class representing the ingestion and sampling statistics of a replay buffer."""
+
+    def __init__(self):
+        self.ingested_trials = 0
+        self.ingested_transitions = 0
+        self.ingest_seconds = 0.0
+        self.sampled_batches = 0
+        self.sampled_transitions = 0
+        self.sample_seconds = 0.0
+
+    def __str__(self):
+        result = f"ReplayBufferStats: ingested_trials = {self.ingested_trials}"
+        result += f", ingested_transitions = {self.ingested_transitions}, ingest_rate = {self.ingest_rate}"
+        result += f", sampled_transitions = {self.sampled_transitions}, sample_rate = {self.sample_rate}"
+        return result
+
+    @property
+    def ingest_rate(self):
+        """Transitions ingested per second spent ingesting"""
+        return self.ingested_transitions / self.ingest_seconds if self.ingest_seconds > 0 else 0.0
+
+    @property
+    def sample_rate(self):
+        """Transitions sampled per second spent sampling"""
+        return self.sampled_transitions / self.sample_seconds if self.sample_seconds > 0 else 0.0
+
+
+class _RingStorage:
+    """Internal class storing the transitions of an actor class in fixed capacity NumPy arrays."""
+
+    def __init__(self, np, capacity, dtypes):
+        self._np = np
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self.priorities = np.zeros(capacity, dtype="float64")
+        self.max_priority = 1.0
+        self.size = 0
+        self._next = 0
+
+    def add(self, transitions):
+        count = len(transitions["reward"])
+        if count > self.capacity:
+            # Only the most recent transitions would be kept anyway
+            transitions = {name: values[-self.capacity:] for name, values in transitions.items()}
+            count = self.capacity
+
+        indexes = (self._next + self._np.arange(count)) % self.capacity
+        for name, column in self.columns.items():
+            column[indexes] = transitions[name]
+        self.priorities[indexes] = self.max_priority
+
+        self._next = (self._next + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+
+class ReplayBuffer:
+    """Class representing a replay buffer of actor transitions fed from the trial datastore."""
+
+    def __init__(self, datastore, capacity: int, actor_classes: List[str] = None, n_step: int = 1,
+                 discount: float = 0.99, sampling: ReplaySampling = ReplaySampling.UNIFORM, alpha: float = 0.6,
+                 beta: float = 0.4, seed=None):
+        self._np = import_numpy()
+
+        if capacity <= 0:
+            raise CogmentError(f"Invalid replay buffer capacity [{capacity}]")
+        if n_step < 1:
+            raise CogmentError(f"Invalid number of steps [{n_step}]")
+
+        self._datastore = datastore
+        self.capacity = capacity
+        self.actor_classes = list(actor_classes) if actor_classes else []
+        self.n_step = n_step
+        self.discount = discount
+        self.sampling = sampling
+        self.alpha = alpha
+        self.beta = beta
+        self.stats = ReplayBufferStats()
+
+        self._rng = self._np.random.default_rng(seed)
+        self._storages: Dict[str, _RingStorage] = {}
+        self._ingested_trial_ids: Set[str] = set()  # Only by `ingest`, `run` tracks its own progress
+        self._pending_trial_ids: Set[str] = set()  # Listed by `run` before they ended
+
+    def __str__(self):
+        result = f"ReplayBuffer: capacity = {self.capacity}, n_step = {self.n_step}, sampling = {self.sampling}"
+        result += f", sizes = { {actor_class: storage.size for actor_class, storage in self._storages.items()} }"
+        return result
+
+    def size(self, actor_class):
+        storage = self._storages.get(actor_class)
+        return storage.size if storage is not None else 0
+
+    async def run(self, properties={}, bundle_size=16, wait_for_trials=REPLAY_POLL_INTERVAL):
+        """Ingest the trials of the datastore as they end, until cancelled"""
+        # The trials are listed from a cursor (the trial handle), those listed before they ended are retrieved
+        # by ID on each poll until they end. Only the trials of the current partial page are remembered.
+        datastore = self._datastore
+        trial_handle = ""
+        page_trial_ids: Set[str] = set()
+        try:
+            while True:
+                trial_infos, next_trial_handle = await datastore._trial_page(bundle_size, wait_for_trials,
+                                                                             properties, [], trial_handle)
+                new_infos = [info for info in trial_infos if info.trial_id not in page_trial_ids]
+                page_complete = len(trial_infos) >= bundle_size and bool(next_trial_handle)
+                if page_complete:
+                    trial_handle = next_trial_handle
+                    page_trial_ids.clear()
+                else:
+                    page_trial_ids.update(info.trial_id for info in new_infos)
+
+                if self._pending_trial_ids:
+                    pending_ids = list(self._pending_trial_ids)
+                    self._pending_trial_ids.clear()  # Deleted trials are forgotten
+                    new_infos.extend(await datastore.get_trials(ids=pending_ids))
+
+                ended_infos = []
+                for info in new_infos:
+                    if info.trial_state == TrialState.ENDED:
+                        ended_infos.append(info)
+                    else:
+                        self._pending_trial_ids.add(info.trial_id)
+
+                for start in range(0, len(ended_infos), bundle_size):
+                    await self._ingest(ended_infos[start:start + bundle_size])
+
+                if not ended_infos and not page_complete:
+                    await asyncio.sleep(REPLAY_POLL_INTERVAL)
+
+        except asyncio.CancelledError:
+            logger.debug("Replay buffer ingestion cancelled")
+
+    async def ingest(self, trial_infos):
+        """Add the transitions of ended trials to the buffer (others are skipped), returns the number added"""
+        trial_infos = [info for info in trial_infos
+                       if info.trial_state == TrialState.ENDED and info.trial_id not in self._ingested_trial_ids]
+        nb_transitions = await self._ingest(trial_infos)
+        self._ingested_trial_ids.update(info.trial_id for info in trial_infos)
+        return nb_transitions
+
+    async def _ingest(self, trial_infos):
+        np = self._np
+        if not trial_infos:
+            return 0
+
+        start_time = time.perf_counter()
+        nb_transitions = 0
+        trial_infos_by_id = {info.trial_id: info for info in trial_infos}
+        async for columns in self._datastore.all_sample_columns(trial_infos, actor_classes=self.actor_classes,
+                                                                fields=_FIELDS):
+            if len(columns) == 0:
+                continue
+
+            trial_info = trial_infos_by_id[columns.trial_ids[0]]
+            actors = trial_info.parameters.actors
+            actor_indexes = columns["actor_index"]
+            for actor_index in np.unique(actor_indexes):
+                actor_class = actors[int(actor_index)].actor_class
+                if self.actor_classes and actor_class not in self.actor_classes:
+                    continue
+
+                rows = np.flatnonzero(actor_indexes == actor_index)
+                rows = rows[np.argsort(columns["tick_id"][rows], kind="stable")]
+                transitions = self._make_transitions(columns, rows)
+                if transitions is None:
+                    continue
+
+                storage = self._storages.get(actor_class)
+                if storage is None:
+                    dtypes = {name: values.dtype for name, values in transitions.items()}
+                    storage = _RingStorage(np, self.capacity, dtypes)
+                    self._storages[actor_class] = storage
+                storage.add(transitions)
+                nb_transitions += len(transitions["reward"])
+
+        self.stats.ingested_trials += len(trial_infos)
+        self.stats.ingested_transitions += nb_transitions
+        self.stats.ingest_seconds += time.perf_counter() - start_time
+        return nb_transitions
+
+    def _make_transitions(self, columns, rows):
+        # Transition t: observation and action at t, n-step discounted return of the rewards from t,
+        # and observation at t + n (or at the end of the trial)
+        np = self._np
+        nb_samples = len(rows)
+        if nb_samples < 2:
+            return None
+
+        count = nb_samples - 1
+        last = nb_samples - 1
+        rewards = columns["reward"][rows].astype("float64")
+        starts = np.arange(count)
+        steps = np.minimum(self.n_step, last - starts)
+
+        returns = np.zeros(count, dtype="float64")
+        for step in range(self.n_step):
+            valid = step < steps
+            returns[valid] += (self.discount ** step) * rewards[starts[valid] + step]
+
+        next_rows = rows[starts + steps]
+        done = (starts + steps) == last
+        done &= columns["done"][rows[last]]
+
+        transitions = {
+            "reward": returns.astype("float32"),
+            "discount": np.where(done, 0.0, self.discount ** steps).astype("float32"),
+            "done": done,
+        }
+        for name, values in columns.columns.items():
+            for prefix in ("observation.", "action."):
+                if name.startswith(prefix):
+                    transitions[name] = values[rows[:count]]
+            if name.startswith("observation."):
+                transitions["next_" + name] = values[next_rows]
+
+        return transitions
+
+    def sample(self, batch_size: int, actor_class: str):
+        """Sample a minibatch of transitions of an actor class"""
+        storage = self._storages.get(actor_class)
+        if storage is None or storage.size == 0:
+            raise CogmentError(f"No transitions of actor class [{actor_class}] in the replay buffer")
+
+        np = self._np
+        start_time = time.perf_counter()
+        if self.sampling == ReplaySampling.PRIORITIZED:
+            scaled_priorities = storage.priorities[:storage.size] ** self.alpha
+            probabilities = scaled_priorities / scaled_priorities.sum()
+            indexes = self._rng.choice(storage.size, size=batch_size, p=probabilities)
+            weights = (storage.size * probabilities[indexes]) ** -self.beta
+            weights = (weights / weights.max()).astype("float32")
+        else:
+            indexes = self._rng.integers(0, storage.size, size=batch_size)
+            weights = np.ones(batch_size, dtype="float32")
+
+        columns = {name: column[indexes] for name, column in storage.columns.items()}
+        self.stats.sampled_batches += 1
+        self.stats.sampled_transitions += batch_size
+        self.stats.sample_seconds += time.perf_counter() - start_time
+        return ReplayBatch(actor_class, indexes, columns, weights)
+
+    def update_priorities(self, actor_class: str, indexes, priorities):
+        """Set the priorities of sampled transitions (e.g. from their TD errors)"""
+        storage = self._storages.get(actor_class)
+        if storage is None:
+            raise CogmentError(f"No transitions of actor class [{actor_class}] in the replay buffer")
+
+        priorities = self._np.abs(self._np.asarray(priorities, dtype="float64")) + 1e-6
+        storage.priorities[indexes] = priorities
+        storage.max_priority = max(storage.max_priority, float(priorities.max()))
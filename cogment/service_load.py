@@ -0,0 +1,162 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cogment.api.common_pb2 as common_api
+import cogment.api.orchestrator_pb2_grpc as orchestrator_grpc_api
+import cogment.api.agent_pb2_grpc as agent_grpc_api
+import cogment.api.environment_pb2_grpc as env_grpc_api
+import cogment.api.hooks_pb2_grpc as hooks_grpc_api
+import cogment.api.datalog_pb2_grpc as datalog_grpc_api
+import cogment.api.trial_datastore_pb2_grpc as datastore_grpc_api
+import cogment.api.model_registry_pb2_grpc as model_registry_api
+import cogment.api.directory_pb2_grpc as directory_grpc_api
+
+from cogment.directory import ServiceType
+from cogment.utils import logger
+import cogment.endpoints as ep
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+# Time (in seconds) between two load samples of a service
+LOAD_REFRESH_INTERVAL = 5.0
+
+# Services not selected for this many refresh intervals are not sampled anymore
+_LOAD_UNUSED_INTERVALS = 12
+
+_STATUS_STUBS = {
+    ServiceType.LIFE_CYCLE: orchestrator_grpc_api.TrialLifecycleSPStub,
+    ServiceType.CLIENT_ACTOR: orchestrator_grpc_api.ClientActorSPStub,
+    ServiceType.ACTOR: agent_grpc_api.ServiceActorSPStub,
+    ServiceType.ENVIRONMENT: env_grpc_api.EnvironmentSPStub,
+    ServiceType.HOOK: hooks_grpc_api.TrialHooksSPStub,
+    ServiceType.DATALOG: datalog_grpc_api.DatalogSPStub,
+    ServiceType.DATASTORE: datastore_grpc_api.TrialDatastoreSPStub,
+    ServiceType.MODEL_REG: model_registry_api.ModelRegistrySPStub,
+    ServiceType.DIRECTORY: directory_grpc_api.DirectorySPStub,
+}
+
+
+class ServiceLoad:
+    """Class representing the load published by a service through its `Status` RPC."""
+
+    def __init__(self, overall_load=None, nb_sessions=None):
+        self.overall_load = overall_load
+        self.nb_sessions = nb_sessions
+
+    @property
+    def reachable(self):
+        return self.overall_load is not None
+
+    def sort_key(self):
+        if not self.reachable:
+            return (1, 0, 0)
+        nb_sessions = self.nb_sessions if self.nb_sessions is not None else 0
+        return (0, self.overall_load, nb_sessions)
+
+    def __str__(self):
+        return f"ServiceLoad: overall_load = {self.overall_load}, nb_sessions = {self.nb_sessions}"
+
+
+class ServiceLoadMonitor:
+    """Internal class sampling the load of services found in the directory, and refreshing it in the background."""
+
+    def __init__(self, channel_pool, refresh_interval: float = LOAD_REFRESH_INTERVAL, timeout: float = 1.0):
+        self._channel_pool = channel_pool
+        self._refresh_interval = refresh_interval
+        self._timeout = timeout
+        self._samples: Dict[Tuple[ServiceType, str], ServiceLoad] = {}
+        self._watched: Dict[Tuple[ServiceType, str], SimpleNamespace] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get_loads(self, service_type: ServiceType, endpoints: List[ep.Endpoint]) -> Dict[str, ServiceLoad]:
+        now = time.monotonic()
+        for endpoint in endpoints:
+            key = (service_type, endpoint.url)
+            watched = self._watched.get(key)
+            if watched is None:
+                self._watched[key] = SimpleNamespace(endpoint=endpoint, last_used=now)
+            else:
+                watched.last_used = now
+
+        missing = [endpoint for endpoint in endpoints if (service_type, endpoint.url) not in self._samples]
+        if missing:
+            await asyncio.gather(*[self._sample(service_type, endpoint) for endpoint in missing])
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+        return {endpoint.url: self._samples[(service_type, endpoint.url)] for endpoint in endpoints}
+
+    async def _sample(self, service_type, endpoint):
+        stub_type = _STATUS_STUBS.get(service_type)
+        if stub_type is None:
+            self._samples[(service_type, endpoint.url)] = ServiceLoad()
+            return
+
+        request = common_api.StatusRequest()
+        request.names.extend(["overall_load", "nb_sessions"])
+
+        channel = self._channel_pool.acquire(endpoint)
+        try:
+            reply = await stub_type(channel).Status(request, timeout=self._timeout)
+            overall_load = int(reply.statuses.get("overall_load", "0"))
+            nb_sessions = reply.statuses.get("nb_sessions")
+            load = ServiceLoad(overall_load, int(nb_sessions) if nb_sessions else None)
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as exc:
+            logger.debug(f"Could not get the load of [{endpoint.url}]: [{exc}]")
+            load = ServiceLoad()
+
+        finally:
+            self._channel_pool.release(endpoint)
+
+        self._samples[(service_type, endpoint.url)] = load
+
+    async def _refresh(self):
+        try:
+            while True:
+                await asyncio.sleep(self._refresh_interval)
+
+                expiration = time.monotonic() - self._refresh_interval * _LOAD_UNUSED_INTERVALS
+                for key, watched in list(self._watched.items()):
+                    if watched.last_used < expiration:
+                        del self._watched[key]
+                        self._samples.pop(key, None)
+
+                await asyncio.gather(*[self._sample(service_type, watched.endpoint)
+                                       for (service_type, _), watched in self._watched.items()])
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception:
+            logger.exception("Service load refresh failed")
+
+        finally:
+            self._refresh_task = None
+
+    async def close(self):
+        refresh_task = self._refresh_task
+        if refresh_task is not None:
+            refresh_task.cancel()
+            try:
+                await refresh_task
+            except asyncio.CancelledError:
+                pass
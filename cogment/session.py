@@ -15,11 +15,18 @@
 import cogment.api.common_pb2 as common_api
 
 from cogment.errors import CogmentError
-from cogment.utils import logger
+from cogment.utils import logger, import_numpy
+
+from google.protobuf.descriptor import FieldDescriptor
 
 from abc import ABC
 from enum import Enum
 import asyncio
+import collections
+import concurrent.futures
+import functools
+import threading
+import time
 
 
 # This class is not necessary, but simplifies the code as it is.
@@ -39,6 +46,13 @@ class _EndingAck:
     pass
 
 
+class _LatestTickEvent:
+    """Internal class marking the place of a tick event in the incoming queue."""
+
+    def __init__(self, event_tuple):
+        self.event_tuple = event_tuple  # None once superseded by a more recent tick event, or dropped
+
+
 class ActorInfo:
     """Class representing the information of an actor."""
 
@@ -54,16 +68,39 @@ class ActorInfo:
 class RecvObservation:
     """Class representing a received observation in a trial."""
 
-    def __init__(self, obs, obs_space):
+    def __init__(self, obs, obs_space, obs_space_type=None):
         self.tick_id = obs.tick_id
         self.timestamp = obs.timestamp
-        self.observation = obs_space
+        self._observation = obs_space
+
+        # If a type is provided, the serialized content is only deserialized on first access
+        self._obs_space_type = obs_space_type
+        if obs_space_type is not None:
+            self._content = obs.content
+        else:
+            self._content = None
 
     def __str__(self):
         result = f"RecvObservation: tick_id = {self.tick_id}, timestamp = {self.timestamp}"
         result += f", observation = {self.observation}"
         return result
 
+    @property
+    def observation(self):
+        if self._obs_space_type is not None:
+            obs_space = self._obs_space_type()
+            obs_space.ParseFromString(self._content)
+            self._observation = obs_space
+            self._obs_space_type = None
+            self._content = None
+        return self._observation
+
+    @observation.setter
+    def observation(self, val):
+        self._observation = val
+        self._obs_space_type = None
+        self._content = None
+
     @property
     def snapshot(self):
         logger.deprecated(f"Deprecated use of 'snapshot' in RecvObservation. Use 'observation' instead.")
@@ -87,18 +124,38 @@ class ActorStatus(Enum):
 class RecvAction:
     """Class representing a received action in a trial."""
 
-    def __init__(self, actor_index, tick_id, status, timestamp, action):
+    def __init__(self, actor_index, tick_id, status, timestamp, action, action_space_type=None, content=None):
         self.tick_id = tick_id
         self.actor_index = actor_index
         self.status = status
         self.timestamp = timestamp
-        self.action = action
+        self._action = action
+
+        # If a type is provided, the serialized content is only deserialized on first access
+        self._action_space_type = action_space_type
+        self._content = content
 
     def __str__(self):
         result = f"RecvAction: tick_id = {self.tick_id}, actor_index = {self.actor_index}"
         result += f", status = {self.status}, timestamp = {self.timestamp}, action = {self.action}"
         return result
 
+    @property
+    def action(self):
+        if self._action_space_type is not None:
+            action_space = self._action_space_type()
+            action_space.ParseFromString(self._content)
+            self._action = action_space
+            self._action_space_type = None
+            self._content = None
+        return self._action
+
+    @action.setter
+    def action(self, val):
+        self._action = val
+        self._action_space_type = None
+        self._content = None
+
 
 class RecvRewardSource:
     """Class representing a received reward source in a trial."""
@@ -154,6 +211,14 @@ class RecvMessage:
         return result
 
 
+class OverflowPolicy(Enum):
+    """Enum class for the policies applied when the incoming event queue of a session is full."""
+
+    BLOCK = 0  # Stop receiving until there is space in the queue
+    DROP_OLDEST = 1  # Drop the oldest events in the queue (observations and actions first)
+    KEEP_LATEST = 2  # Keep only the latest observation (or actions), never drop rewards and messages (unbounded)
+
+
 class EventType(Enum):
     """Enum class for the types of received events in a trial."""
 
@@ -163,16 +228,65 @@ class EventType(Enum):
     FINAL = 3
 
 
+class RecvActionColumns:
+    """Class representing the actions of a received event as NumPy arrays (one item per actor)."""
+
+    def __init__(self, actor_indexes, status, timestamp, fields):
+        self.actor_indexes = actor_indexes
+        self.status = status
+        self.timestamp = timestamp
+        self.fields = fields
+
+    def __getitem__(self, field_name):
+        return self.fields[field_name]
+
+    def __len__(self):
+        return len(self.actor_indexes)
+
+    def __str__(self):
+        result = f"RecvActionColumns: actor_indexes = {self.actor_indexes}, status = {self.status}"
+        result += f", timestamp = {self.timestamp}, fields = {list(self.fields)}"
+        return result
+
+
+_NUMPY_SCALAR_TYPES = {
+    FieldDescriptor.CPPTYPE_INT32: "int32",
+    FieldDescriptor.CPPTYPE_INT64: "int64",
+    FieldDescriptor.CPPTYPE_UINT32: "uint32",
+    FieldDescriptor.CPPTYPE_UINT64: "uint64",
+    FieldDescriptor.CPPTYPE_DOUBLE: "float64",
+    FieldDescriptor.CPPTYPE_FLOAT: "float32",
+    FieldDescriptor.CPPTYPE_BOOL: "bool",
+    FieldDescriptor.CPPTYPE_ENUM: "int32",
+}
+
+
+def _scalar_fields(message_type):
+    fields = []
+    for field in message_type.DESCRIPTOR.fields:
+        if field.label == FieldDescriptor.LABEL_REPEATED:
+            continue
+        dtype = _NUMPY_SCALAR_TYPES.get(field.cpp_type)
+        if dtype is not None:
+            fields.append((field.name, dtype))
+    return fields
+
+
 class RecvEvent:
     """Class representing a received event in a trial."""
 
     def __init__(self, etype):
         self.type = etype
         self.observation = None
-        self.actions = []
+        self._actions = []
         self.rewards = []
         self.messages = []
 
+        # Environment only: the actions are built from the action set on first access
+        self._action_set = None
+        self._trial = None
+        self._action_columns = {}
+
     def __str__(self):
         result = f"RecvEvent: type = {self.type}"
         if self.observation:
@@ -185,6 +299,105 @@ class RecvEvent:
             result += f", {{{msg}}}"
         return result
 
+    @property
+    def actions(self):
+        if self._actions is None:
+            self._actions = self._make_actions()
+        return self._actions
+
+    @actions.setter
+    def actions(self, val):
+        self._actions = val
+
+    def _set_action_set(self, action_set, trial):
+        self._action_set = action_set
+        self._trial = trial
+        self._actions = None
+        self._action_columns = {}
+
+    def _make_actions(self):
+        action_set = self._action_set
+        tick_id = action_set.tick_id
+        timestamp = action_set.timestamp
+        unavailable_actors = set(action_set.unavailable_actors)
+        actions = action_set.actions
+
+        result = []
+        for index, actor in enumerate(self._trial.actors):
+            if index in unavailable_actors:
+                recv_action = RecvAction(index, tick_id, ActorStatus.UNAVAILABLE, 0, None)
+            else:
+                recv_action = RecvAction(index, tick_id, ActorStatus.ACTIVE, timestamp, None,
+                                         action_space_type=actor.actor_class_spec.action_space,
+                                         content=actions[index])
+            result.append(recv_action)
+
+        return result
+
+    def get_action_columns(self, actor_class=None):
+        """Actions as NumPy arrays of the scalar action fields, the status and the timestamp of each actor"""
+        if self._action_set is None:
+            raise CogmentError("Action columns are only available for environment events with actions")
+
+        columns = self._action_columns.get(actor_class)
+        if columns is None:
+            columns = self._make_action_columns(actor_class)
+            self._action_columns[actor_class] = columns
+        return columns
+
+    def _make_action_columns(self, actor_class):
+        np = import_numpy()
+
+        trial = self._trial
+        if actor_class is None:
+            actor_indexes = range(len(trial.actors))
+        else:
+            actor_indexes = trial.get_target_indexes(f"{actor_class}.*")
+        count = len(actor_indexes)
+
+        action_set = self._action_set
+        unavailable_actors = set(action_set.unavailable_actors)
+        actions = action_set.actions
+
+        # One reusable message and field list per actor class
+        class_parsers = {}
+        field_dtypes = {}
+        for index in actor_indexes:
+            class_spec = trial.actors[index].actor_class_spec
+            if class_spec.name not in class_parsers:
+                fields = _scalar_fields(class_spec.action_space)
+                class_parsers[class_spec.name] = (class_spec.action_space(), fields)
+                for name, dtype in fields:
+                    if name in field_dtypes and field_dtypes[name] != dtype:
+                        field_dtypes[name] = np.result_type(field_dtypes[name], dtype)
+                    else:
+                        field_dtypes[name] = dtype
+
+        values = {name: [0] * count for name in field_dtypes}
+        status = [ActorStatus.ACTIVE.value] * count
+        for column_index, index in enumerate(actor_indexes):
+            if index in unavailable_actors:
+                status[column_index] = ActorStatus.UNAVAILABLE.value
+                continue
+
+            message, fields = class_parsers[trial.actors[index].actor_class_spec.name]
+            message.ParseFromString(actions[index])
+            for name, _ in fields:
+                values[name][column_index] = getattr(message, name)
+
+        status_array = np.array(status, dtype="int8")
+        timestamp = np.zeros(count, dtype="uint64")
+        timestamp[status_array == ActorStatus.ACTIVE.value] = action_set.timestamp
+        fields = {name: np.array(values[name], dtype=dtype) for name, dtype in field_dtypes.items()}
+
+        return RecvActionColumns(np.array(actor_indexes, dtype="int64"), status_array, timestamp, fields)
+
+
+def _executor_call(submit_time, func, args):
+    # Module level to be usable with process pool executors
+    wait_time = time.time() - submit_time
+    return wait_time, func(*args)
+
 
 class Session(ABC):
     """Base class representing the session of an actor or environment for a trial."""
@@ -203,6 +416,20 @@ class Session(ABC):
         self._user_task = None  # Task used to call user implementation
         self._auto_ack = True
 
+        self._incoming_queue_size = 0  # Unbounded
+        self._overflow_policy = OverflowPolicy.BLOCK
+        self._incoming_space = asyncio.Event()
+        self._latest_tick_marker = None
+        self._tick_markers = collections.deque()  # Tick events in the queue, oldest first (DROP_OLDEST only)
+        self._superseded_count = 0  # Superseded markers still in the queue
+        self._dropped_events_counter = None  # Prometheus counters
+        self._conflated_events_counter = None
+
+        self._executor = None  # Default executor of the event loop
+        self._executor_wait_summary = None  # Prometheus summary
+        self._loop = None
+        self._loop_thread_id = None
+
         # Pre-compute since it will be used regularly
         self._active_actors = [ActorInfo(actor.name, actor.actor_class_spec.name) for actor in trial.actors]
 
@@ -221,6 +448,12 @@ class Session(ABC):
         self._started = True
         self._post_outgoing_data(_InitAck())
 
+    def _set_incoming_queue(self, queue_size, overflow_policy):
+        if self._started:
+            raise CogmentError(f"Cannot change the incoming queue of [{self.name}] after it is started.")
+        self._incoming_queue_size = queue_size
+        self._overflow_policy = overflow_policy
+
     def _exit_queues(self):
         self._incoming_event_queue.put_nowait(None)
         self._outgoing_data_queue.put_nowait(None)
@@ -239,6 +472,8 @@ class Session(ABC):
             raise
 
     def _start_user_task(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
         self._user_task = asyncio.create_task(self._run())
         return self._user_task
 
@@ -251,9 +486,100 @@ class Session(ABC):
             logger.debug(f"Event received after trial is over: [{event_tuple}]")
             return
 
+        if self._overflow_policy == OverflowPolicy.KEEP_LATEST:
+            tick_id, _ = event_tuple
+            if tick_id >= 0:
+                # The stale tick event is dropped, and the latest one is delivered at its place in arrival order
+                # (i.e. after the rewards and messages received before it)
+                if self._latest_tick_marker is not None:
+                    self._latest_tick_marker.event_tuple = None
+                    self._superseded_count += 1
+                    if self._conflated_events_counter is not None:
+                        self._conflated_events_counter.inc()
+
+                self._latest_tick_marker = _LatestTickEvent(event_tuple)
+                event_tuple = self._latest_tick_marker
+
+        elif self._overflow_policy == OverflowPolicy.DROP_OLDEST and self._incoming_queue_size > 0:
+            while self._incoming_event_queue.qsize() - self._superseded_count >= self._incoming_queue_size:
+                # The oldest tick event is dropped first to keep the rewards and messages
+                if len(self._tick_markers) > 0:
+                    self._tick_markers.popleft().event_tuple = None
+                    self._superseded_count += 1
+                else:
+                    self._get_incoming_event_nowait()
+                    self._incoming_event_queue.task_done()
+                if self._dropped_events_counter is not None:
+                    self._dropped_events_counter.inc()
+
+            tick_id, _ = event_tuple
+            if tick_id >= 0:
+                event_tuple = _LatestTickEvent(event_tuple)
+                self._tick_markers.append(event_tuple)
+
         self._incoming_event_queue.put_nowait(event_tuple)
 
+    def _incoming_event_retrieved(self, event_tuple):
+        self._incoming_space.set()
+
+        if type(event_tuple) == _LatestTickEvent:
+            if event_tuple is self._latest_tick_marker:
+                self._latest_tick_marker = None
+            if len(self._tick_markers) > 0 and event_tuple is self._tick_markers[0]:
+                self._tick_markers.popleft()
+            event_tuple = event_tuple.event_tuple
+
+        return event_tuple
+
+    def _is_superseded(self, event_tuple):
+        if type(event_tuple) == _LatestTickEvent and event_tuple.event_tuple is None:
+            self._superseded_count -= 1
+            self._incoming_event_queue.task_done()
+            return True
+        return False
+
+    async def _get_incoming_event(self):
+        while True:
+            event_tuple = await self._incoming_event_queue.get()
+            if not self._is_superseded(event_tuple):
+                return self._incoming_event_retrieved(event_tuple)
+
+    def _get_incoming_event_nowait(self):
+        """Raises asyncio.QueueEmpty if there are no events"""
+        while True:
+            event_tuple = self._incoming_event_queue.get_nowait()
+            if not self._is_superseded(event_tuple):
+                return self._incoming_event_retrieved(event_tuple)
+
+    async def _wait_for_incoming_space(self):
+        if self._overflow_policy != OverflowPolicy.BLOCK or self._incoming_queue_size <= 0:
+            return
+
+        while self._incoming_event_queue.qsize() >= self._incoming_queue_size:
+            self._incoming_space.clear()
+            await self._incoming_space.wait()
+
+    def _in_executor_thread(self):
+        return self._loop is not None and threading.get_ident() != self._loop_thread_id
+
+    def _run_in_loop(self, func, *args):
+        # Called from an executor thread: the trial state and queues can only be used from the event loop,
+        # so the whole call is run there, and waited for to keep the order and raise its errors in the caller.
+        result = concurrent.futures.Future()
+
+        def call():
+            try:
+                result.set_result(func(*args))
+            except Exception as exc:
+                result.set_exception(exc)
+
+        self._loop.call_soon_threadsafe(call)
+        return result.result()
+
     def _post_outgoing_data(self, data):
+        if self._in_executor_thread():
+            return self._run_in_loop(self._post_outgoing_data, data)
+
         if not self._started:
             logger.warning(f"Trial [{self._trial.id}] - Session for [{self.name}]: "
                            f"Cannot send until session is started.")
@@ -298,6 +624,17 @@ class Session(ABC):
 
         logger.debug(f"Exiting [{self.name}] _retrieve_outgoing_data loop generator")
 
+    async def run_in_executor(self, func, *args):
+        """Run `func(*args)` in the executor of the implementation and return its result"""
+        # With a thread pool executor, `func` can use the session methods that send data (e.g. `do_action`).
+        # With a process pool executor, `func` and its arguments must be picklable and only the result is used.
+        loop = asyncio.get_running_loop()
+        call = functools.partial(_executor_call, time.time(), func, args)
+        wait_time, result = await loop.run_in_executor(self._executor, call)
+        if self._executor_wait_summary is not None:
+            self._executor_wait_summary.observe(max(wait_time, 0.0))
+        return result
+
     def get_trial_id(self):
         return self._trial.id
 
@@ -308,6 +645,9 @@ class Session(ABC):
         return self._trial.ended
 
     def sending_done(self):
+        if self._in_executor_thread():
+            return self._run_in_loop(self.sending_done)
+
         if self._auto_ack:
             raise CogmentError("Cannot manually end sending as it is set to automatic")
         elif not self._trial.ending:
@@ -333,10 +673,11 @@ class Session(ABC):
         loop_active = not self._last_event_delivered
         while loop_active:
             try:
-                event_tuple = await self._incoming_event_queue.get()
+                event_tuple = await self._get_incoming_event()
                 if event_tuple is None:
                     logger.debug(f"Trial [{self._trial.id}] - Session [{self.name}]: "
                                  f"Forcefull event loop exit")
+                    self._incoming_event_queue.task_done()
                     self._last_event_delivered = True
                     break
 
@@ -361,6 +702,99 @@ class Session(ABC):
 
         logger.debug(f"Exiting [{self.name}] event loop generator")
 
+    async def _next_event_batch(self, events, max_items, max_wait):
+        """Fills the `events` list and returns if the loop must exit (when `None` is received)"""
+        event_tuple = await self._get_incoming_event()
+        deadline = None
+
+        while True:
+            if event_tuple is None:
+                logger.debug(f"Trial [{self._trial.id}] - Session [{self.name}]: "
+                             f"Forcefull event loop exit")
+                self._incoming_event_queue.task_done()
+                return True
+
+            tick_id, event = event_tuple
+            if tick_id >= 0:
+                self._last_tick_delivered = tick_id
+            events.append(event)
+
+            if event.type == EventType.FINAL:
+                break
+            if max_items > 0 and len(events) >= max_items:
+                break
+
+            try:
+                event_tuple = self._get_incoming_event_nowait()
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            if max_wait <= 0:
+                break
+            if deadline is None:
+                deadline = time.monotonic() + max_wait
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                event_tuple = await asyncio.wait_for(self._get_incoming_event(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+        return False
+
+    async def all_event_batches(self, max_items=0, max_wait=0.0):
+        if not self._started:
+            logger.warning(f"Cannot retrieve events until [{self.name}] is started.")
+            return
+        if self._trial.ended:
+            logger.info(f"No more events for [{self.name}] because the trial has ended.")
+            return
+
+        logger.debug(f"Trial [{self._trial.id}] - Session [{self.name}] starting event batch loop")
+
+        # Each batch contains at least one event, and all the events already received (up to `max_items` if > 0).
+        # If `max_wait` is > 0, we wait up to that many seconds for more events to fill the batch.
+        loop_active = not self._last_event_delivered
+        while loop_active:
+            # The batch is filled in place so that events already dequeued are not lost on cancellation
+            events = []
+            cancelled = False
+            try:
+                exit_loop = await self._next_event_batch(events, max_items, max_wait)
+
+            except asyncio.CancelledError as exc:
+                logger.debug(f"[{self.name}] coroutine cancelled while waiting for events: [{exc}]")
+                if len(events) == 0:
+                    break
+                exit_loop = False
+                cancelled = True
+
+            if exit_loop:
+                self._last_event_delivered = True
+            else:
+                self._last_event_delivered = (events[-1].type == EventType.FINAL)
+
+            if len(events) == 0:
+                break
+
+            keep_looping = yield events
+            for _ in events:
+                self._incoming_event_queue.task_done()
+
+            loop_active = (keep_looping is None or bool(keep_looping)) and not self._last_event_delivered
+            loop_active = loop_active and not cancelled
+            if not loop_active:
+                if self._last_event_delivered:
+                    logger.debug(f"Last event delivered, exiting [{self.name}] event batch loop")
+                elif cancelled:
+                    logger.debug(f"Partial batch delivered after cancellation, exiting [{self.name}] event batch loop")
+                else:
+                    logger.debug(f"End of event batch loop for [{self.name}] requested by user")
+
+        logger.debug(f"Exiting [{self.name}] event batch loop generator")
+
     async def event_loop(self):
         logger.deprecated("`event_loop` is deprecated. Use `all_events` instead.")
 
@@ -368,6 +802,9 @@ class Session(ABC):
             yield event
 
     def add_reward(self, value, confidence, to, tick_id=-1, user_data=None):
+        if self._in_executor_thread():
+            return self._run_in_loop(self.add_reward, value, confidence, to, tick_id, user_data)
+
         if not self._started:
             logger.warning(f"Trial [{self._trial.id}] - Session for [{self.name}]: "
                            f"Cannot send reward until session is started.")
@@ -387,6 +824,9 @@ class Session(ABC):
             self._post_outgoing_data(reward)
 
     def _send_message(self, payload, to):
+        if self._in_executor_thread():
+            return self._run_in_loop(self._send_message, payload, to)
+
         if not self._started:
             logger.warning(f"Trial [{self._trial.id}] - Session for [{self.name}]: "
                            f"Cannot send message until session is started.")
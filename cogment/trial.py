@@ -40,9 +40,49 @@ class Trial:
             new_actor = self.Actor(name=actor.name, actor_class_spec=actor_class_spec)
             self.actors.append(new_actor)
 
+        # Pre-compute to resolve targets (e.g. for observations) without scanning all actors
+        self._actor_indexes = {}
+        self._class_indexes = {}
+        for index, actor in enumerate(self.actors):
+            self._actor_indexes[actor.name] = index
+            self._class_indexes.setdefault(actor.actor_class_spec.name, []).append(index)
+        self._target_indexes = {}
+
     def __str__(self):
         result = f"Trial: id = {self.id}, tick_id = {self.tick_id}, ended = {self.ended}"
         result += f", actors = "
         for actor in self.actors:
             result += f"{{name = {actor.name}, class = {actor.actor_class_spec.name}}},"
         return result
+
+    def get_target_indexes(self, target):
+        """Indexes of the actors targeted by a name or pattern ("name", "class.name", "class.*", "*" or "*.*")"""
+        indexes = self._target_indexes.get(target)
+        if indexes is None:
+            indexes = self._resolve_target(target)
+            self._target_indexes[target] = indexes
+        return indexes
+
+    def _resolve_target(self, target):
+        if target == "*" or target == "*.*":
+            return tuple(range(len(self.actors)))
+
+        if "." not in target:
+            index = self._actor_indexes.get(target)
+            if index is None:
+                return ()
+            return (index,)
+
+        try:
+            actor_class, actor_name = target.split(".")
+        except ValueError:
+            raise CogmentError(f"Invalid target [{target}]")
+
+        class_indexes = self._class_indexes.get(actor_class, [])
+        if actor_name == "*":
+            return tuple(class_indexes)
+
+        index = self._actor_indexes.get(actor_name)
+        if index is None or self.actors[index].actor_class_spec.name != actor_class:
+            return ()
+        return (index,)
@@ -17,6 +17,7 @@ import psutil
 
 import cogment.api.common_pb2 as common_api
 
+from cogment.errors import CogmentError
 from cogment.version import __version__
 
 import logging
@@ -68,6 +69,16 @@ logger = make_logger("cogment.sdk", "COGMENT_LOG_LEVEL")
 INIT_TIMEOUT = 30
 
 
+def import_numpy():
+    try:
+        import numpy
+    except ModuleNotFoundError:
+        raise CogmentError("This feature requires extra dependencies, "
+                           "please install by running `pip install cogment[numpy]`")
+
+    return numpy
+
+
 def list_versions():
     reply = common_api.VersionInfo()
     reply.versions.add(name='cogment_sdk', version=__version__)
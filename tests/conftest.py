@@ -73,15 +73,32 @@ def pytest_addoption(parser):
         default=False,
         help="launch a live orchestrator run slow tests",
     )
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run the performance benchmarks",
+    )
 
 
 def pytest_configure(config):
     config.addinivalue_line(
         "markers", "use_cogment: mark test as requiring a live orchestrator to run"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: mark test as a performance benchmark"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--run-benchmarks"):
+        skip_benchmark = pytest.mark.skip(
+            reason="needs --run-benchmarks option to run"
+        )
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
+
     if config.getoption("--launch-orchestrator"):
         # --launch-orchestrator given in cli: launch the orchestrator
         return
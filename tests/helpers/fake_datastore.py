@@ -0,0 +1,122 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import pickle
+from types import SimpleNamespace
+
+import grpc
+from google.protobuf import wrappers_pb2
+
+from cogment.control import TrialState
+
+CLASS_SPECS = {
+    "player": SimpleNamespace(name="player", observation_space=wrappers_pb2.FloatValue,
+                              action_space=wrappers_pb2.Int32Value),
+    "referee": SimpleNamespace(name="referee", observation_space=wrappers_pb2.FloatValue,
+                               action_space=wrappers_pb2.Int64Value),
+}
+
+
+class FakeParameters:
+    def __init__(self, actor_classes):
+        self.actors = [SimpleNamespace(name=f"actor_{index}", actor_class=name, actor_class_spec=CLASS_SPECS[name])
+                       for index, name in enumerate(actor_classes)]
+
+    def has_specs(self):
+        return True
+
+
+class FakeActorSample:
+    def __init__(self, actor, reward=None, observation=None, action=None):
+        self.actor = actor
+        self.reward = reward
+        self.observation = observation
+        self.action = action
+
+    def HasField(self, name):
+        return getattr(self, name) is not None
+
+
+class FakeTrialSample(SimpleNamespace):
+    def SerializeToString(self):
+        return pickle.dumps(self)
+
+
+def parse_fake_sample(content):
+    return pickle.loads(content)
+
+
+def make_trial_info(trial_id, sample_count, actor_classes=("player", "player"), trial_state=TrialState.ENDED):
+    return SimpleNamespace(trial_id=trial_id, sample_count=sample_count, trial_state=trial_state,
+                           parameters=FakeParameters(actor_classes))
+
+
+def make_sample(trial_id, tick_id, nb_actors, ended=False):
+    """Sample where all actors share the observation `tick_id + 0.5` and act `tick_id * 10 + actor index`"""
+    payloads = [wrappers_pb2.FloatValue(value=tick_id + 0.5).SerializeToString()]
+    actor_samples = []
+    for actor in range(nb_actors):
+        payloads.append(wrappers_pb2.Int32Value(value=tick_id * 10 + actor).SerializeToString())
+        actor_samples.append(FakeActorSample(actor, reward=float(actor), observation=0, action=len(payloads) - 1))
+    state = TrialState.ENDED if ended else TrialState.RUNNING
+    return FakeTrialSample(trial_id=trial_id, state=state.value, tick_id=tick_id, timestamp=1000 + tick_id,
+                           actor_samples=actor_samples, payloads=payloads)
+
+
+def make_trial_samples(trial_id, sample_count, nb_actors=2):
+    return [make_sample(trial_id, tick_id, nb_actors, ended=(tick_id == sample_count - 1))
+            for tick_id in range(sample_count)]
+
+
+class FakeDatastoreStub:
+    """Streams the given samples of the requested trials, in order (or interleaved if given so)"""
+
+    def __init__(self, samples, fail_after=None, delay=0.0, trial_ids=()):
+        self.samples = samples
+        self.trial_ids = list(trial_ids)
+        self.requests = []
+        self.trial_requests = []
+        self.nb_streamed = 0
+        self._fail_after = fail_after
+        self._delay = delay
+
+    async def RetrieveTrials(self, request, metadata):
+        start = int(request.trial_handle) if request.trial_handle else 0
+        end = start + request.trials_count
+        self.trial_requests.append(start)
+        if self._delay > 0:
+            await asyncio.sleep(self._delay)
+
+        trial_infos = [SimpleNamespace(trial_id=trial_id, last_state=TrialState.ENDED.value, user_id="user",
+                                       samples_count=0, params=None)
+                       for trial_id in self.trial_ids[start:end]]
+        next_trial_handle = str(end) if end < len(self.trial_ids) else ""
+        return SimpleNamespace(trial_infos=trial_infos, next_trial_handle=next_trial_handle)
+
+    def RetrieveSamples(self, request, metadata):
+        self.requests.append(list(request.trial_ids))
+        return self._retrieve_samples(list(request.trial_ids))
+
+    async def _retrieve_samples(self, trial_ids):
+        for sample in self.samples:
+            if sample.trial_id not in trial_ids:
+                continue
+            if self._fail_after is not None and self.nb_streamed >= self._fail_after:
+                self._fail_after = None
+                raise grpc.aio.AioRpcError(grpc.StatusCode.UNAVAILABLE, None, None, details="Connection lost")
+            if self._delay > 0:
+                await asyncio.sleep(self._delay)
+            self.nb_streamed += 1
+            yield SimpleNamespace(trial_sample=sample)
@@ -0,0 +1,94 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+from google.protobuf import wrappers_pb2
+
+import cogment
+from cogment.session import RecvEvent, EventType, ActorStatus
+from cogment.trial import Trial
+
+np = pytest.importorskip("numpy")
+
+
+def _make_event():
+    cog_settings = SimpleNamespace(actor_classes={
+        "player": SimpleNamespace(name="player", action_space=wrappers_pb2.Int32Value),
+        "referee": SimpleNamespace(name="referee", action_space=wrappers_pb2.BoolValue),
+    })
+    actors_in_trial = [
+        SimpleNamespace(name="alice", actor_class="player"),
+        SimpleNamespace(name="bob", actor_class="player"),
+        SimpleNamespace(name="carol", actor_class="referee"),
+        SimpleNamespace(name="dave", actor_class="player"),
+    ]
+    trial = Trial("trial", actors_in_trial, cog_settings)
+
+    action_set = SimpleNamespace(
+        tick_id=12,
+        timestamp=1234,
+        unavailable_actors=[1],
+        actions=[
+            wrappers_pb2.Int32Value(value=3).SerializeToString(),
+            b"",
+            wrappers_pb2.BoolValue(value=True).SerializeToString(),
+            wrappers_pb2.Int32Value(value=-7).SerializeToString(),
+        ],
+    )
+
+    event = RecvEvent(EventType.ACTIVE)
+    event._set_action_set(action_set, trial)
+    return event
+
+
+def test_action_columns(unittest_case):
+    event = _make_event()
+
+    columns = event.get_action_columns()
+    unittest_case.assertEqual(len(columns), 4)
+    unittest_case.assertEqual(columns.actor_indexes.tolist(), [0, 1, 2, 3])
+    unittest_case.assertEqual(columns.status.tolist(), [ActorStatus.ACTIVE.value, ActorStatus.UNAVAILABLE.value,
+                                                        ActorStatus.ACTIVE.value, ActorStatus.ACTIVE.value])
+    unittest_case.assertEqual(columns.timestamp.tolist(), [1234, 0, 1234, 1234])
+    unittest_case.assertEqual(columns["value"].tolist(), [3, 0, 1, -7])
+    unittest_case.assertIs(event.get_action_columns(), columns)
+
+    player_columns = event.get_action_columns("player")
+    unittest_case.assertEqual(player_columns.actor_indexes.tolist(), [0, 1, 3])
+    unittest_case.assertEqual(player_columns["value"].dtype, np.int32)
+    unittest_case.assertEqual(player_columns["value"].tolist(), [3, 0, -7])
+
+    referee_columns = event.get_action_columns("referee")
+    unittest_case.assertEqual(referee_columns["value"].dtype, np.bool_)
+    unittest_case.assertEqual(referee_columns["value"].tolist(), [True])
+
+
+def test_actions_consistent_with_columns(unittest_case):
+    event = _make_event()
+
+    unittest_case.assertEqual(len(event.actions), 4)
+    unittest_case.assertEqual(event.actions[1].status, ActorStatus.UNAVAILABLE)
+    unittest_case.assertIsNone(event.actions[1].action)
+    unittest_case.assertEqual(event.actions[3].action.value, -7)
+    unittest_case.assertEqual(event.actions[3].timestamp, 1234)
+
+
+def test_action_columns_without_action_set(unittest_case):
+    event = RecvEvent(EventType.ACTIVE)
+
+    unittest_case.assertEqual(event.actions, [])
+    with unittest_case.assertRaises(cogment.CogmentError):
+        event.get_action_columns()
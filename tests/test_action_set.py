@@ -0,0 +1,109 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+from google.protobuf import wrappers_pb2
+
+from cogment.session import RecvEvent, EventType, ActorStatus
+from cogment.trial import Trial
+
+
+class _CountingSpace:
+    parse_count = 0
+
+    def __init__(self):
+        self.value = None
+
+    def ParseFromString(self, content):
+        _CountingSpace.parse_count += 1
+        message = wrappers_pb2.Int32Value()
+        message.ParseFromString(content)
+        self.value = message.value
+
+
+def _make_event(unavailable_actors, actions):
+    cog_settings = SimpleNamespace(actor_classes={
+        "player": SimpleNamespace(name="player", action_space=_CountingSpace),
+    })
+    actors_in_trial = [SimpleNamespace(name=f"player_{index}", actor_class="player") for index in range(len(actions))]
+    trial = Trial("trial", actors_in_trial, cog_settings)
+
+    action_set = SimpleNamespace(tick_id=5, timestamp=1234, unavailable_actors=unavailable_actors, actions=actions)
+    event = RecvEvent(EventType.ACTIVE)
+    event._set_action_set(action_set, trial)
+    return event
+
+
+def _serialized(value):
+    return wrappers_pb2.Int32Value(value=value).SerializeToString()
+
+
+def test_unavailable_actors(unittest_case):
+    _CountingSpace.parse_count = 0
+    event = _make_event([0, 2], [b"", _serialized(4), b""])
+
+    unittest_case.assertEqual([action.actor_index for action in event.actions], [0, 1, 2])
+    unittest_case.assertEqual([action.tick_id for action in event.actions], [5, 5, 5])
+    unittest_case.assertEqual([action.status for action in event.actions],
+                              [ActorStatus.UNAVAILABLE, ActorStatus.ACTIVE, ActorStatus.UNAVAILABLE])
+    unittest_case.assertEqual([action.timestamp for action in event.actions], [0, 1234, 0])
+    unittest_case.assertIsNone(event.actions[0].action)
+    unittest_case.assertIsNone(event.actions[2].action)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 0)
+
+
+def test_lazy_parsing(unittest_case):
+    _CountingSpace.parse_count = 0
+    event = _make_event([], [_serialized(1), _serialized(2)])
+
+    # The action set is only decoded when the actions are accessed, and each action on its own first access
+    actions = event.actions
+    unittest_case.assertIs(event.actions, actions)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 0)
+
+    action = actions[1].action
+    unittest_case.assertEqual(action.value, 2)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 1)
+
+    unittest_case.assertIs(actions[1].action, action)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 1)
+
+    unittest_case.assertEqual(actions[0].action.value, 1)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 2)
+
+
+def test_action_setter(unittest_case):
+    _CountingSpace.parse_count = 0
+    event = _make_event([], [_serialized(1)])
+
+    event.actions[0].action = "replaced"
+    unittest_case.assertEqual(event.actions[0].action, "replaced")
+    unittest_case.assertEqual(_CountingSpace.parse_count, 0)
+
+    event.actions = []
+    unittest_case.assertEqual(event.actions, [])
+
+
+def test_default_action(unittest_case):
+    # When an actor times out, the orchestrator sends its default action (which can be empty) for it:
+    # it is delivered as an active action and decoded like any other action
+    _CountingSpace.parse_count = 0
+    event = _make_event([], [_serialized(3), b""])
+
+    default_action = event.actions[1]
+    unittest_case.assertEqual(default_action.status, ActorStatus.ACTIVE)
+    unittest_case.assertEqual(default_action.timestamp, 1234)
+    unittest_case.assertEqual(default_action.action.value, 0)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 1)
@@ -0,0 +1,146 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import cogment
+from cogment.actor import _ActorBatcher
+
+
+class _FakeSession:
+    def __init__(self):
+        self.actions = []
+        self.ended = False
+
+    def is_trial_over(self):
+        return self.ended
+
+    def do_action(self, action):
+        self.actions.append(action)
+
+
+def _make_event(value):
+    return SimpleNamespace(observation=SimpleNamespace(observation=value))
+
+
+@pytest.mark.asyncio
+async def test_batch_routing(unittest_case):
+    batch_sizes = []
+
+    async def impl(batch):
+        batch_sizes.append(len(batch))
+        return [obs * 2 for obs in batch.observations]
+
+    batcher = _ActorBatcher(impl, "batched", max_batch_size=4, max_batch_wait=0.05)
+    sessions = [_FakeSession() for _ in range(6)]
+    for index, session in enumerate(sessions):
+        batcher._submit(session, _make_event(index))
+
+    await asyncio.sleep(0.2)
+
+    unittest_case.assertEqual(batch_sizes, [4, 2])
+    for index, session in enumerate(sessions):
+        unittest_case.assertEqual(session.actions, [index * 2])
+
+
+@pytest.mark.asyncio
+async def test_batch_skips_ended_trials(unittest_case):
+    def impl(batch):
+        return [None] * len(batch)
+
+    batcher = _ActorBatcher(impl, "batched", max_batch_size=8, max_batch_wait=0.01)
+    sessions = [_FakeSession(), _FakeSession()]
+    sessions[1].ended = True
+    for session in sessions:
+        batcher._submit(session, _make_event(0))
+
+    await asyncio.sleep(0.1)
+
+    unittest_case.assertEqual(sessions[0].actions, [None])
+    unittest_case.assertEqual(sessions[1].actions, [])
+
+
+def test_batch_invalid_parameters(unittest_case):
+    with unittest_case.assertRaises(cogment.CogmentError):
+        _ActorBatcher(lambda batch: batch, "batched", max_batch_size=0, max_batch_wait=0.01)
+    with unittest_case.assertRaises(cogment.CogmentError):
+        _ActorBatcher(lambda batch: batch, "batched", max_batch_size=1, max_batch_wait=-1)
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_fail_all_sessions(unittest_case):
+    def failing_impl(batch):
+        raise RuntimeError("impl failure")
+
+    batcher = _ActorBatcher(failing_impl, "batched", max_batch_size=2, max_batch_wait=0.01)
+    futures = [batcher._submit(_FakeSession(), _make_event(index)) for index in range(2)]
+    for future in futures:
+        with unittest_case.assertRaises(RuntimeError):
+            await future
+
+    batcher = _ActorBatcher(lambda batch: [0], "batched", max_batch_size=2, max_batch_wait=0.01)
+    sessions = [_FakeSession(), _FakeSession()]
+    futures = [batcher._submit(session, _make_event(0)) for session in sessions]
+    for future in futures:
+        with unittest_case.assertRaises(cogment.CogmentError):
+            await future
+    unittest_case.assertEqual([session.actions for session in sessions], [[], []])
+
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_close(unittest_case):
+    started = asyncio.Event()
+
+    async def impl(batch):
+        started.set()
+        await asyncio.sleep(10)
+
+    batcher = _ActorBatcher(impl, "batched", max_batch_size=1, max_batch_wait=0)
+    futures = [batcher._submit(_FakeSession(), _make_event(index)) for index in range(2)]
+    await started.wait()
+    await batcher.close()
+
+    unittest_case.assertIsNone(batcher._task)
+    for future in futures:
+        with unittest_case.assertRaises(cogment.CogmentError):
+            await future
+
+
+@pytest.mark.asyncio
+async def test_batch_observation_columns(unittest_case):
+    np = pytest.importorskip("numpy")
+    from google.protobuf import wrappers_pb2
+
+    columns = None
+
+    def impl(batch):
+        nonlocal columns
+        columns = batch.get_observation_columns()
+        return [None] * len(batch)
+
+    batcher = _ActorBatcher(impl, "batched", max_batch_size=3, max_batch_wait=0.01)
+    futures = [batcher._submit(_FakeSession(), _make_event(wrappers_pb2.FloatValue(value=index + 0.5)))
+               for index in range(3)]
+    await asyncio.gather(*futures)
+
+    unittest_case.assertEqual(list(columns), ["value"])
+    unittest_case.assertEqual(columns["value"].dtype, np.float32)
+    unittest_case.assertEqual(columns["value"].tolist(), [0.5, 1.5, 2.5])
+
+    await batcher.close()
@@ -0,0 +1,64 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import cogment.api.environment_pb2 as env_api
+
+from cogment.env_service import _process_normal_data
+from cogment.environment import EnvironmentSession
+from cogment.trial import Trial
+
+logger = logging.getLogger("cogment.unit-tests")
+
+ACTOR_COUNT = 1000
+TICK_COUNT = 100
+
+
+def _make_session(cog_settings):
+    actors_in_trial = [SimpleNamespace(name=f"actor_{index}", actor_class="my_actor_class_1")
+                       for index in range(ACTOR_COUNT)]
+    trial = Trial("benchmark", actors_in_trial, cog_settings)
+    session = EnvironmentSession(None, trial, "benchmark", "benchmark", None)
+    session._started = True
+    return session
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_action_set_decoding(unittest_case, cog_settings, data_pb2):
+    session = _make_session(cog_settings)
+
+    data = env_api.EnvRunTrialInput()
+    for index in range(ACTOR_COUNT):
+        data.action_set.actions.append(data_pb2.Action(action_value=index).SerializeToString())
+    data.action_set.unavailable_actors.extend(range(0, ACTOR_COUNT, 10))
+
+    start = time.perf_counter()
+    for tick_id in range(TICK_COUNT):
+        data.action_set.tick_id = tick_id
+        _process_normal_data(data, session)
+    duration = time.perf_counter() - start
+
+    unittest_case.assertEqual(session._incoming_event_queue.qsize(), TICK_COUNT)
+    _, event = session._incoming_event_queue.get_nowait()
+    unittest_case.assertEqual(len(event.actions), ACTOR_COUNT)
+    unittest_case.assertIsNone(event.actions[0].action)
+    unittest_case.assertEqual(event.actions[1].action.action_value, 1)
+
+    logger.info(f"Action set decoding with [{ACTOR_COUNT}] actors: [{TICK_COUNT / duration:.1f}] ticks/sec")
@@ -0,0 +1,96 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+
+import pytest
+
+import cogment
+import cogment.api.common_pb2 as common_api
+from cogment.channel_pool import ChannelPool
+
+logger = logging.getLogger("cogment.unit-tests")
+
+TRIAL_COUNT = 2000
+
+
+class _FakeChannel:
+    """Channel to an orchestrator running client actor trials that end right after starting"""
+
+    def __init__(self, endpoint):
+        self.url = endpoint.url
+
+    def stream_stream(self, method, request_serializer=None, response_deserializer=None, **kwargs):
+        def run_trial(request_iterator, metadata=None):
+            return self._run_trial(request_iterator, request_serializer, response_deserializer)
+        return run_trial
+
+    def unary_unary(self, method, **kwargs):
+        return None
+
+    unary_stream = unary_unary
+    stream_unary = unary_unary
+
+    async def _run_trial(self, request_iterator, request_serializer, response_deserializer):
+        requests = request_iterator.__aiter__()
+        request_serializer(await requests.__anext__())  # Join request
+
+        init_input = common_api.ActorInitialInput(actor_name="client", actor_class="my_actor_class_1",
+                                                  impl_name="client")
+        reply = common_api.ActorRunTrialInput(state=common_api.CommunicationState.NORMAL, init_input=init_input)
+        yield response_deserializer(reply.SerializeToString())
+
+        request_serializer(await requests.__anext__())  # Init acknowledgement
+        for state in (common_api.CommunicationState.LAST, common_api.CommunicationState.END):
+            reply = common_api.ActorRunTrialInput(state=state)
+            yield response_deserializer(reply.SerializeToString())
+
+    async def close(self):
+        pass
+
+
+async def _client_actor(actor_session):
+    actor_session.start()
+    async for _ in actor_session.all_events():
+        pass
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_join_trials(unittest_case, cog_settings):
+    context = cogment.Context(user_id="benchmark", cog_settings=cog_settings, prometheus_registry=None)
+    context.register_actor(_client_actor, "client", ["my_actor_class_1"])
+
+    # Only the channels are faked: both methods go through the channel pool, stub and client servicer
+    await context._channel_pool.close()
+    context._channel_pool = ChannelPool(_FakeChannel)
+    endpoint = cogment.Endpoint("grpc://orchestrator:9000")
+    trial_ids = [f"trial_{index}" for index in range(TRIAL_COUNT)]
+
+    start = time.perf_counter()
+    for trial_id in trial_ids:
+        await context.join_trial(trial_id, endpoint, actor_class="my_actor_class_1")
+    sequential_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await context.join_trials(trial_ids, endpoint, actor_class="my_actor_class_1")
+    bulk_duration = time.perf_counter() - start
+
+    unittest_case.assertTrue(all(result.success for result in results))
+
+    logger.info(f"Joined [{TRIAL_COUNT}] trials: sequentially [{TRIAL_COUNT / sequential_duration:.1f}] trials/sec, "
+                f"with join_trials [{TRIAL_COUNT / bulk_duration:.1f}] trials/sec")
+
+    await context.close()
@@ -0,0 +1,60 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from cogment.session import Session, RecvEvent, EventType
+
+logger = logging.getLogger("cogment.unit-tests")
+
+EVENT_COUNT = 200_000
+
+
+def _make_session():
+    trial = SimpleNamespace(id="benchmark", actors=[], ended=False, ending=False, ending_ack=False, tick_id=-1)
+    session = Session(trial, "benchmark", None, "benchmark", None)
+    session._started = True
+
+    for tick_id in range(EVENT_COUNT - 1):
+        session._post_incoming_event((tick_id, RecvEvent(EventType.ACTIVE)))
+    session._post_incoming_event((-1, RecvEvent(EventType.FINAL)))
+
+    return session
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_event_batches(unittest_case):
+    session = _make_session()
+    count = 0
+    start = time.perf_counter()
+    async for event in session.all_events():
+        count += 1
+    single_duration = time.perf_counter() - start
+    unittest_case.assertEqual(count, EVENT_COUNT)
+
+    session = _make_session()
+    count = 0
+    start = time.perf_counter()
+    async for events in session.all_event_batches(max_items=1024):
+        count += len(events)
+    batch_duration = time.perf_counter() - start
+    unittest_case.assertEqual(count, EVENT_COUNT)
+
+    logger.info(f"all_events: [{EVENT_COUNT / single_duration:.0f}] events/sec")
+    logger.info(f"all_event_batches: [{EVENT_COUNT / batch_duration:.0f}] events/sec")
@@ -0,0 +1,96 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gc
+
+import pytest
+
+import cogment
+from cogment.channel_pool import ChannelPool
+
+
+class _FakeChannel:
+    def __init__(self, endpoint):
+        self.url = endpoint.url
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeClient:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_shared_channels(unittest_case):
+    pool = ChannelPool(_FakeChannel)
+
+    channel_1 = pool.acquire(cogment.Endpoint("grpc://host_1:9000"))
+    channel_2 = pool.acquire(cogment.Endpoint("grpc://host_1:9000"))
+    unittest_case.assertIs(channel_1, channel_2)
+
+    ssl_endpoint = cogment.Endpoint("grpc://host_1:9000", use_ssl=True)
+    unittest_case.assertIsNot(pool.acquire(ssl_endpoint), channel_1)
+    unittest_case.assertIsNot(pool.acquire(cogment.Endpoint("grpc://host_2:9000")), channel_1)
+    unittest_case.assertEqual(len(pool), 3)
+
+    await pool.close()
+    unittest_case.assertTrue(channel_1.closed)
+    unittest_case.assertEqual(len(pool), 0)
+    with unittest_case.assertRaises(cogment.CogmentError):
+        pool.acquire(cogment.Endpoint("grpc://host_1:9000"))
+
+
+@pytest.mark.asyncio
+async def test_idle_eviction(unittest_case):
+    pool = ChannelPool(_FakeChannel, idle_timeout=0.0)
+    endpoint = cogment.Endpoint("grpc://host:9000")
+    other_endpoint = cogment.Endpoint("grpc://other:9000")
+
+    channel = pool.acquire(endpoint)
+    pool.acquire(endpoint)
+    pool.release(endpoint)
+    pool.acquire(other_endpoint)
+    unittest_case.assertEqual(len(pool), 2)  # Still referenced
+
+    pool.release(endpoint)
+    pool.acquire(other_endpoint)
+    await asyncio.sleep(0)
+    unittest_case.assertEqual(len(pool), 1)
+    unittest_case.assertTrue(channel.closed)
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_release_when_collected(unittest_case):
+    pool = ChannelPool(_FakeChannel, idle_timeout=0.0)
+    endpoint = cogment.Endpoint("grpc://host:9000")
+
+    channel = pool.acquire(endpoint)
+    client = _FakeClient()
+    pool.release_when_collected(client, endpoint)
+
+    pool.acquire(cogment.Endpoint("grpc://other:9000"))
+    unittest_case.assertFalse(channel.closed)
+
+    del client
+    gc.collect()
+    pool.acquire(cogment.Endpoint("grpc://other:9000"))
+    await asyncio.sleep(0)
+    unittest_case.assertTrue(channel.closed)
+
+    await pool.close()
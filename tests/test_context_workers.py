@@ -0,0 +1,91 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import sys
+
+import grpc.aio
+import pytest
+
+import cogment
+import cogment.api.common_pb2 as common_api
+import cogment.api.environment_pb2_grpc as env_grpc_api
+
+
+async def _environment(environment_session):
+    environment_session.start()
+    async for _ in environment_session.all_events():
+        pass
+
+
+def _make_context():
+    context = cogment.Context(user_id="workers", cog_settings=None, prometheus_registry=None)
+    context.register_environment(_environment)
+    return context
+
+
+@pytest.mark.asyncio
+async def test_invalid_workers(unittest_case):
+    context = _make_context()
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        await context.serve_all_registered(cogment.ServedEndpoint(0), workers=0)
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_workers(unittest_case):
+    async def local_environment(environment_session):
+        pass
+
+    context = cogment.Context(user_id="workers", cog_settings=None, prometheus_registry=None)
+    context.register_environment(local_environment)
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        await context.serve_all_registered(cogment.ServedEndpoint(0), workers=2)
+    unittest_case.assertEqual(context._worker_processes, [])
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Workers require SO_REUSEPORT")
+@pytest.mark.asyncio
+async def test_workers_lifecycle(unittest_case):
+    context = _make_context()
+    serve_task = asyncio.create_task(context.serve_all_registered(cogment.ServedEndpoint(0), workers=2))
+
+    reply = None
+    for _ in range(200):
+        await asyncio.sleep(0.05)
+        if context.served_port == 0:
+            continue
+        try:
+            async with grpc.aio.insecure_channel(f"localhost:{context.served_port}") as channel:
+                stub = env_grpc_api.EnvironmentSPStub(channel)
+                reply = await stub.Version(common_api.VersionRequest(), timeout=1.0)
+            break
+        except grpc.aio.AioRpcError:
+            pass
+
+    # Served by the environment servicer of a worker
+    unittest_case.assertIsNotNone(reply)
+    unittest_case.assertIn("cogment_sdk", [version.name for version in reply.versions])
+    unittest_case.assertEqual(len(context._worker_processes), 2)
+    unittest_case.assertTrue(all(process.is_alive() for process in context._worker_processes))
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        await context.serve_all_registered(cogment.ServedEndpoint(0), workers=2)
+
+    serve_task.cancel()
+    with unittest_case.assertRaises(asyncio.CancelledError):
+        await serve_task
+
+    unittest_case.assertFalse(any(process.is_alive() for process in context._worker_processes))
@@ -0,0 +1,189 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+import cogment
+import cogment.datastore
+from cogment.control import TrialState
+from cogment.datastore import Datastore
+from cogment.datastore_cache import _cache_key
+
+from helpers.fake_datastore import FakeDatastoreStub, make_trial_info, make_trial_samples, parse_fake_sample
+
+SAMPLE_COUNT = 4
+
+
+@pytest.fixture
+def fake_samples(monkeypatch):
+    monkeypatch.setattr(cogment.datastore, "_parse_stored_sample", parse_fake_sample)
+
+
+def _make_datastore(cache, trial_states):
+    trial_infos = [make_trial_info(f"trial_{index}", SAMPLE_COUNT, trial_state=state)
+                   for index, state in enumerate(trial_states)]
+    samples = []
+    for info in trial_infos:
+        samples.extend(make_trial_samples(info.trial_id, SAMPLE_COUNT))
+    stub = FakeDatastoreStub(samples)
+    return Datastore(stub, cog_settings=None, cache=cache), stub, trial_infos
+
+
+def _sample_keys(samples):
+    return [(sample.trial_id, sample.tick_id, sample.actors_data["actor_1"].reward) for sample in samples]
+
+
+@pytest.mark.asyncio
+async def test_cached_samples(unittest_case, tmp_path, fake_samples):
+    cache = cogment.DatastoreCache(str(tmp_path))
+    trial_states = [TrialState.ENDED, TrialState.RUNNING, TrialState.ENDED]
+    datastore, stub, trial_infos = _make_datastore(cache, trial_states)
+
+    first_samples = [sample async for sample in datastore.all_samples(trial_infos)]
+    unittest_case.assertEqual(len(cache), 3)
+    unittest_case.assertEqual(stub.nb_streamed, 3 * SAMPLE_COUNT)
+
+    # Running trials (at the time of listing) are retrieved again
+    second_samples = [sample async for sample in datastore.all_samples(trial_infos)]
+    unittest_case.assertEqual(stub.requests[1], ["trial_1"])
+    unittest_case.assertEqual(stub.nb_streamed, 4 * SAMPLE_COUNT)
+    unittest_case.assertEqual(sorted(_sample_keys(second_samples)), sorted(_sample_keys(first_samples)))
+
+    # A different selection is cached separately
+    actor_samples = [sample async for sample in datastore.all_samples(trial_infos, actor_names=["actor_1"])]
+    unittest_case.assertEqual(len(actor_samples), 3 * SAMPLE_COUNT)
+    unittest_case.assertEqual(stub.requests[2], ["trial_0", "trial_1", "trial_2"])
+
+    # Entries persist across cache instances
+    reopened_cache = cogment.DatastoreCache(str(tmp_path))
+    unittest_case.assertEqual(len(reopened_cache), 6)
+    unittest_case.assertEqual(reopened_cache.size, cache.size)
+
+
+@pytest.mark.asyncio
+async def test_incomplete_trials_not_cached(unittest_case, tmp_path, fake_samples):
+    cache = cogment.DatastoreCache(str(tmp_path))
+    datastore, stub, trial_infos = _make_datastore(cache, [TrialState.ENDED, TrialState.ENDED])
+
+    samples = datastore.all_samples(trial_infos)
+    async for sample in samples:
+        if sample.trial_id == "trial_1":
+            break
+    await samples.aclose()
+    unittest_case.assertEqual(len(cache), 1)
+    unittest_case.assertEqual(sorted(path.suffix for path in tmp_path.iterdir()), [".index", ".samples"])
+
+
+@pytest.mark.asyncio
+async def test_cache_eviction(unittest_case, tmp_path, fake_samples):
+    cache = cogment.DatastoreCache(str(tmp_path))
+    datastore, stub, trial_infos = _make_datastore(cache, [TrialState.ENDED] * 3)
+
+    [sample async for sample in datastore.all_samples(trial_infos[:1])]
+    entry_size = cache.size
+
+    small_cache = cogment.DatastoreCache(str(tmp_path), max_size=2 * entry_size)
+    datastore, stub, trial_infos = _make_datastore(small_cache, [TrialState.ENDED] * 3)
+    [sample async for sample in datastore.all_samples(trial_infos[1:2])]
+    [sample async for sample in datastore.all_samples(trial_infos[0:1])]  # Most recently used
+    [sample async for sample in datastore.all_samples(trial_infos[2:3])]
+
+    unittest_case.assertEqual(len(small_cache), 2)
+    unittest_case.assertLessEqual(small_cache.size, 2 * entry_size)
+    unittest_case.assertEqual(stub.requests, [["trial_1"], ["trial_2"]])
+
+    [sample async for sample in datastore.all_samples(trial_infos[1:2])]
+    unittest_case.assertEqual(stub.requests[-1], ["trial_1"])
+
+
+def _trial_order(samples):
+    trial_ids = []
+    for sample in samples:
+        if not trial_ids or trial_ids[-1] != sample.trial_id:
+            trial_ids.append(sample.trial_id)
+    return trial_ids
+
+
+@pytest.mark.asyncio
+async def test_cached_samples_order(unittest_case, tmp_path, fake_samples):
+    cache = cogment.DatastoreCache(str(tmp_path))
+    datastore, stub, trial_infos = _make_datastore(cache, [TrialState.ENDED] * 4)
+    [sample async for sample in datastore.all_samples(trial_infos[1:2])]
+
+    # The order of the trial infos is kept when ordered
+    samples = [sample async for sample in datastore.all_samples(trial_infos)]
+    unittest_case.assertEqual(_trial_order(samples), ["trial_0", "trial_1", "trial_2", "trial_3"])
+    unittest_case.assertEqual(stub.requests[1:], [["trial_0"], ["trial_2", "trial_3"]])
+
+    # Otherwise the cached trials are served first
+    samples = [sample async for sample in datastore.all_samples(trial_infos[::-1], ordered=False)]
+    unittest_case.assertEqual(_trial_order(samples), ["trial_3", "trial_2", "trial_1", "trial_0"])
+    unittest_case.assertEqual(stub.nb_streamed, 4 * SAMPLE_COUNT)
+
+
+@pytest.mark.asyncio
+async def test_evicted_while_reading(unittest_case, tmp_path, fake_samples, monkeypatch):
+    cache = cogment.DatastoreCache(str(tmp_path))
+    datastore, stub, trial_infos = _make_datastore(cache, [TrialState.ENDED] * 3)
+    expected_samples = [sample async for sample in datastore.all_samples(trial_infos)]
+
+    # Trial 0 is evicted between the lookup and the read, the files of trial 1 are removed before they are opened
+    selection = ([], [], [], [])
+    monkeypatch.setattr(cache, "contains", lambda trial_id, selection: True)
+    cache._remove(_cache_key("trial_0", selection))
+    for suffix in (".index", ".samples"):
+        os.remove(cache._path(_cache_key("trial_1", selection), suffix))
+
+    samples = [sample async for sample in datastore.all_samples(trial_infos)]
+    unittest_case.assertEqual(_sample_keys(samples), _sample_keys(expected_samples))
+    unittest_case.assertEqual(stub.requests[1:], [["trial_0"], ["trial_1"]])
+
+
+@pytest.mark.asyncio
+async def test_cached_samples_no_trial_infos(unittest_case, tmp_path):
+    datastore, stub, trial_infos = _make_datastore(cogment.DatastoreCache(str(tmp_path)), [])
+    with unittest_case.assertRaises(cogment.CogmentError):
+        [sample async for sample in datastore.all_samples(trial_infos)]
+    unittest_case.assertEqual(stub.requests, [])
+
+
+def test_concurrent_writers(unittest_case, tmp_path):
+    cache = cogment.DatastoreCache(str(tmp_path))
+    selection = ([], [], [], [])
+    writers = [cache.writer("trial", selection) for _ in range(2)]
+    for writer in writers:
+        writer.append(b"sample")
+        writer.flush()
+
+    # Each writer has its own temporary file
+    unittest_case.assertEqual(len({writer._samples_path for writer in writers}), 2)
+    unittest_case.assertEqual(len(list(tmp_path.iterdir())), 2)
+
+    for writer in writers:
+        writer.commit()
+    unittest_case.assertEqual(list(cache.read("trial", selection)), [b"sample"])
+    unittest_case.assertEqual(sorted(path.suffix for path in tmp_path.iterdir()), [".index", ".samples"])
+
+
+def test_stale_tmp_files(unittest_case, tmp_path):
+    live_path = tmp_path / f"key.{os.getpid()}.abc.samples.tmp"
+    stale_path = tmp_path / "key.99999999.abc.samples.tmp"
+    live_path.write_bytes(b"sample")
+    stale_path.write_bytes(b"sample")
+
+    cogment.DatastoreCache(str(tmp_path))
+    unittest_case.assertTrue(live_path.exists())
+    unittest_case.assertFalse(stale_path.exists())
@@ -0,0 +1,88 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from google.protobuf import wrappers_pb2
+
+import cogment
+from cogment.datastore import Datastore
+
+from helpers.fake_datastore import FakeDatastoreStub, make_sample, make_trial_info
+
+np = pytest.importorskip("numpy")
+
+
+def _make_datastore():
+    trial_infos = [make_trial_info("trial_a", 3), make_trial_info("trial_b", 2)]
+    # Interleaved trials
+    samples = [
+        make_sample("trial_a", 0, 2),
+        make_sample("trial_b", 0, 2),
+        make_sample("trial_a", 1, 2),
+        make_sample("trial_b", 1, 2, ended=True),
+        make_sample("trial_a", 2, 2, ended=True),
+    ]
+    return Datastore(FakeDatastoreStub(samples), cog_settings=None), trial_infos
+
+
+async def _all_columns(datastore, trial_infos, **kwargs):
+    return [columns async for columns in datastore.all_sample_columns(trial_infos, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_columns_per_trial(unittest_case):
+    datastore, trial_infos = _make_datastore()
+
+    all_columns = await _all_columns(datastore, trial_infos)
+    unittest_case.assertEqual([columns.trial_ids for columns in all_columns], [["trial_b"], ["trial_a"]])
+
+    columns = all_columns[1]
+    unittest_case.assertEqual(len(columns), 6)
+    unittest_case.assertEqual(columns["tick_id"].tolist(), [0, 0, 1, 1, 2, 2])
+    unittest_case.assertEqual(columns["timestamp"].tolist(), [1000, 1000, 1001, 1001, 1002, 1002])
+    unittest_case.assertEqual(columns["actor_index"].tolist(), [0, 1, 0, 1, 0, 1])
+    unittest_case.assertEqual(columns["reward"].tolist(), [0.0, 1.0, 0.0, 1.0, 0.0, 1.0])
+    unittest_case.assertEqual(columns["done"].tolist(), [False, False, False, False, True, True])
+    unittest_case.assertEqual(columns["observation.value"].tolist(), [0.5, 0.5, 1.5, 1.5, 2.5, 2.5])
+    unittest_case.assertEqual(columns["action.value"].dtype, np.int32)
+    unittest_case.assertEqual(columns["action.value"].tolist(), [0, 1, 10, 11, 20, 21])
+
+
+@pytest.mark.asyncio
+async def test_columns_batches(unittest_case):
+    datastore, trial_infos = _make_datastore()
+
+    all_columns = await _all_columns(datastore, trial_infos, batch_size=2)
+    unittest_case.assertEqual([len(columns) for columns in all_columns], [4, 4, 2])
+    unittest_case.assertEqual(all_columns[0].trial_ids, ["trial_a", "trial_b"])
+    unittest_case.assertEqual(all_columns[0]["trial_index"].tolist(), [0, 0, 1, 1])
+    unittest_case.assertEqual(all_columns[2]["action.value"].tolist(), [20, 21])
+
+
+@pytest.mark.asyncio
+async def test_columns_raw_payloads(unittest_case):
+    datastore, trial_infos = _make_datastore()
+
+    all_columns = await _all_columns(datastore, trial_infos, raw_payloads=True,
+                                     fields=[cogment.DatastoreFields.ACTION])
+    columns = all_columns[1]
+    unittest_case.assertNotIn("has_observation", columns)
+    unittest_case.assertNotIn("action.value", columns)
+
+    action = wrappers_pb2.Int32Value()
+    action.ParseFromString(columns.payload("action", 3))
+    unittest_case.assertEqual(action.value, 11)
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        columns.payload("observation", 3)
@@ -0,0 +1,78 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+from google.protobuf import wrappers_pb2
+
+import cogment
+from cogment.datastore import Datastore
+
+from helpers.fake_datastore import FakeDatastoreStub, make_trial_info, make_trial_samples
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_COUNT = 7
+
+
+def _make_datastore(nb_trials):
+    trial_infos = [make_trial_info(f"trial_{index}", SAMPLE_COUNT) for index in range(nb_trials)]
+    samples = []
+    for info in trial_infos:
+        samples.extend(make_trial_samples(info.trial_id, SAMPLE_COUNT))
+    datastore = Datastore(FakeDatastoreStub(samples), cog_settings=None)
+
+    async def _all_trials(bundle_size, properties, ids):
+        for info in trial_infos:
+            if not ids or info.trial_id in ids:
+                yield info
+
+    datastore.all_trials = _all_trials
+    return datastore
+
+
+@pytest.mark.asyncio
+async def test_export_shards(unittest_case, tmp_path):
+    datastore = _make_datastore(3)
+
+    paths = await datastore.export_samples(str(tmp_path), ids=["trial_0", "trial_2"], samples_per_shard=4)
+    unittest_case.assertEqual([os.path.basename(path) for path in paths],
+                              [f"samples-{index:05d}.npz" for index in range(4)])
+    unittest_case.assertEqual(sorted(os.listdir(tmp_path)), [os.path.basename(path) for path in paths])
+
+    shards = [np.load(path) for path in paths]
+    unittest_case.assertEqual([len(shard["tick_id"]) for shard in shards], [8, 8, 8, 4])
+    unittest_case.assertEqual(shards[1]["trial_ids"].tolist(), ["trial_0", "trial_2"])
+
+    tick_ids = np.concatenate([shard["tick_id"] for shard in shards])
+    unittest_case.assertEqual(tick_ids.tolist(), [tick_id for tick_id in range(SAMPLE_COUNT) for _ in range(2)] * 2)
+    actions = np.concatenate([shard["action.value"] for shard in shards])
+    unittest_case.assertEqual(actions[:4].tolist(), [0, 1, 10, 11])
+
+
+@pytest.mark.asyncio
+async def test_export_raw_payloads(unittest_case, tmp_path):
+    datastore = _make_datastore(1)
+
+    paths = await datastore.export_samples(str(tmp_path), fields=[cogment.DatastoreFields.OBSERVATION],
+                                           raw_payloads=True, compress=False)
+    unittest_case.assertEqual(len(paths), 1)
+
+    shard = np.load(paths[0])
+    unittest_case.assertNotIn("action_offset", shard.files)
+    offset, length = int(shard["observation_offset"][4]), int(shard["observation_length"][4])
+    observation = wrappers_pb2.FloatValue()
+    observation.ParseFromString(shard["payload.observation"][offset:offset + length].tobytes())
+    unittest_case.assertEqual(observation.value, 2.5)
@@ -0,0 +1,78 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from cogment.datastore import Datastore
+
+from helpers.fake_datastore import FakeDatastoreStub, make_trial_info, make_trial_samples
+
+
+def _make_datastore():
+    trial_infos = [make_trial_info(f"trial_{index}", 10) for index in range(3)]
+    samples = []
+    for info in trial_infos:
+        samples.extend(make_trial_samples(info.trial_id, 10))
+    trial_ids = [f"trial_{index}" for index in range(11)]
+    stub = FakeDatastoreStub(samples, trial_ids=trial_ids)
+    return Datastore(stub, cog_settings=None), stub, trial_infos
+
+
+@pytest.mark.asyncio
+async def test_prefetch_samples(unittest_case):
+    datastore, stub, trial_infos = _make_datastore()
+
+    samples = datastore.all_samples(trial_infos, prefetch=5)
+    first_sample = await samples.__anext__()
+    unittest_case.assertEqual((first_sample.trial_id, first_sample.tick_id), ("trial_0", 0))
+
+    # Read ahead while the consumer is busy, up to the prefetch depth
+    await asyncio.sleep(0.05)
+    unittest_case.assertGreaterEqual(stub.nb_streamed, 1 + 5)
+    unittest_case.assertLessEqual(stub.nb_streamed, 1 + 5 + 1)
+
+    remaining_samples = [sample async for sample in samples]
+    unittest_case.assertEqual([(sample.trial_id, sample.tick_id) for sample in remaining_samples],
+                              [(sample.trial_id, sample.tick_id) for sample in stub.samples[1:]])
+
+
+@pytest.mark.asyncio
+async def test_prefetch_samples_stop(unittest_case):
+    datastore, stub, trial_infos = _make_datastore()
+
+    nb_samples = 0
+    async for _ in datastore.all_samples(trial_infos, prefetch=5):
+        nb_samples += 1
+        if nb_samples == 3:
+            break
+    unittest_case.assertLess(stub.nb_streamed, len(stub.samples))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_trials(unittest_case):
+    datastore, stub, _ = _make_datastore()
+
+    trials = datastore.all_trials(bundle_size=3, prefetch=1)
+    first_trial = await trials.__anext__()
+    unittest_case.assertEqual(first_trial.trial_id, "trial_0")
+
+    # The next pages are requested while the first one is consumed, the prefetched one and the one waiting for room
+    await asyncio.sleep(0.05)
+    unittest_case.assertEqual(stub.trial_requests, [0, 3, 6])
+
+    remaining_trials = [trial async for trial in trials]
+    unittest_case.assertEqual([trial.trial_id for trial in remaining_trials], stub.trial_ids[1:])
+    unittest_case.assertEqual(stub.trial_requests, [0, 3, 6, 9])
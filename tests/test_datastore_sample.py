@@ -0,0 +1,82 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cogment
+from cogment.datastore import DatastoreSample
+
+from helpers.fake_datastore import FakeParameters, make_sample
+
+
+def _make_sample(nb_actors=3):
+    return DatastoreSample(make_sample("trial", 2, nb_actors), FakeParameters(["player"] * nb_actors))
+
+
+def test_lazy_actor_data(unittest_case):
+    sample = _make_sample()
+    unittest_case.assertEqual(len(sample._actor_data_by_index), 0)
+
+    actor_data = sample.get_actor_data("actor_1")
+    unittest_case.assertEqual(actor_data.action.value, 21)
+    unittest_case.assertEqual(list(sample._actor_data_by_index), [1])
+    unittest_case.assertIsNone(sample.get_actor_data("unknown"))
+
+    unittest_case.assertEqual(list(sample.actors_data), ["actor_0", "actor_1", "actor_2"])
+    unittest_case.assertIs(sample.actors_data["actor_1"], actor_data)
+    unittest_case.assertIs(sample.get_actor_data("actor_1"), actor_data)
+
+
+def test_duplicate_actor_names(unittest_case):
+    sample = _make_sample()
+    sample._parameters.actors[2].name = "actor_0"
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        sample.actors_data
+
+
+def test_slots(unittest_case):
+    sample = _make_sample()
+
+    with unittest_case.assertRaises(AttributeError):
+        sample.extra = None
+    with unittest_case.assertRaises(AttributeError):
+        sample.get_actor_data("actor_0").extra = None
+
+
+def test_release_payloads(unittest_case):
+    sample = _make_sample()
+    actor_data = sample.get_actor_data("actor_0")
+    unittest_case.assertEqual(actor_data.observation.value, 2.5)
+
+    sample.release_payloads()
+    unittest_case.assertEqual(len(sample._raw_sample.payloads), 0)
+    unittest_case.assertEqual(actor_data.reward, 0.0)
+    with unittest_case.assertRaises(cogment.CogmentError):
+        actor_data.observation
+    with unittest_case.assertRaises(cogment.CogmentError):
+        sample.get_actor_data("actor_2").action_serialized
+
+
+def test_shared_payload_decoded_once(unittest_case):
+    sample = _make_sample()
+
+    # All the actors of the fake sample share the same observation payload
+    observations = [sample.get_actor_data(f"actor_{index}").observation for index in range(3)]
+    unittest_case.assertIs(observations[0], observations[1])
+    unittest_case.assertIs(observations[0], observations[2])
+    unittest_case.assertEqual(observations[0].value, 2.5)
+
+    actions = [sample.get_actor_data(f"actor_{index}").action for index in range(3)]
+    unittest_case.assertEqual([action.value for action in actions], [20, 21, 22])
+    unittest_case.assertIs(sample.get_actor_data("actor_1").action, actions[1])
+    unittest_case.assertEqual(len(sample._decoded_payloads), 1 + 3)
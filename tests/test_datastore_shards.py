@@ -0,0 +1,94 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+import cogment.datastore
+from cogment.datastore import Datastore
+
+from helpers.fake_datastore import FakeDatastoreStub, make_trial_info, make_trial_samples
+
+TRIAL_COUNT = 10
+SAMPLE_COUNT = 5
+
+
+def _make_datastore(**stub_kwargs):
+    trial_infos = [make_trial_info(f"trial_{index}", SAMPLE_COUNT) for index in range(TRIAL_COUNT)]
+    samples = []
+    for info in trial_infos:
+        samples.extend(make_trial_samples(info.trial_id, SAMPLE_COUNT))
+    stub = FakeDatastoreStub(samples, **stub_kwargs)
+    return Datastore(stub, cog_settings=None), stub, trial_infos
+
+
+def _sample_keys(samples):
+    return [(sample.trial_id, sample.tick_id) for sample in samples]
+
+
+@pytest.mark.asyncio
+async def test_ordered_shards(unittest_case):
+    datastore, stub, trial_infos = _make_datastore(delay=0.001)
+
+    samples = [sample async for sample in datastore.all_samples(trial_infos, shards=3)]
+    unittest_case.assertEqual(len(stub.requests), 3)
+    unittest_case.assertEqual(_sample_keys(samples), _sample_keys(stub.samples))
+
+
+@pytest.mark.asyncio
+async def test_unordered_shards(unittest_case):
+    datastore, stub, trial_infos = _make_datastore(delay=0.001)
+
+    samples = [sample async for sample in datastore.all_samples(trial_infos, shards=4, ordered=False)]
+    unittest_case.assertEqual(sorted(_sample_keys(samples)), sorted(_sample_keys(stub.samples)))
+    unittest_case.assertNotEqual(_sample_keys(samples), _sample_keys(stub.samples))
+
+    # Samples of a trial stay in order
+    trial_0_ticks = [sample.tick_id for sample in samples if sample.trial_id == "trial_0"]
+    unittest_case.assertEqual(trial_0_ticks, list(range(SAMPLE_COUNT)))
+
+
+@pytest.mark.asyncio
+async def test_bounded_buffer(unittest_case):
+    datastore, stub, trial_infos = _make_datastore()
+
+    samples = datastore.all_samples(trial_infos, shards=2, ordered=False, buffer_size=4)
+    await samples.__anext__()
+    await asyncio.sleep(0.05)
+    # Buffered samples, plus the one consumed and one blocked in each shard
+    unittest_case.assertLessEqual(stub.nb_streamed, 4 + 1 + 2)
+    await samples.aclose()
+
+
+@pytest.mark.asyncio
+async def test_shard_retry(unittest_case, monkeypatch):
+    monkeypatch.setattr(cogment.datastore, "_STREAM_RETRY_DELAY", 0.0)
+    datastore, stub, trial_infos = _make_datastore(fail_after=17)
+
+    samples = [sample async for sample in datastore.all_samples(trial_infos, shards=2, retries=1)]
+    unittest_case.assertEqual(_sample_keys(samples), _sample_keys(stub.samples))
+
+    # The retried shard doesn't request the trials already ended
+    unittest_case.assertEqual(len(stub.requests), 3)
+    unittest_case.assertEqual(stub.requests[2], ["trial_3", "trial_4"])
+
+
+@pytest.mark.asyncio
+async def test_shard_failure(unittest_case, monkeypatch):
+    monkeypatch.setattr(cogment.datastore, "_STREAM_RETRY_DELAY", 0.0)
+    datastore, stub, trial_infos = _make_datastore(fail_after=7)
+
+    samples = [sample async for sample in datastore.all_samples(trial_infos, shards=2)]
+    unittest_case.assertLess(len(samples), len(stub.samples))
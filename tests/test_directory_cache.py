@@ -0,0 +1,73 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from cogment.directory import Directory, ServiceType
+
+
+def _make_directory(results, **kwargs):
+    directory = Directory(None, None, **kwargs)
+    directory.inquiries = 0
+
+    async def fake_inquire(request):
+        directory.inquiries += 1
+        return results.pop(0)
+
+    directory._inquire = fake_inquire
+    return directory
+
+
+@pytest.mark.asyncio
+async def test_inquiry_cache(unittest_case):
+    urls = [("grpc://datastore_1:9000", False)]
+    directory = _make_directory([urls, urls, urls], cache_ttl=60.0)
+
+    for _ in range(3):
+        result = await directory.inquire_by_type(ServiceType.DATASTORE, {"name": "main"})
+        unittest_case.assertEqual(result, urls)
+    unittest_case.assertEqual(directory.inquiries, 1)
+
+    await directory.inquire_by_type(ServiceType.DATASTORE, {"name": "other"})
+    unittest_case.assertEqual(directory.inquiries, 2)
+
+    directory.invalidate_url("grpc://datastore_1:9000")
+    await directory.inquire_by_type(ServiceType.DATASTORE, {"name": "main"})
+    unittest_case.assertEqual(directory.inquiries, 3)
+
+
+@pytest.mark.asyncio
+async def test_negative_inquiry_cache(unittest_case):
+    urls = [("grpc://datastore_1:9000", False)]
+    directory = _make_directory([[], urls], cache_ttl=60.0, negative_cache_ttl=0.05)
+
+    unittest_case.assertEqual(await directory.inquire_by_id(12), [])
+    unittest_case.assertEqual(await directory.inquire_by_id(12), [])
+    unittest_case.assertEqual(directory.inquiries, 1)
+
+    await asyncio.sleep(0.1)
+    unittest_case.assertEqual(await directory.inquire_by_id(12), urls)
+    unittest_case.assertEqual(directory.inquiries, 2)
+
+
+@pytest.mark.asyncio
+async def test_inquiry_cache_disabled(unittest_case):
+    urls = [("grpc://datastore_1:9000", False)]
+    directory = _make_directory([urls, urls])
+
+    await directory.inquire_by_id(12)
+    await directory.inquire_by_id(12)
+    unittest_case.assertEqual(directory.inquiries, 2)
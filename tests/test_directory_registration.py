@@ -0,0 +1,87 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+import cogment
+
+ACTOR_CLASSES = [f"actor_class_{index}" for index in range(40)]
+
+
+class _FakeDirectory:
+    def __init__(self, failing_actor_class=None):
+        self._failing_actor_class = failing_actor_class
+        self.registered = {}
+        self.running = 0
+        self.max_running = 0
+        self._next_id = 0
+
+    async def register_host(self, type, host, port, ssl, properties):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+        actor_class = properties.get("__actor_class")
+        if actor_class is not None and actor_class == self._failing_actor_class:
+            raise cogment.CogmentError("Registration refused")
+
+        self._next_id += 1
+        self.registered[self._next_id] = (type, dict(properties))
+        return (self._next_id, "secret")
+
+    async def deregister_service(self, service_id, secret):
+        await asyncio.sleep(0.01)
+        del self.registered[service_id]
+
+
+async def _actor(actor_session):
+    pass
+
+
+def _make_context(directory):
+    context = cogment.Context(user_id="registration", cog_settings=None, prometheus_registry=None)
+    context._directory = directory
+    context.register_actor(_actor, "actor", ACTOR_CLASSES)
+    context.register_environment(_actor, "environment")
+    return context
+
+
+@pytest.mark.asyncio
+async def test_concurrent_registration(unittest_case):
+    directory = _FakeDirectory()
+    context = _make_context(directory)
+
+    registered = await context._directory_registration("localhost", 9000, False)
+    unittest_case.assertEqual(len(registered), len(ACTOR_CLASSES) + 1)
+    unittest_case.assertGreater(directory.max_running, 1)
+
+    registered_classes = {properties.get("__actor_class") for _, properties in directory.registered.values()}
+    unittest_case.assertEqual(registered_classes, set(ACTOR_CLASSES) | {None})
+
+    await context._directory_deregistration(registered)
+    unittest_case.assertEqual(directory.registered, {})
+    unittest_case.assertEqual(registered, [])
+
+
+@pytest.mark.asyncio
+async def test_registration_rollback(unittest_case):
+    directory = _FakeDirectory(failing_actor_class="actor_class_12")
+    context = _make_context(directory)
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        await context._directory_registration("localhost", 9000, False)
+    unittest_case.assertEqual(directory.registered, {})
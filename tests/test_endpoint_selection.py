@@ -0,0 +1,107 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import cogment
+import cogment.service_load
+from cogment.directory import Directory, ServiceType
+from cogment.service_load import ServiceLoadMonitor
+
+URLS = [("grpc://datastore_1:9000", False), ("grpc://datastore_2:9000", False), ("grpc://datastore_3:9000", False)]
+
+LOADS = {
+    "grpc://datastore_1:9000": {"overall_load": "80", "nb_sessions": "2"},
+    "grpc://datastore_2:9000": {"overall_load": "10", "nb_sessions": "5"},
+    "grpc://datastore_3:9000": {"overall_load": "10", "nb_sessions": "1"},
+}
+
+
+class _FakeChannelPool:
+    def acquire(self, endpoint):
+        return endpoint.url
+
+    def release(self, endpoint):
+        pass
+
+
+class _FakeStatusStub:
+    calls = 0
+
+    def __init__(self, channel):
+        self._url = channel
+
+    async def Status(self, request, timeout):
+        _FakeStatusStub.calls += 1
+        if self._url not in LOADS:
+            raise ConnectionError("Unreachable")
+        return SimpleNamespace(statuses=LOADS[self._url])
+
+
+async def _selected_urls(directory, count):
+    endpoint = cogment.Endpoint("cogment://discover/datastore")
+    return [(await directory.get_inquired_endpoint(endpoint)).url for _ in range(count)]
+
+
+def _make_directory(selection, load_monitor=None):
+    directory = Directory(None, None, selection=selection, load_monitor=load_monitor)
+
+    async def fake_inquire(request):
+        return URLS
+
+    directory._inquire = fake_inquire
+    return directory
+
+
+@pytest.mark.asyncio
+async def test_most_recent(unittest_case):
+    directory = _make_directory(cogment.EndpointSelection.MOST_RECENT)
+    unittest_case.assertEqual(await _selected_urls(directory, 3), [URLS[0][0]] * 3)
+
+
+@pytest.mark.asyncio
+async def test_round_robin(unittest_case):
+    directory = _make_directory(cogment.EndpointSelection.ROUND_ROBIN)
+    unittest_case.assertEqual(await _selected_urls(directory, 6), [url for url, _ in URLS] * 2)
+
+
+@pytest.mark.asyncio
+async def test_random(unittest_case):
+    directory = _make_directory(cogment.EndpointSelection.RANDOM)
+    selected = await _selected_urls(directory, 50)
+    unittest_case.assertTrue(set(selected).issubset({url for url, _ in URLS}))
+
+
+@pytest.mark.asyncio
+async def test_least_loaded(unittest_case, monkeypatch):
+    monkeypatch.setitem(cogment.service_load._STATUS_STUBS, ServiceType.DATASTORE, _FakeStatusStub)
+    _FakeStatusStub.calls = 0
+    load_monitor = ServiceLoadMonitor(_FakeChannelPool(), refresh_interval=0.05)
+    directory = _make_directory(cogment.EndpointSelection.LEAST_LOADED, load_monitor)
+
+    unittest_case.assertEqual(await _selected_urls(directory, 3), ["grpc://datastore_3:9000"] * 3)
+    unittest_case.assertEqual(_FakeStatusStub.calls, 3)  # Samples are cached
+
+    await asyncio.sleep(0.12)
+    unittest_case.assertGreaterEqual(_FakeStatusStub.calls, 6)  # Refreshed in the background
+
+    await load_monitor.close()
+
+
+def test_least_loaded_requires_monitor(unittest_case):
+    with unittest_case.assertRaises(cogment.CogmentError):
+        Directory(None, None, selection=cogment.EndpointSelection.LEAST_LOADED)
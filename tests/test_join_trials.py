@@ -0,0 +1,61 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+import cogment
+
+
+@pytest.mark.asyncio
+async def test_join_trials(unittest_case):
+    context = cogment.Context(user_id="join", cog_settings=None, prometheus_registry=None)
+    stubs = set()
+    running = 0
+    max_running = 0
+
+    async def fake_join(stub, trial_id, requested_name, requested_class, impl_name):
+        nonlocal running, max_running
+        stubs.add(stub)
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if trial_id == "trial_3":
+            raise cogment.CogmentError("Unknown trial")
+
+    context._join_trial_with_stub = fake_join
+    trial_ids = [f"trial_{index}" for index in range(10)]
+    results = await context.join_trials(trial_ids, cogment.Endpoint("grpc://orchestrator:9000"),
+                                        actor_class="my_actor_class_1", max_concurrency=4)
+
+    unittest_case.assertEqual([result.trial_id for result in results], trial_ids)
+    unittest_case.assertEqual([result.success for result in results], [index != 3 for index in range(10)])
+    unittest_case.assertIsInstance(results[3].error, cogment.CogmentError)
+    unittest_case.assertEqual(max_running, 4)
+    unittest_case.assertEqual(len(stubs), 1)
+
+    await context.close()
+
+
+@pytest.mark.asyncio
+async def test_join_trials_invalid_parameters(unittest_case):
+    context = cogment.Context(user_id="join", cog_settings=None, prometheus_registry=None)
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        await context.join_trials(["trial"], cogment.Endpoint("grpc://orchestrator:9000"))
+    with unittest_case.assertRaises(cogment.CogmentError):
+        await context.join_trials(["trial"], cogment.Endpoint("grpc://orchestrator:9000"),
+                                  actor_class="my_actor_class_1", max_concurrency=0)
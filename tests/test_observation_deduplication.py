@@ -0,0 +1,73 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+from google.protobuf import wrappers_pb2
+
+from cogment.environment import EnvironmentSession
+from cogment.trial import Trial
+
+
+def _make_session(deduplicate_observations=False, observation_key=None):
+    cog_settings = SimpleNamespace(actor_classes={"player": SimpleNamespace(name="player")})
+    actors_in_trial = [SimpleNamespace(name=name, actor_class="player") for name in ("alice", "bob", "carol")]
+    trial = Trial("deduplication", actors_in_trial, cog_settings)
+    session = EnvironmentSession(None, trial, "deduplication", "deduplication", None)
+    session.start(deduplicate_observations=deduplicate_observations, observation_key=observation_key)
+    return session
+
+
+def _observations(package):
+    return [wrappers_pb2.FloatValue.FromString(content).value for content in package.observations]
+
+
+def test_identity_default(unittest_case):
+    session = _make_session()
+    shared_obs = wrappers_pb2.FloatValue(value=1.0)
+    package = session._pack_observations([
+        ("alice", shared_obs),
+        ("bob", shared_obs),
+        ("carol", wrappers_pb2.FloatValue(value=1.0)),
+    ], 7)
+
+    # Only the same object is sent once, equal content is sent again
+    unittest_case.assertEqual(package.tick_id, 7)
+    unittest_case.assertEqual(_observations(package), [1.0, 1.0])
+    unittest_case.assertEqual(list(package.actors_map), [0, 0, 1])
+
+
+def test_equal_content_deduplicated(unittest_case):
+    session = _make_session(deduplicate_observations=True)
+    package = session._pack_observations([
+        ("alice", wrappers_pb2.FloatValue(value=1.0)),
+        ("bob", wrappers_pb2.FloatValue(value=2.0)),
+        ("carol", wrappers_pb2.FloatValue(value=1.0)),
+    ], 0)
+
+    unittest_case.assertEqual(_observations(package), [1.0, 2.0])
+    unittest_case.assertEqual(list(package.actors_map), [0, 1, 0])
+
+
+def test_observation_key(unittest_case):
+    # Observations grouped by integer part: the first observation of a group is sent for the whole group
+    session = _make_session(observation_key=lambda obs: int(obs.value))
+    package = session._pack_observations([
+        ("alice", wrappers_pb2.FloatValue(value=1.25)),
+        ("bob", wrappers_pb2.FloatValue(value=2.0)),
+        ("carol", wrappers_pb2.FloatValue(value=1.75)),
+    ], 0)
+
+    unittest_case.assertEqual(_observations(package), [1.25, 2.0])
+    unittest_case.assertEqual(list(package.actors_map), [0, 1, 0])
@@ -0,0 +1,97 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+
+from cogment.actor import ActorSession
+from cogment.agent_service import _process_normal_data
+from cogment.errors import CogmentError
+
+
+class _UnparsableSpace:
+    def ParseFromString(self, content):
+        raise AssertionError("Raw observations must not be parsed")
+
+
+class _FakeData:
+    def __init__(self, observation):
+        self.observation = observation
+
+    def HasField(self, name):
+        return name == "observation"
+
+
+class _FakeAction:
+    def SerializeToString(self):
+        return b"serialized"
+
+
+def _make_session(raw_data):
+    trial = SimpleNamespace(id="raw", actors=[], ended=False, ending=False, ending_ack=False, tick_id=-1)
+    spec = SimpleNamespace(name="raw_class", observation_space=_UnparsableSpace)
+    session = ActorSession(None, spec, trial, "raw_actor", "raw_impl", "env", None)
+    session._raw_data = raw_data
+    session._started = True
+    return session
+
+
+def _posted_action_content(session):
+    package = session._outgoing_data_queue.get_nowait()
+    return package.action.content
+
+
+@pytest.mark.asyncio
+async def test_raw_observation(unittest_case):
+    session = _make_session(raw_data=True)
+    observation = SimpleNamespace(tick_id=3, timestamp=12, content=b"raw observation")
+
+    _process_normal_data(_FakeData(observation), session)
+
+    tick_id, event = session._incoming_event_queue.get_nowait()
+    unittest_case.assertEqual(tick_id, 3)
+    unittest_case.assertEqual(event.observation.tick_id, 3)
+    unittest_case.assertEqual(event.observation.observation, b"raw observation")
+
+
+@pytest.mark.asyncio
+async def test_raw_bytes_action(unittest_case):
+    session = _make_session(raw_data=True)
+
+    for action in [b"raw action", bytearray(b"raw action"), memoryview(b"raw action")]:
+        session.do_action(action)
+        content = _posted_action_content(session)
+        unittest_case.assertIs(type(content), bytes)
+        unittest_case.assertEqual(content, b"raw action")
+
+
+@pytest.mark.asyncio
+async def test_raw_non_bytes_action(unittest_case):
+    session = _make_session(raw_data=True)
+
+    with unittest_case.assertRaises(CogmentError):
+        session.do_action(_FakeAction())
+    unittest_case.assertTrue(session._outgoing_data_queue.empty())
+
+
+@pytest.mark.asyncio
+async def test_bytes_action_not_serialized(unittest_case):
+    session = _make_session(raw_data=False)
+
+    session.do_action(b"raw action")
+    unittest_case.assertEqual(_posted_action_content(session), b"raw action")
+
+    session.do_action(_FakeAction())
+    unittest_case.assertEqual(_posted_action_content(session), b"serialized")
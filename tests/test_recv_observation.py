@@ -0,0 +1,79 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+from google.protobuf import wrappers_pb2
+
+from cogment.session import RecvObservation
+
+
+class _CountingSpace:
+    parse_count = 0
+
+    def __init__(self):
+        self.value = None
+
+    def ParseFromString(self, content):
+        _CountingSpace.parse_count += 1
+        message = wrappers_pb2.StringValue()
+        message.ParseFromString(content)
+        self.value = message.value
+
+
+def _make_obs(value):
+    return SimpleNamespace(tick_id=7, timestamp=123, content=wrappers_pb2.StringValue(value=value).SerializeToString())
+
+
+def test_lazy_parsing(unittest_case):
+    _CountingSpace.parse_count = 0
+    recv_obs = RecvObservation(_make_obs("first"), None, obs_space_type=_CountingSpace)
+
+    unittest_case.assertEqual(recv_obs.tick_id, 7)
+    unittest_case.assertEqual(recv_obs.timestamp, 123)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 0)
+
+    observation = recv_obs.observation
+    unittest_case.assertEqual(_CountingSpace.parse_count, 1)
+    unittest_case.assertEqual(observation.value, "first")
+
+    # The parsed observation is memoized
+    unittest_case.assertIs(recv_obs.observation, observation)
+    unittest_case.assertIs(recv_obs.snapshot, observation)
+    unittest_case.assertEqual(_CountingSpace.parse_count, 1)
+
+
+def test_setter_overrides_lazy_value(unittest_case):
+    _CountingSpace.parse_count = 0
+    recv_obs = RecvObservation(_make_obs("first"), None, obs_space_type=_CountingSpace)
+
+    recv_obs.observation = "replaced"
+    unittest_case.assertEqual(recv_obs.observation, "replaced")
+    unittest_case.assertEqual(_CountingSpace.parse_count, 0)
+
+    recv_obs = RecvObservation(_make_obs("first"), None, obs_space_type=_CountingSpace)
+    recv_obs.snapshot = "replaced"
+    unittest_case.assertEqual(recv_obs.observation, "replaced")
+    unittest_case.assertEqual(_CountingSpace.parse_count, 0)
+
+
+def test_eager_observation(unittest_case):
+    recv_obs = RecvObservation(_make_obs("first"), "given")
+    unittest_case.assertEqual(recv_obs.observation, "given")
+
+
+def test_unset_observation(unittest_case):
+    recv_obs = RecvObservation(_make_obs("first"), None)
+    unittest_case.assertIsNone(recv_obs.observation)
+    unittest_case.assertIsNone(recv_obs.snapshot)
@@ -0,0 +1,146 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+import cogment
+import cogment.replay_buffer
+from cogment.control import TrialState
+from cogment.datastore import Datastore
+
+from helpers.fake_datastore import FakeDatastoreStub, make_trial_info, make_trial_samples
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_COUNT = 4
+
+
+def _make_datastore(nb_trials):
+    trial_infos = [make_trial_info(f"trial_{index}", SAMPLE_COUNT, actor_classes=("player", "referee"))
+                   for index in range(nb_trials)]
+    samples = []
+    for info in trial_infos:
+        samples.extend(make_trial_samples(info.trial_id, SAMPLE_COUNT))
+    return Datastore(FakeDatastoreStub(samples), cog_settings=None), trial_infos
+
+
+@pytest.mark.asyncio
+async def test_n_step_transitions(unittest_case):
+    datastore, trial_infos = _make_datastore(1)
+    replay_buffer = cogment.ReplayBuffer(datastore, capacity=10, n_step=2, discount=0.5, seed=0)
+
+    nb_transitions = await replay_buffer.ingest(trial_infos)
+    unittest_case.assertEqual(nb_transitions, 2 * (SAMPLE_COUNT - 1))
+    unittest_case.assertEqual(replay_buffer.size("player"), SAMPLE_COUNT - 1)
+    unittest_case.assertEqual(replay_buffer.size("referee"), SAMPLE_COUNT - 1)
+
+    # Ingesting the same trial again is a no-op
+    unittest_case.assertEqual(await replay_buffer.ingest(trial_infos), 0)
+
+    # The referee (actor 1) receives a reward of 1 at each tick
+    batch = replay_buffer.sample(64, "referee")
+    unittest_case.assertEqual(len(batch), 64)
+    expected = {
+        0: (1.5, 2.5, 0.25, False),
+        1: (1.5, 3.5, 0.0, True),
+        2: (1.0, 3.5, 0.0, True),
+    }
+    for row, index in enumerate(batch.indexes):
+        tick_id = int(batch["observation.value"][row] - 0.5)
+        unittest_case.assertEqual(batch["action.value"][row], tick_id * 10 + 1)
+        unittest_case.assertEqual((float(batch["reward"][row]), float(batch["next_observation.value"][row]),
+                                   float(batch["discount"][row]), bool(batch["done"][row])), expected[tick_id])
+    unittest_case.assertEqual(batch["action.value"].dtype, np.int64)
+    unittest_case.assertEqual(batch.weights.tolist(), [1.0] * 64)
+
+    unittest_case.assertEqual(replay_buffer.stats.ingested_trials, 1)
+    unittest_case.assertEqual(replay_buffer.stats.sampled_transitions, 64)
+    unittest_case.assertGreater(replay_buffer.stats.ingest_rate, 0)
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        replay_buffer.sample(1, "unknown")
+
+
+@pytest.mark.asyncio
+async def test_ring_capacity(unittest_case):
+    datastore, trial_infos = _make_datastore(3)
+    replay_buffer = cogment.ReplayBuffer(datastore, capacity=5, actor_classes=["player"])
+
+    await replay_buffer.ingest(trial_infos)
+    unittest_case.assertEqual(replay_buffer.size("player"), 5)
+    unittest_case.assertEqual(replay_buffer.size("referee"), 0)
+    unittest_case.assertEqual(replay_buffer.stats.ingested_transitions, 3 * (SAMPLE_COUNT - 1))
+
+
+@pytest.mark.asyncio
+async def test_prioritized_sampling(unittest_case):
+    datastore, trial_infos = _make_datastore(2)
+    replay_buffer = cogment.ReplayBuffer(datastore, capacity=10, sampling=cogment.ReplaySampling.PRIORITIZED,
+                                         alpha=1.0, beta=1.0, seed=0)
+    await replay_buffer.ingest(trial_infos)
+
+    replay_buffer.update_priorities("player", np.arange(6), [0.0] * 5 + [1000.0])
+    batch = replay_buffer.sample(100, "player")
+    unittest_case.assertGreater(np.count_nonzero(batch.indexes == 5), 95)
+    unittest_case.assertAlmostEqual(float(batch.weights.max()), 1.0)
+    unittest_case.assertEqual(float(batch.weights[batch.indexes == 5][0]), float(batch.weights.min()))
+
+
+@pytest.mark.asyncio
+async def test_continuous_ingestion(unittest_case, monkeypatch):
+    monkeypatch.setattr(cogment.replay_buffer, "REPLAY_POLL_INTERVAL", 0.01)
+    datastore, trial_infos = _make_datastore(3)
+    listed_infos = list(trial_infos[:1])
+    requested_handles = []
+
+    async def _trial_page(bundle_size, wait_for_trials, properties, ids, trial_handle):
+        requested_handles.append(trial_handle)
+        start = int(trial_handle) if trial_handle else 0
+        page_infos = listed_infos[start:start + bundle_size]
+        return page_infos, str(start + len(page_infos))
+
+    async def _get_trials(ids=[], properties={}):
+        return [info for info in listed_infos if info.trial_id in ids]
+
+    datastore._trial_page = _trial_page
+    datastore.get_trials = _get_trials
+    trial_infos[2].trial_state = TrialState.RUNNING
+    replay_buffer = cogment.ReplayBuffer(datastore, capacity=100)
+
+    # Unfinished trials are skipped, not marked as ingested
+    unittest_case.assertEqual(await replay_buffer.ingest(trial_infos[2:]), 0)
+
+    run_task = asyncio.create_task(replay_buffer.run(bundle_size=2))
+
+    await asyncio.sleep(0.05)
+    unittest_case.assertEqual(replay_buffer.stats.ingested_trials, 1)
+
+    listed_infos.extend(trial_infos[1:])
+    await asyncio.sleep(0.05)
+    unittest_case.assertEqual(replay_buffer.stats.ingested_trials, 2)
+    unittest_case.assertEqual(replay_buffer.size("player"), 2 * (SAMPLE_COUNT - 1))
+
+    trial_infos[2].trial_state = TrialState.ENDED
+    await asyncio.sleep(0.05)
+    unittest_case.assertEqual(replay_buffer.stats.ingested_trials, 3)
+    unittest_case.assertEqual(replay_buffer.size("player"), 3 * (SAMPLE_COUNT - 1))
+
+    # Once a page is complete, the following polls start after it
+    first_next_page = requested_handles.index("2")
+    unittest_case.assertEqual(set(requested_handles[first_next_page:]), {"2"})
+
+    run_task.cancel()
+    await run_task
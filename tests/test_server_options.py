@@ -0,0 +1,62 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+import cogment
+from cogment.agent_service import AgentServicer
+from cogment.env_service import EnvironmentServicer
+
+
+def test_served_endpoint_options(unittest_case):
+    served_endpoint = cogment.ServedEndpoint(0)
+    unittest_case.assertEqual(served_endpoint._grpc_server_options(), [])
+
+    served_endpoint.max_concurrent_streams = 64
+    served_endpoint.max_receive_message_length = 16 * 1024 * 1024
+    served_endpoint.keepalive_time_ms = 10000
+    served_endpoint.grpc_options = [("grpc.http2.bdp_probe", 0)]
+    unittest_case.assertEqual(served_endpoint._grpc_server_options(), [
+        ("grpc.max_concurrent_streams", 64),
+        ("grpc.max_receive_message_length", 16 * 1024 * 1024),
+        ("grpc.keepalive_time_ms", 10000),
+        ("grpc.http2.bdp_probe", 0),
+    ])
+
+
+@pytest.mark.parametrize("servicer_type", [AgentServicer, EnvironmentServicer], ids=["actor", "environment"])
+def test_max_concurrent_trials(unittest_case, servicer_type):
+    servicer = servicer_type({}, None, CollectorRegistry())
+    limited_impl = SimpleNamespace(max_concurrent_trials=2)
+    unlimited_impl = SimpleNamespace(max_concurrent_trials=0)
+
+    unittest_case.assertTrue(servicer._acquire_trial_slot("limited", limited_impl))
+    unittest_case.assertTrue(servicer._acquire_trial_slot("limited", limited_impl))
+    unittest_case.assertFalse(servicer._acquire_trial_slot("limited", limited_impl))
+    servicer._release_trial_slot("limited")
+    unittest_case.assertTrue(servicer._acquire_trial_slot("limited", limited_impl))
+
+    for _ in range(10):
+        unittest_case.assertTrue(servicer._acquire_trial_slot("unlimited", unlimited_impl))
+
+
+@pytest.mark.asyncio
+async def test_invalid_max_concurrent_trials(unittest_case):
+    context = cogment.Context(user_id="options", cog_settings=None, prometheus_registry=None)
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        context.register_environment(None, max_concurrent_trials=-1)
@@ -0,0 +1,103 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from google.protobuf import wrappers_pb2
+
+from cogment.environment import EnvironmentSession
+from cogment.session import Session, _Ending, _EndingAck, _InitAck
+from cogment.trial import Trial
+
+
+class _FakeSummary:
+    def __init__(self):
+        self.observed = []
+
+    def observe(self, value):
+        self.observed.append(value)
+
+
+def _make_session(impl, executor):
+    trial = SimpleNamespace(id="executor", actors=[], ended=False, ending=False, ending_ack=False, tick_id=-1)
+    session = Session(trial, "executor", impl, "executor", None)
+    session._executor = executor
+    session._executor_wait_summary = _FakeSummary()
+    session._started = True
+    return session
+
+
+def _step(session, value):
+    session._post_outgoing_data(value)
+    return threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor(unittest_case):
+    results = []
+
+    async def impl(session):
+        for value in range(3):
+            results.append(await session.run_in_executor(_step, session, value))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        session = _make_session(impl, executor)
+        unittest_case.assertTrue(await session._start_user_task())
+
+    unittest_case.assertEqual(len(results), 3)
+    unittest_case.assertNotIn(threading.get_ident(), results)
+    unittest_case.assertEqual(len(session._executor_wait_summary.observed), 3)
+
+    # Data posted from the executor thread is marshalled back to the event loop in order
+    posted = [session._outgoing_data_queue.get_nowait() for _ in range(session._outgoing_data_queue.qsize())]
+    unittest_case.assertEqual(posted, [0, 1, 2])
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_exception(unittest_case):
+    def failing_step():
+        raise ValueError("step failed")
+
+    session = _make_session(None, None)
+    with unittest_case.assertRaises(ValueError):
+        await session.run_in_executor(failing_step)
+
+
+@pytest.mark.asyncio
+async def test_end_twice_in_executor(unittest_case):
+    cog_settings = SimpleNamespace(actor_classes={"player": SimpleNamespace(name="player")})
+    trial = Trial("executor", [SimpleNamespace(name="alice", actor_class="player")], cog_settings)
+
+    def end_twice(session):
+        session.end([("*", wrappers_pb2.FloatValue(value=1.0))])
+        session.end([("*", wrappers_pb2.FloatValue(value=2.0))])
+        session.produce_observations([("*", wrappers_pb2.FloatValue(value=3.0))])
+
+    async def impl(session):
+        session.start()
+        await session.run_in_executor(end_twice, session)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        session = EnvironmentSession(impl, trial, "executor", "executor", None)
+        session._executor = executor
+        unittest_case.assertTrue(await session._start_user_task())
+
+    # The trial state is checked on the event loop: only the first end is sent
+    posted = [session._outgoing_data_queue.get_nowait() for _ in range(session._outgoing_data_queue.qsize())]
+    unittest_case.assertEqual([type(data) for data in posted[:2]], [_InitAck, _Ending])
+    unittest_case.assertEqual(type(posted[-1]), _EndingAck)
+    unittest_case.assertEqual(len(posted), 4)
@@ -0,0 +1,246 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import cogment
+from cogment.session import Session, RecvEvent, EventType
+
+
+def _make_session(queue_size, overflow_policy):
+    trial = SimpleNamespace(id="queue", actors=[], ended=False, ending=False, ending_ack=False, tick_id=-1)
+    session = Session(trial, "queue", None, "queue", None)
+    session._set_incoming_queue(queue_size, overflow_policy)
+    session._started = True
+    return session
+
+
+def _make_event(tick_id, etype=EventType.ACTIVE):
+    event = RecvEvent(etype)
+    event.tick_id = tick_id
+    return (tick_id, event)
+
+
+async def _received_ticks(session):
+    session._exit_queues()
+    ticks = []
+    async for event in session.all_events():
+        ticks.append(event.tick_id)
+    return ticks
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest(unittest_case):
+    session = _make_session(3, cogment.OverflowPolicy.DROP_OLDEST)
+    for tick_id in range(5):
+        session._post_incoming_event(_make_event(tick_id))
+
+    unittest_case.assertEqual(await _received_ticks(session), [2, 3, 4])
+
+
+class _FakeCounter:
+    def __init__(self):
+        self.count = 0
+
+    def inc(self):
+        self.count += 1
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_rewards_and_messages(unittest_case):
+    session = _make_session(3, cogment.OverflowPolicy.DROP_OLDEST)
+    session._dropped_events_counter = _FakeCounter()
+    for tick_id in [0, -1, 1, 2, -1]:
+        session._post_incoming_event(_make_event(tick_id))
+
+    # The oldest tick events are dropped, not the rewards and messages queued before them
+    unittest_case.assertEqual(session._dropped_events_counter.count, 2)
+    unittest_case.assertEqual(await _received_ticks(session), [-1, 2, -1])
+    await asyncio.wait_for(session._incoming_event_queue.join(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_without_tick_events(unittest_case):
+    session = _make_session(2, cogment.OverflowPolicy.DROP_OLDEST)
+    session._post_incoming_event(_make_event(-1))
+    session._post_incoming_event(_make_event(-1))
+
+    # Without queued tick events, the oldest event is dropped
+    session._post_incoming_event(_make_event(0))
+    session._post_incoming_event(_make_event(1))
+
+    unittest_case.assertEqual(await _received_ticks(session), [-1, 1])
+    await asyncio.wait_for(session._incoming_event_queue.join(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_keep_latest(unittest_case):
+    session = _make_session(0, cogment.OverflowPolicy.KEEP_LATEST)
+    session._post_incoming_event(_make_event(0))
+    session._post_incoming_event(_make_event(-1))  # e.g. a reward
+    session._post_incoming_event(_make_event(1))
+    session._post_incoming_event(_make_event(2))
+    session._post_incoming_event(_make_event(-1))
+
+    # The latest tick event keeps its place in arrival order
+    unittest_case.assertEqual(await _received_ticks(session), [-1, 2, -1])
+
+
+@pytest.mark.asyncio
+async def test_keep_latest_batches(unittest_case):
+    session = _make_session(0, cogment.OverflowPolicy.KEEP_LATEST)
+    session._post_incoming_event(_make_event(0))
+    session._post_incoming_event(_make_event(-1))
+    session._post_incoming_event(_make_event(1))
+
+    events = []
+    exit_loop = await session._next_event_batch(events, max_items=0, max_wait=0.0)
+    unittest_case.assertFalse(exit_loop)
+    unittest_case.assertEqual([event.tick_id for event in events], [-1, 1])
+
+    # The latest tick event can be replaced again once delivered
+    session._post_incoming_event(_make_event(2))
+    session._post_incoming_event(_make_event(3))
+    unittest_case.assertEqual(await _received_ticks(session), [3])
+
+
+@pytest.mark.asyncio
+async def test_keep_latest_queue_size(unittest_case):
+    context = cogment.Context(user_id="queue", cog_settings=None, prometheus_registry=None)
+    with unittest_case.assertRaises(cogment.CogmentError):
+        context.register_actor(lambda session: None, "queue", ["queue"], queue_size=2,
+                               overflow_policy=cogment.OverflowPolicy.KEEP_LATEST)
+    await context.close()
+
+
+@pytest.mark.asyncio
+async def test_block(unittest_case):
+    session = _make_session(2, cogment.OverflowPolicy.BLOCK)
+    session._post_incoming_event(_make_event(0))
+    session._post_incoming_event(_make_event(1))
+
+    wait_task = asyncio.create_task(session._wait_for_incoming_space())
+    await asyncio.sleep(0.05)
+    unittest_case.assertFalse(wait_task.done())
+
+    event_tuple = session._incoming_event_retrieved(session._incoming_event_queue.get_nowait())
+    unittest_case.assertEqual(event_tuple[0], 0)
+    await asyncio.wait_for(wait_task, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_block_released_by_consumer(unittest_case):
+    session = _make_session(2, cogment.OverflowPolicy.BLOCK)
+
+    async def produce():
+        for tick_id in range(5):
+            await session._wait_for_incoming_space()
+            unittest_case.assertLess(session._incoming_event_queue.qsize(), 2)
+            session._post_incoming_event(_make_event(tick_id))
+
+    produce_task = asyncio.create_task(produce())
+    await asyncio.sleep(0.05)
+    unittest_case.assertFalse(produce_task.done())
+    unittest_case.assertEqual(session._incoming_event_queue.qsize(), 2)
+
+    # No event is dropped: the producer waits for the consumer
+    ticks = []
+    async for event in session.all_events():
+        ticks.append(event.tick_id)
+        if len(ticks) == 5:
+            break
+    await asyncio.wait_for(produce_task, 1.0)
+    unittest_case.assertEqual(ticks, [0, 1, 2, 3, 4])
+
+
+@pytest.mark.asyncio
+async def test_block_unbounded(unittest_case):
+    session = _make_session(0, cogment.OverflowPolicy.BLOCK)
+    for tick_id in range(5):
+        await asyncio.wait_for(session._wait_for_incoming_space(), 1.0)
+        session._post_incoming_event(_make_event(tick_id))
+
+    unittest_case.assertEqual(await _received_ticks(session), [0, 1, 2, 3, 4])
+
+
+async def _received_batches(session, **kwargs):
+    batches = []
+    async for events in session.all_event_batches(**kwargs):
+        batches.append([event.tick_id for event in events])
+    return batches
+
+
+@pytest.mark.asyncio
+async def test_batches_max_items(unittest_case):
+    session = _make_session(0, cogment.OverflowPolicy.BLOCK)
+    for tick_id in range(5):
+        session._post_incoming_event(_make_event(tick_id))
+    session._exit_queues()
+
+    unittest_case.assertEqual(await _received_batches(session, max_items=2), [[0, 1], [2, 3], [4]])
+    await asyncio.wait_for(session._incoming_event_queue.join(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_batches_max_wait(unittest_case):
+    session = _make_session(0, cogment.OverflowPolicy.BLOCK)
+    session._post_incoming_event(_make_event(0))
+    asyncio.get_running_loop().call_later(0.02, session._post_incoming_event, _make_event(1))
+    asyncio.get_running_loop().call_later(0.5, session._exit_queues)
+
+    batches = session.all_event_batches(max_items=10, max_wait=0.2)
+
+    # Events received within `max_wait` are added to the batch
+    unittest_case.assertEqual([event.tick_id for event in await batches.__anext__()], [0, 1])
+
+    # The batch is returned partially filled once `max_wait` has elapsed
+    session._post_incoming_event(_make_event(2))
+    start = asyncio.get_running_loop().time()
+    unittest_case.assertEqual([event.tick_id for event in await batches.__anext__()], [2])
+    unittest_case.assertGreaterEqual(asyncio.get_running_loop().time() - start, 0.15)
+
+    with unittest_case.assertRaises(StopAsyncIteration):
+        await batches.__anext__()
+    await asyncio.wait_for(session._incoming_event_queue.join(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_batches_final(unittest_case):
+    session = _make_session(0, cogment.OverflowPolicy.BLOCK)
+    session._post_incoming_event(_make_event(0))
+    session._post_incoming_event(_make_event(1, EventType.FINAL))
+    session._post_incoming_event(_make_event(2))
+
+    # The batch ends at the final event, and no more batches are delivered
+    unittest_case.assertEqual(await _received_batches(session), [[0, 1]])
+    unittest_case.assertTrue(session._last_event_delivered)
+    unittest_case.assertEqual(session._incoming_event_queue.qsize(), 1)
+
+
+@pytest.mark.asyncio
+async def test_batches_cancelled(unittest_case):
+    session = _make_session(0, cogment.OverflowPolicy.BLOCK)
+    session._post_incoming_event(_make_event(0))
+    session._post_incoming_event(_make_event(1))
+
+    batches_task = asyncio.create_task(_received_batches(session, max_items=10, max_wait=10.0))
+    await asyncio.sleep(0.05)
+    batches_task.cancel()
+
+    # The events already dequeued are delivered before the batch loop exits
+    unittest_case.assertEqual(await asyncio.wait_for(batches_task, 1.0), [[0, 1]])
+    await asyncio.wait_for(session._incoming_event_queue.join(), 1.0)
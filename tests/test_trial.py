@@ -0,0 +1,51 @@
+# Copyright 2023 AI Redefined Inc. <dev+cogment@ai-r.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import cogment
+from cogment.trial import Trial
+
+
+def _make_trial():
+    cog_settings = SimpleNamespace(actor_classes={
+        "player": SimpleNamespace(name="player"),
+        "referee": SimpleNamespace(name="referee"),
+    })
+    actors_in_trial = [
+        SimpleNamespace(name="alice", actor_class="player"),
+        SimpleNamespace(name="bob", actor_class="player"),
+        SimpleNamespace(name="carol", actor_class="referee"),
+    ]
+    return Trial("trial", actors_in_trial, cog_settings)
+
+
+def test_target_indexes(unittest_case):
+    trial = _make_trial()
+
+    unittest_case.assertEqual(trial.get_target_indexes("*"), (0, 1, 2))
+    unittest_case.assertEqual(trial.get_target_indexes("*.*"), (0, 1, 2))
+    unittest_case.assertEqual(trial.get_target_indexes("bob"), (1,))
+    unittest_case.assertEqual(trial.get_target_indexes("player.*"), (0, 1))
+    unittest_case.assertEqual(trial.get_target_indexes("referee.carol"), (2,))
+    unittest_case.assertEqual(trial.get_target_indexes("referee.alice"), ())
+    unittest_case.assertEqual(trial.get_target_indexes("dave"), ())
+    unittest_case.assertEqual(trial.get_target_indexes("unknown.*"), ())
+
+
+def test_invalid_target(unittest_case):
+    trial = _make_trial()
+
+    with unittest_case.assertRaises(cogment.CogmentError):
+        trial.get_target_indexes("player.alice.extra")